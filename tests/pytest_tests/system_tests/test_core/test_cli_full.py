@@ -184,6 +184,26 @@ def test_sync_wandb_run(runner, relay_server, user, copy_asset):
         assert "wandb: ERROR Nothing to sync." in result.output
 
 
+def test_sync_wandb_run_parallel(runner, relay_server, user, copy_asset):
+    with relay_server() as relay, runner.isolated_filesystem(), mock.patch(
+        "wandb.sdk.internal.artifact_saver.ArtifactSaver.save", return_value=None
+    ):
+        copy_asset("wandb")
+
+        result = runner.invoke(cli.sync, ["--sync-all", "--parallel", "4"])
+        print(result.output)
+        print(traceback.print_tb(result.exc_info[2]))
+        assert result.exit_code == 0
+
+        assert f"{user}/code-toad/runs/g9dvvkua ... done. (1/1 runs)" in result.output
+        assert len(relay.context.events) == 1
+
+        # Check we marked the run as synced
+        result = runner.invoke(cli.sync, ["--sync-all", "--parallel", "4"])
+        assert result.exit_code == 0
+        assert "wandb: ERROR Nothing to sync." in result.output
+
+
 def test_sync_wandb_run_and_tensorboard(runner, relay_server, user, copy_asset):
     with relay_server() as relay, runner.isolated_filesystem(), mock.patch(
         "wandb.sdk.internal.artifact_saver.ArtifactSaver.save", return_value=None
@@ -2,12 +2,17 @@ import asyncio
 import base64
 import os
 import random
+import subprocess
+import sys
+import time
 from multiprocessing import Pool
+from unittest import mock
 from urllib.parse import urlparse
 
 import pytest
 import wandb
 from wandb.sdk import wandb_artifacts
+from wandb.sdk.interface.artifacts import artifact_cache
 from wandb.sdk.internal.artifact_saver import get_staging_dir
 
 
@@ -128,6 +133,35 @@ def test_check_write_parallel(cache):
     assert len(files) == 1
 
 
+def _cache_filler(args):
+    cache, downloads = args
+    md5 = base64.b64encode(b"abcdef")
+    path, hit, _ = cache.check_md5_obj_path(md5, 10)
+    if hit:
+        return
+    with cache.fill_lock(path):
+        _, hit, opener = cache.check_md5_obj_path(md5, 10)
+        if hit:
+            return
+        with open(downloads, "a") as f:
+            f.write("downloaded\n")
+        time.sleep(0.1)
+        with opener() as f:
+            f.write("0123456789")
+
+
+def test_fill_lock_single_flight(cache, tmp_path_factory):
+    num_parallel = 5
+    downloads = tmp_path_factory.mktemp("fills") / "downloads"
+
+    with Pool(num_parallel) as p:
+        p.map(_cache_filler, [(cache, downloads)] * num_parallel)
+
+    assert downloads.read_text() == "downloaded\n"
+    # lock files are not cache entries
+    assert cache.cleanup(0) == 10
+
+
 def test_artifacts_cache_cleanup_empty(cache):
     reclaimed_bytes = cache.cleanup(100000)
     assert reclaimed_bytes == 0
@@ -176,6 +210,128 @@ def test_artifacts_cache_cleanup_tmp_files(cache):
     assert reclaimed_bytes == 1000
 
 
+def _write_object(cache, name, size):
+    md5 = base64.b64encode(name.encode())
+    _, _, opener = cache.check_md5_obj_path(md5, size)
+    with opener() as f:
+        f.write("a" * size)
+    return md5
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = iter(range(1000, 2000))
+    monkeypatch.setattr(artifact_cache.time, "time", lambda: next(now))
+
+
+def test_artifacts_cache_cleanup_index(cache):
+    md5_a = _write_object(cache, "aaa", 1000)
+    md5_b = _write_object(cache, "bbb", 2000)
+    md5_c = _write_object(cache, "ccc", 3000)
+    for atime, (md5, size) in enumerate([(md5_b, 2000), (md5_c, 3000)]):
+        path, _, _ = cache.check_md5_obj_path(md5, size)
+        os.utime(path, (atime, atime))
+    # the first cleanup indexes objects that were written without the index
+    assert cache.cleanup(100000) == 0
+
+    # a hit makes "aaa" the most recently used object
+    _, hit, _ = cache.check_md5_obj_path(md5_a, 1000)
+    assert hit
+    with mock.patch("os.walk", side_effect=AssertionError("cache was walked")):
+        assert cache.cleanup(4000) == 2000
+        assert cache.cleanup(3500) == 3000
+    _, hit, _ = cache.check_md5_obj_path(md5_a, 1000)
+    assert hit
+    assert cache._index.total_size() == 1000
+
+
+def test_artifacts_cache_hits_recorded_at_exit(cache):
+    md5_a = _write_object(cache, "aaa", 1000)
+    _write_object(cache, "bbb", 1000)
+    cache.cleanup(100000)
+
+    # a hit from another process, which exits right after
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from wandb.sdk.wandb_artifacts import ArtifactsCache;"
+            " assert ArtifactsCache(sys.argv[1]).check_md5_obj_path("
+            " sys.argv[2].encode(), 1000)[1]",
+            cache._cache_dir,
+            md5_a.decode(),
+        ],
+        check=True,
+    )
+
+    with mock.patch("os.walk", side_effect=AssertionError("cache was walked")):
+        assert wandb_artifacts.ArtifactsCache(cache._cache_dir).cleanup(1000) == 1000
+    _, hit, _ = cache.check_md5_obj_path(md5_a, 1000)
+    assert hit
+
+
+def test_artifacts_cache_hits_recorded_periodically(cache, monkeypatch):
+    md5_a = _write_object(cache, "aaa", 1000)
+    _write_object(cache, "bbb", 1000)
+    cache.cleanup(100000)
+
+    monkeypatch.setattr(artifact_cache.CacheIndex, "COMMIT_SECONDS", 0)
+    other = wandb_artifacts.ArtifactsCache(cache._cache_dir)
+    assert other.check_md5_obj_path(md5_a, 1000)[1]
+
+    assert cache.cleanup(1000) == 1000
+    _, hit, _ = cache.check_md5_obj_path(md5_a, 1000)
+    assert hit
+
+
+def test_artifacts_cache_cleanup_interrupted_writes(cache):
+    cache.cleanup(100000)
+    _, _, opener = cache.check_md5_obj_path(base64.b64encode(b"aaa"), 1000)
+    with pytest.raises(RuntimeError):
+        with opener() as f:
+            f.write("a" * 1000)
+            # a write in progress isn't cleaned up
+            with mock.patch("os.walk", side_effect=AssertionError("walked")):
+                assert cache.cleanup(0) == 0
+            raise RuntimeError
+
+    with mock.patch("os.walk", side_effect=AssertionError("cache was walked")):
+        assert cache.cleanup(0) == 1000
+    assert cache._index.temp_files() == []
+
+
+def test_artifacts_cache_rewalk(cache, monkeypatch):
+    cache.cleanup(100000)
+    path = os.path.join(cache._cache_dir, "obj", "md5", "aa")
+    os.makedirs(path)
+    with open(os.path.join(path, "tmp_deadbeef"), "w") as f:
+        f.truncate(1000)
+    with open(os.path.join(path, "aardvark"), "w") as f:
+        f.truncate(2000)
+    assert cache.cleanup(0) == 0
+
+    monkeypatch.setattr(wandb_artifacts.ArtifactsCache, "_REWALK_SECONDS", 0)
+    assert cache.cleanup(0) == 3000
+    assert os.listdir(path) == []
+
+
+def test_artifacts_cache_max_size(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(wandb_artifacts.ArtifactsCache, "_EVICT_CHECK_SECONDS", 0)
+    cache = wandb_artifacts.ArtifactsCache(tmp_path, max_size=2500)
+    cache.cleanup(100000)
+
+    md5_a = _write_object(cache, "aaa", 1000)
+    _write_object(cache, "bbb", 1000)
+    _write_object(cache, "ccc", 1000)
+    # eviction runs in the background, wait for it
+    with cache._evict_lock:
+        pass
+
+    assert cache._index.total_size() == 2000
+    _, hit, _ = cache.check_md5_obj_path(md5_a, 1000)
+    assert not hit
+
+
 def test_local_file_handler_load_path_uses_cache(cache, tmp_path):
     file = tmp_path / "file.txt"
     file.write_text("hello")
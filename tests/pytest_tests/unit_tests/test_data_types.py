@@ -1,7 +1,10 @@
 import glob
+import hashlib
 import io
+import json
 import os
 import platform
+import threading
 from pathlib import Path
 
 import matplotlib.pyplot as plt
@@ -14,6 +17,7 @@ import wandb
 from bokeh.plotting import figure
 from PIL import Image
 from wandb import data_types
+from wandb.sdk.data_types import _private
 from wandb.sdk.data_types.base_types.media import _numpy_arrays_to_lists
 
 
@@ -340,6 +344,65 @@ def test_guess_mode():
     assert wbimg.image.mode == "RGB"
 
 
+def _reference_to_uint8(data):
+    # the scalar implementation of Image.to_uint8
+    dmin = np.min(data)
+    if dmin < 0:
+        data = (data - np.min(data)) / np.ptp(data)
+    if np.max(data) <= 1.0:
+        data = (data * 255).astype(np.int32)
+    return data.clip(0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        np.random.randint(256, size=(28, 28, 3), dtype=np.uint8),
+        np.random.randint(2, size=(28, 28), dtype=np.uint8),
+        np.random.randint(-300, 600, size=(28, 28)),
+        np.random.randint(0, 1000, size=(28, 28)),
+        np.random.uniform(0, 1, size=(28, 28, 3)),
+        np.random.uniform(0, 1, size=(28, 28)).astype(np.float32),
+        np.random.uniform(-1, 1, size=(28, 28, 4)),
+        np.random.uniform(0, 400, size=(28, 28)),
+    ],
+)
+def test_to_uint8(data):
+    expected = _reference_to_uint8(data)
+    converted = wandb.Image.to_uint8(data)
+    assert converted.dtype == np.uint8
+    assert np.array_equal(converted, expected)
+    assert not np.shares_memory(converted, data)
+
+
+@pytest.mark.parametrize(
+    "file_type, pil_format", [("jpeg", "JPEG"), ("webp", "WEBP"), ("png", "PNG")]
+)
+def test_image_file_type(file_type, pil_format):
+    data = np.random.randint(256, size=(28, 28, 4), dtype=np.uint8)
+    wbimg = wandb.Image(data, file_type=file_type)
+    assert wbimg.format == wbimg._path.rsplit(".", 1)[1]
+    with Image.open(wbimg._path) as saved:
+        assert saved.format == pil_format
+        assert saved.size == (28, 28)
+        if pil_format != "JPEG":
+            assert np.array_equal(np.array(saved), data)
+
+
+def test_image_invalid_file_type():
+    with pytest.raises(ValueError):
+        wandb.Image(np.zeros((28, 28)), file_type="tiff")
+
+
+def test_image_png_compress_level(monkeypatch):
+    data = np.tile(np.arange(256, dtype=np.uint8), (256, 1))
+    sizes = []
+    for level in (0, 9):
+        monkeypatch.setattr(wandb.Image, "PNG_COMPRESS_LEVEL", level)
+        sizes.append(wandb.Image(data)._size)
+    assert sizes[0] > sizes[1]
+
+
 def test_pil():
     pil = Image.new("L", (28, 28))
     img = wandb.Image(pil)
@@ -379,6 +442,58 @@ def test_image_from_matplotlib_with_image():
     plt.close()
 
 
+def test_image_encoded_in_background(monkeypatch):
+    encoding = threading.Event()
+    save = Image.Image.save
+
+    def slow_save(self, *args, **kwargs):
+        encoding.wait(10)
+        return save(self, *args, **kwargs)
+
+    monkeypatch.setattr(Image.Image, "save", slow_save)
+    data = np.random.randint(255, size=(28, 28, 3), dtype=np.uint8)
+    wbimg = wandb.Image(data)
+    assert wbimg._pending_file is not None
+    assert (wbimg._width, wbimg._height) == (28, 28)
+    # changes after the image was created aren't encoded
+    data[:] = 0
+
+    encoding.set()
+    with open(wbimg._path, "rb") as f:
+        assert hashlib.sha256(f.read()).hexdigest() == wbimg._sha256
+    assert wbimg._size == os.path.getsize(wbimg._path)
+    assert wbimg._pending_file is None
+    assert wbimg._image is None
+    assert np.array(wbimg.image).any()
+
+
+def test_image_encode_error(monkeypatch):
+    def failing_save(self, *args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(Image.Image, "save", failing_save)
+    wbimg = wandb.Image(np.zeros((28, 28)))
+    for _ in range(2):
+        with pytest.raises(OSError, match="disk full"):
+            wbimg.file_is_set()
+
+
+def test_media_encode_threads_zero(monkeypatch):
+    monkeypatch.setenv("WANDB_MEDIA_ENCODE_THREADS", "0")
+    monkeypatch.setattr(_private, "_encoder", None)
+    encoded_on = []
+    save = Image.Image.save
+
+    def save_thread(self, *args, **kwargs):
+        encoded_on.append(threading.current_thread())
+        return save(self, *args, **kwargs)
+
+    monkeypatch.setattr(Image.Image, "save", save_thread)
+    wbimg = wandb.Image(np.zeros((28, 28)))
+    assert encoded_on == [threading.current_thread()]
+    assert wbimg.file_is_set()
+
+
 @pytest.mark.skipif(
     platform.system() != "Windows", reason="Failure case is only happening on Windows"
 )
@@ -482,6 +597,32 @@ def test_audio_to_json(mock_run):
     assert subdict(meta["audio"][0], audio_expected) == audio_expected
 
 
+def test_audio_dedup_within_run(mock_run):
+    run = mock_run()
+    audio = np.zeros(44100)
+    first = wandb.Audio(audio, sample_rate=44100)
+    first.bind_to_run(run, "test", 0)
+    again = wandb.Audio(audio, sample_rate=44100)
+    tmp_path = again._path
+    again.bind_to_run(run, "test", 1)
+    other = wandb.Audio(np.ones(44100), sample_rate=44100)
+    other.bind_to_run(run, "test", 1)
+
+    assert again.to_json(run)["path"] == first.to_json(run)["path"]
+    assert other.to_json(run)["path"] != first.to_json(run)["path"]
+    assert not os.path.exists(tmp_path)
+    assert len(os.listdir(os.path.join(run.dir, "media", "audio"))) == 2
+
+
+def test_audio_no_dedup_with_id(mock_run):
+    run = mock_run()
+    audio = np.zeros(44100)
+    for i in range(2):
+        wandb.Audio(audio, sample_rate=44100).bind_to_run(run, "test", 0, id_=i)
+
+    assert len(os.listdir(os.path.join(run.dir, "media", "audio"))) == 2
+
+
 def test_audio_refs():
     audio_obj = wandb.Audio(
         "https://wandb-artifacts-refs-public-test.s3-us-west-2.amazonaws.com/StarWars3.wav"
@@ -1455,6 +1596,50 @@ def test_partitioned_table():
     assert partition_table != wandb.data_types.PartitionedTable(parts_path="parts2")
 
 
+def test_partitioned_table_writer():
+    artifact = wandb.Artifact("table", "dataset")
+    with wandb.data_types.PartitionedTableWriter(
+        artifact, "big", columns=["a", "b"], rows_per_part=10
+    ) as writer:
+        writer.add_data(0, "0")
+        writer.add_rows((i, str(i)) for i in range(1, 25))
+        writer.add_rows([])
+    table = writer.finish()
+
+    assert table == wandb.data_types.PartitionedTable(parts_path="big")
+    assert artifact.manifest.get_entry_by_path("big.partitioned-table.json")
+    entries = sorted(
+        artifact.manifest.get_entries_in_directory("big"), key=lambda e: e.path
+    )
+    assert [e.path for e in entries] == [
+        f"big/part_{n:05d}.table.json" for n in range(3)
+    ]
+    rows = []
+    for entry in entries:
+        with open(entry.local_path) as f:
+            part = json.load(f)
+        assert part["columns"] == ["a", "b"]
+        assert len(part["data"]) <= 10
+        rows.extend(part["data"])
+    assert rows == [[i, str(i)] for i in range(25)]
+    # the parts added to the artifact don't keep their rows around
+    assert all(
+        not added.obj.data
+        for added in artifact._added_objs.values()
+        if isinstance(added.obj, wandb.Table)
+    )
+
+
+def test_partitioned_table_writer_incompatible_types():
+    artifact = wandb.Artifact("table", "dataset")
+    writer = wandb.data_types.PartitionedTableWriter(
+        artifact, "big", columns=["a"], rows_per_part=2
+    )
+    writer.add_rows([[1], [2]])
+    with pytest.raises(TypeError):
+        writer.add_data("x")
+
+
 ################################################################################
 # Test various data types
 ################################################################################
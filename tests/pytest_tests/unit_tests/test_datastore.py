@@ -142,3 +142,150 @@ def test_data_write_fill(with_datastore):
         expected_records=records,
         expected_record_sizes=lengths,
     )
+
+
+def _write_records(ds, num, size=10):
+    for i in range(num):
+        rec = wandb_internal_pb2.Record(num=i + 1)
+        rec.history.item.add(key="k", value_json="x" * (size + i % 7))
+        ds.write(rec)
+    ds.close()
+
+
+def _scan_nums(ds):
+    nums = []
+    for data in ds.scan_records():
+        rec = wandb_internal_pb2.Record()
+        rec.ParseFromString(data)
+        nums.append(rec.num)
+    return nums
+
+
+@pytest.mark.parametrize("size", [10, 40000])
+def test_scan_mmap(with_datastore, size):
+    """Memory-mapped scan reads the same records as the file based scan."""
+    _write_records(with_datastore, 20, size=size)
+
+    ds = datastore.DataStore()
+    ds.open_for_scan(FNAME)
+    expected = list(ds.scan_records())
+    ds.close()
+
+    ds = datastore.DataStore()
+    ds.open_for_scan(FNAME, use_mmap=True)
+    found = [bytes(data) for data in ds.scan_records()]
+    assert ds.get_offset() == os.stat(FNAME).st_size
+    ds.close()
+    assert found == expected
+
+
+def test_scan_mmap_growing_file(with_datastore):
+    """Records written after the log was mapped are picked up."""
+    ds = with_datastore
+    ds.write(wandb_internal_pb2.Record(num=1))
+    ds.ensure_flushed(0)
+
+    reader = datastore.DataStore()
+    reader.open_for_scan(FNAME, use_mmap=True)
+    assert _scan_nums(reader) == [1]
+
+    ds.write(wandb_internal_pb2.Record(num=2))
+    ds.close()
+    assert _scan_nums(reader) == [2]
+    reader.close()
+
+
+@pytest.fixture()
+def with_buffered_datastore(request):
+    """Fixture which returns a datastore opened in buffered mode."""
+    try:
+        os.unlink(FNAME)
+    except FileNotFoundError:
+        pass
+    wandb._set_internal_process()
+    s = datastore.DataStore()
+    s.open_for_write(FNAME, flush_interval=3600, flush_bytes=32768 * 2)
+
+    def fin():
+        os.unlink(FNAME)
+
+    request.addfinalizer(fin)
+    return s
+
+
+def test_buffered_write_matches_unbuffered(with_buffered_datastore):
+    """Buffered mode produces the same log as unbuffered mode."""
+    _write_records(with_buffered_datastore, 50, size=3000)
+    with open(FNAME, "rb") as f:
+        buffered = f.read()
+    os.unlink(FNAME)
+
+    ds = datastore.DataStore()
+    ds.open_for_write(FNAME)
+    _write_records(ds, 50, size=3000)
+    with open(FNAME, "rb") as f:
+        assert f.read() == buffered
+
+
+def test_buffered_write_whole_blocks(with_buffered_datastore):
+    """Data is written out in whole blocks once the threshold is reached."""
+    ds = with_buffered_datastore
+    ds._write_data(b"\x01" * 32768)
+    assert os.stat(FNAME).st_size == 0
+    ds._write_data(b"\x01" * 32768)
+    assert os.stat(FNAME).st_size == 32768 * 2
+    ds.close()
+    assert os.stat(FNAME).st_size == 7 + 32768 * 2 + 7 * 4
+
+
+def test_buffered_write_ensure_flushed(with_buffered_datastore):
+    """Records requested by flow control recovery are readable."""
+    ds = with_buffered_datastore
+    _, end_offset, flush_offset = ds.write(wandb_internal_pb2.Record(num=1))
+    assert flush_offset == 0
+    assert os.stat(FNAME).st_size == 0
+    ds.ensure_flushed(end_offset)
+    assert os.stat(FNAME).st_size == end_offset
+
+    _, end_offset, _ = ds.write(wandb_internal_pb2.Record(num=2))
+    ds.ensure_flushed(end_offset)
+    reader = datastore.DataStore()
+    reader.open_for_scan(FNAME)
+    assert _scan_nums(reader) == [1, 2]
+    reader.close()
+    ds.close()
+
+
+def test_buffered_write_group_commit(with_buffered_datastore):
+    """Buffered records are committed once the flush interval expires."""
+    ds = with_buffered_datastore
+    ds.write(wandb_internal_pb2.Record(num=1))
+    ds.flush()
+    assert os.stat(FNAME).st_size == 0
+
+    ds._flush_interval = 0
+    ds.flush()
+    size = os.stat(FNAME).st_size
+    assert size > 0
+    _, end_offset, flush_offset = ds.write(wandb_internal_pb2.Record(num=2))
+    assert flush_offset == end_offset
+    ds.close()
+
+
+def test_buffered_write_flush_bytes_only(with_datastore, monkeypatch):
+    """Without a flush interval every write of the buffer is fsynced."""
+    with_datastore.close()
+    os.unlink(FNAME)
+    fsyncs = []
+    monkeypatch.setattr(datastore.os, "fsync", fsyncs.append)
+    ds = datastore.DataStore()
+    ds.open_for_write(FNAME, flush_bytes=32768)
+
+    _, _, flush_offset = ds._write_data(b"\x01" * 1000)
+    assert flush_offset == 0
+    assert not fsyncs
+    _, end_offset, flush_offset = ds._write_data(b"\x01" * 32768)
+    assert len(fsyncs) == 1
+    assert flush_offset == os.stat(FNAME).st_size == 32768
+    assert flush_offset < end_offset
+    ds.close()
@@ -1,10 +1,18 @@
+import gzip
+import http.server
 import itertools
+import json
 import os
 import random
 import string
+import threading
+import time
 from dataclasses import dataclass
+from unittest import mock
 
+import pytest
 from wandb import util
+from wandb.sdk.internal import file_stream
 from wandb.sdk.internal.file_stream import CRDedupeFilePolicy
 from wandb.sdk.lib.file_stream_utils import split_files
 
@@ -193,3 +201,236 @@ def test_crdedupe_process_chunks():
     files["output.log"] = ret
     file_requests = list(split_files(files, max_bytes=util.MAX_LINE_BYTES))
     assert 2 == len(file_requests)
+
+
+@pytest.fixture
+def file_stream_server():
+    """Local stand-in for the file_stream endpoint that records decoded posts."""
+    requests = []
+    active = []
+    lock = threading.Lock()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self):  # noqa: N802
+            with lock:
+                active.append(self)
+                server.max_active = max(server.max_active, len(active))
+            time.sleep(server.delay)
+            with lock:
+                active.remove(self)
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            encoding = self.headers.get("Content-Encoding")
+            if encoding == "gzip":
+                body = gzip.decompress(body)
+            elif encoding == "zstd":
+                body = pytest.importorskip("zstandard").decompress(body)
+            requests.append((encoding, len(body), json.loads(body)))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.requests = requests
+    server.delay = 0
+    server.max_active = 0
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _file_stream_api(base_url, compression=None, max_inflight=1):
+    api = mock.MagicMock()
+    api.api_key = "key"
+    api.user_agent = "wandb-test"
+    api.dynamic_settings = {"heartbeat_seconds": 30}
+    api.settings.return_value = {
+        "base_url": base_url,
+        "entity": "entity",
+        "project": "project",
+    }
+    return file_stream.FileStreamApi(
+        api, "run", time.time(), compression=compression, max_inflight=max_inflight
+    )
+
+
+def _history_chunks(num_rows):
+    return [
+        file_stream.Chunk(
+            "wandb-history.jsonl",
+            json.dumps({f"metric_{k}": i * k for k in range(100)}),
+        )
+        for i in range(num_rows)
+    ]
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_send_compressed(file_stream_server, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    fs = _file_stream_api(file_stream_server.base_url, compression=compression)
+    fs.set_file_policy("wandb-history.jsonl", file_stream.JsonlFilePolicy())
+
+    assert fs._send(_history_chunks(50), uploaded={"model.h5"})
+
+    # the uploaded notification is coalesced into the files request
+    assert len(file_stream_server.requests) == 1
+    encoding, raw_size, payload = file_stream_server.requests[0]
+    assert encoding == compression
+    assert payload["files"]["wandb-history.jsonl"]["offset"] == 0
+    assert len(payload["files"]["wandb-history.jsonl"]["content"]) == 50
+    assert payload["uploaded"] == ["model.h5"]
+    assert fs.bytes_uncompressed == raw_size
+    assert 0 < fs.bytes_compressed < fs.bytes_uncompressed
+
+
+def test_send_uncompressed(file_stream_server):
+    fs = _file_stream_api(file_stream_server.base_url)
+    fs.set_file_policy("wandb-history.jsonl", file_stream.JsonlFilePolicy())
+
+    assert fs._send(_history_chunks(5), uploaded={"model.h5"})
+
+    assert [encoding for encoding, _, _ in file_stream_server.requests] == [
+        None,
+        None,
+    ]
+    assert file_stream_server.requests[1][2]["uploaded"] == ["model.h5"]
+    assert fs.bytes_compressed == fs.bytes_uncompressed == 0
+
+
+def test_stream_compressed_finish(file_stream_server):
+    fs = _file_stream_api(file_stream_server.base_url, compression="gzip")
+    fs.set_file_policy("wandb-history.jsonl", file_stream.JsonlFilePolicy())
+    fs.start()
+    for chunk in _history_chunks(10):
+        fs.push(chunk.filename, chunk.data)
+    fs.finish(0)
+
+    payloads = [payload for _, _, payload in file_stream_server.requests]
+    assert all(encoding == "gzip" for encoding, _, _ in file_stream_server.requests)
+    assert (
+        sum(
+            len(p["files"]["wandb-history.jsonl"]["content"])
+            for p in payloads
+            if "files" in p
+        )
+        == 10
+    )
+    assert payloads[-1]["complete"] is True
+    assert payloads[-1]["exitcode"] == 0
+
+
+def test_spill_queue_preserves_order():
+    q = file_stream.SpillQueue(max_bytes=10)
+    items = [file_stream.Chunk("output.log", "abcde") for _ in range(2)]
+    items += [file_stream.Chunk("output.log", str(i)) for i in range(20)]
+    items += [file_stream.FileStreamApi.Finish(0)]
+    for item in items:
+        q.put(item)
+    # only the first two chunks fit in memory
+    assert q.qsize() == len(items)
+    assert q.spilled() == len(items) - 2
+
+    read = []
+    while len(read) < len(items):
+        read += q.read_many(5, timeout=0)
+    assert read == items
+    assert q.qsize() == q.spilled() == 0
+
+    # once the backlog drained, items are buffered in memory again
+    q.put(file_stream.Chunk("output.log", "x"))
+    assert q.spilled() == 0
+    assert q.read_many(5, timeout=0) == [file_stream.Chunk("output.log", "x")]
+    q.close()
+
+
+def test_rate_controller_batch_size():
+    rc = file_stream.RateController(min_batch=10, max_batch=80)
+    for expected in (20, 40, 80, 80):
+        rc.observe_backlog(1000)
+        assert rc.batch_size == expected
+    rc.observe_backlog(30)
+    assert rc.batch_size == 80
+    for expected in (40, 20, 10, 10):
+        rc.observe_backlog(0)
+        assert rc.batch_size == expected
+
+
+def test_rate_controller_send_interval():
+    rc = file_stream.RateController(min_batch=10, max_batch=80)
+    assert rc.send_interval(1.0, 30) == 1.0
+    rc.observe_latency(0.1)
+    assert rc.send_interval(1.0, 30) == 1.0
+    for _ in range(20):
+        rc.observe_latency(3.0)
+    assert rc.send_interval(1.0, 30) == pytest.approx(6.0, rel=0.01)
+    rc.observe_latency(300.0)
+    assert rc.send_interval(1.0, 30) == 30
+
+
+def test_stream_spilled_backlog(file_stream_server):
+    fs = _file_stream_api(file_stream_server.base_url)
+    fs._queue = file_stream.SpillQueue(max_bytes=1000)
+    fs.set_file_policy("wandb-history.jsonl", file_stream.JsonlFilePolicy())
+    chunks = _history_chunks(20)
+    for chunk in chunks:
+        fs.push(chunk.filename, chunk.data)
+    assert fs.backlog == 20
+    assert fs._queue.spilled() > 0
+    fs.start()
+    fs.finish(0)
+
+    content = []
+    for _, _, payload in file_stream_server.requests:
+        if "files" in payload:
+            content += payload["files"]["wandb-history.jsonl"]["content"]
+    assert content == [chunk.data for chunk in chunks]
+
+
+def test_send_pipelined(file_stream_server):
+    file_stream_server.delay = 0.05
+    fs = _file_stream_api(file_stream_server.base_url, max_inflight=4)
+    fs.set_file_policy("wandb-history.jsonl", file_stream.JsonlFilePolicy())
+    for i in range(5):
+        chunks = _history_chunks(3)
+        chunks.append(file_stream.Chunk(f"media-{i}.txt", "line\n"))
+        assert fs._send(chunks, uploaded={f"model-{i}.h5"})
+    fs._wait_inflight()
+
+    # requests for different files overlap, but each file's chunks arrive
+    # in offset order
+    assert file_stream_server.max_active > 1
+    offsets = [
+        payload["files"]["wandb-history.jsonl"]["offset"]
+        for _, _, payload in file_stream_server.requests
+        if "wandb-history.jsonl" in payload.get("files", {})
+    ]
+    assert offsets == [0, 3, 6, 9, 12]
+    uploaded = [
+        name
+        for _, _, payload in file_stream_server.requests
+        for name in payload.get("uploaded", [])
+    ]
+    assert sorted(uploaded) == [f"model-{i}.h5" for i in range(5)]
+
+
+def test_stream_pipelined_finish(file_stream_server):
+    file_stream_server.delay = 0.05
+    fs = _file_stream_api(file_stream_server.base_url, max_inflight=4)
+    fs.set_file_policy("wandb-history.jsonl", file_stream.JsonlFilePolicy())
+    fs.start()
+    for chunk in _history_chunks(10):
+        fs.push(chunk.filename, chunk.data)
+    fs.push_success("artifact", "model.h5")
+    fs.finish(0)
+
+    payloads = [payload for _, _, payload in file_stream_server.requests]
+    # the final message waits for every in-flight request
+    assert payloads[-1]["complete"] is True
+    assert sum(len(p.get("uploaded", [])) for p in payloads) == 1
@@ -0,0 +1,147 @@
+"""Summary metrics computed by the handler for defined metrics.
+
+The expected summaries are the ones computed by the handler before summary
+plans were compiled per key, when each value looked up its metric definition.
+"""
+
+import json
+import queue
+from unittest.mock import MagicMock
+
+import pytest
+from wandb.proto.wandb_internal_pb2 import HistoryRecord, MetricRecord, Record
+from wandb.sdk.internal.handler import HandleManager
+from wandb.sdk.internal.settings_static import SettingsStatic
+
+
+@pytest.fixture
+def handler(test_settings):
+    return HandleManager(
+        settings=SettingsStatic(dict(test_settings({"mode": "offline"}))),
+        record_q=MagicMock(),
+        result_q=MagicMock(),
+        stopped=MagicMock(),
+        writer_q=queue.Queue(),
+        interface=MagicMock(),
+        context_keeper=MagicMock(),
+    )
+
+
+def define_metric(
+    handler, name=None, glob_name=None, goal=None, summary=(), step_metric=None
+):
+    metric = MetricRecord()
+    if name:
+        metric.name = name
+    if glob_name:
+        metric.glob_name = glob_name
+    if goal:
+        metric.goal = getattr(MetricRecord, f"GOAL_{goal.upper()}")
+    if step_metric:
+        metric.step_metric = step_metric
+    for summary_metric in summary:
+        setattr(metric.summary, summary_metric, True)
+    handler.handle_metric(Record(metric=metric))
+
+
+def log(handler, row):
+    history = HistoryRecord()
+    for k, v in row.items():
+        item = history.item.add()
+        item.key = k
+        item.value_json = json.dumps(v)
+    handler.handle_history(Record(history=history))
+
+
+def summary(handler):
+    return {
+        k: v for k, v in handler._consolidated_summary.items() if not k.startswith("_")
+    }
+
+
+def test_summary_glob_metric(handler):
+    define_metric(handler, glob_name="acc*", summary=["max"])
+    log(handler, {"acc_a": 1, "acc_b": 5, "loss": 1})
+    log(handler, {"acc_a": 3, "acc_b": 4, "loss": 0.5})
+    log(handler, {"acc_a": 2})
+
+    assert summary(handler) == {
+        "acc_a": {"max": 3},
+        "acc_b": {"max": 5},
+        "loss": 0.5,
+    }
+
+
+def test_summary_nested_keys(handler):
+    # nested keys inherit the definition of their parent
+    define_metric(handler, name="a", summary=["min", "last"])
+    define_metric(handler, name="c.d", summary=["mean"])
+    define_metric(handler, name="e\\.f", summary=["max"])
+    log(
+        handler,
+        {"a": {"b": 1, "c": {"x": 2}}, "c": {"d": 2, "e": 1}, "e.f": 1},
+    )
+    log(
+        handler,
+        {"a": {"b": 0, "c": {"x": 5}}, "c": {"d": 4, "e": 3}, "e.f": 3},
+    )
+    log(handler, {"a": {"b": 3}, "c": {"d": 3}, "e.f": 2})
+
+    assert summary(handler) == {
+        "a": {"b": {"last": 3, "min": 0}, "c": {"x": {"last": 5, "min": 2}}},
+        "c": {"d": {"mean": 3.0}},
+        "e.f": {"max": 3},
+    }
+
+
+def test_summary_best(handler):
+    define_metric(handler, name="loss", summary=["best"], goal="minimize")
+    define_metric(handler, name="acc", summary=["best"], goal="maximize")
+    # minimized without a goal
+    define_metric(handler, name="x", summary=["best"])
+    # a new min updates best too, even though the goal is to maximize
+    define_metric(handler, name="both", summary=["best", "min", "max"], goal="maximize")
+    for v in [3, 1, 2, 5, 0.5, 4]:
+        log(handler, {"loss": v, "acc": v, "x": v, "both": v})
+
+    assert summary(handler) == {
+        "loss": {"best": 0.5},
+        "acc": {"best": 5},
+        "x": {"best": 0.5},
+        "both": {"best": 0.5, "max": 5, "min": 0.5},
+    }
+
+
+def test_summary_nan_and_non_numeric_values(handler):
+    define_metric(handler, name="m", summary=["min", "max", "mean", "last"])
+    define_metric(handler, name="c", summary=["copy"])
+    define_metric(handler, name="b", summary=["best"], goal="maximize")
+    for v in [1, 2, float("nan"), "str", None, 0.5, [1, 2], True]:
+        log(handler, {"m": v, "c": v, "b": v})
+
+    # NaN, strings, None and lists are skipped, booleans are numbers
+    assert summary(handler) == {
+        "m": {"last": True, "max": 2, "mean": 1.125, "min": 0.5},
+        "c": True,
+        "b": {"best": 2},
+    }
+
+
+def test_summary_define_metric_after_logging(handler):
+    define_metric(handler, name="a", summary=["min"])
+    log(handler, {"a": 2, "lt": {"v": 5}, "n": {"x": 1, "y": 4}})
+    log(handler, {"a": 1, "lt": {"v": 3}, "n": {"x": 3, "y": 2}})
+
+    # the keys were already summarized, their definitions change
+    define_metric(handler, name="a", summary=["max"])
+    define_metric(handler, name="n", summary=["mean"])
+    define_metric(handler, glob_name="lt*", summary=["min", "last"])
+    define_metric(handler, name="n.y", summary=["max"])
+    log(handler, {"a": 4, "lt": {"v": 4}, "n": {"x": 5, "y": 3}})
+    log(handler, {"a": 0, "lt": {"v": 6}, "n": {"x": 1, "y": 1}})
+
+    assert summary(handler) == {
+        "a": {"max": 4, "min": 0},
+        "lt": {"v": {"last": 6, "min": 4}},
+        "n": {"x": {"mean": 3.0}, "y": {"max": 3}},
+    }
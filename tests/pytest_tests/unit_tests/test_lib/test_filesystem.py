@@ -148,6 +148,67 @@ def test_copy_or_overwrite_changed_unfixable(tmp_path):
     assert "Unable to overwrite" in str(e.value)
 
 
+@pytest.mark.skipif(platform.system() == "Windows", reason="links need privileges")
+@pytest.mark.parametrize("mode", ["hardlink", "symlink"])
+def test_copy_or_overwrite_changed_link(tmp_path, mode):
+    source_path = tmp_path / "cache" / "obj"
+    target_path = tmp_path / "root" / "file.txt"
+    write_pause(source_path, "cached")
+
+    with patch("shutil.copy2") as copy2_mock:
+        dest_path = copy_or_overwrite_changed(source_path, target_path, mode=mode)
+        assert not copy2_mock.called
+    assert dest_path.read_text() == "cached"
+    assert os.path.samefile(dest_path, source_path)
+    assert dest_path.is_symlink() == (mode == "symlink")
+    assert not os.stat(dest_path).st_mode & stat.S_IWUSR
+
+
+@pytest.mark.skipif(platform.system() == "Windows", reason="links need privileges")
+def test_copy_or_overwrite_changed_replaces_link(tmp_path):
+    old_path = tmp_path / "cache" / "old"
+    new_path = tmp_path / "cache" / "new"
+    target_path = tmp_path / "file.txt"
+    write_pause(old_path, "old")
+    write_pause(new_path, "new")
+    copy_or_overwrite_changed(old_path, target_path, mode="hardlink")
+
+    # copying over a hardlink must not write through it into the cache
+    copy_or_overwrite_changed(new_path, target_path)
+    assert target_path.read_text() == "new"
+    assert old_path.read_text() == "old"
+    assert not os.path.samefile(target_path, new_path)
+
+
+def test_copy_or_overwrite_changed_link_fallback(tmp_path):
+    source_path = tmp_path / "new_file.txt"
+    target_path = tmp_path / "target_file.txt"
+    write_pause(source_path, "original")
+
+    with patch("os.link", side_effect=OSError("cross-device link")):
+        dest_path = copy_or_overwrite_changed(source_path, target_path, "hardlink")
+    assert dest_path.read_text() == "original"
+    assert not os.path.samefile(dest_path, source_path)
+    assert dest_path.stat().st_mode & stat.S_IWUSR
+
+
+def test_copy_or_overwrite_changed_reflink(tmp_path):
+    source_path = tmp_path / "new_file.txt"
+    target_path = tmp_path / "target_file.txt"
+    write_pause(source_path, "original")
+
+    # falls back to a copy where the filesystem can't clone files
+    dest_path = copy_or_overwrite_changed(source_path, target_path, "reflink")
+    assert dest_path.read_text() == "original"
+    assert not os.path.samefile(dest_path, source_path)
+    assert dest_path.stat().st_mtime == source_path.stat().st_mtime
+
+
+def test_copy_or_overwrite_changed_unknown_mode(tmp_path):
+    with pytest.raises(ValueError, match="Unknown link mode"):
+        copy_or_overwrite_changed(tmp_path / "a", tmp_path / "b", "move")
+
+
 @pytest.mark.parametrize("binary", ["", "b", "t"])
 @pytest.mark.parametrize("mode", ["w", "w+", "a", "a+"])
 def test_safe_write_interrupted_overwrites(binary, mode):
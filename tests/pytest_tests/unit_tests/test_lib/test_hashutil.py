@@ -1,5 +1,8 @@
 import base64
 import hashlib
+import os
+import sqlite3
+from unittest import mock
 
 from hypothesis import given
 from hypothesis import strategies as st
@@ -67,3 +70,109 @@ def test_md5_file_hex_three_files(data1, text, data2):
     # Intentionally provide the paths out of order (check sorting).
     path_hash = hashutil.md5_file_hex("c.bin", "a.bin", "b.txt")
     assert hashlib.md5(data).hexdigest() == path_hash
+
+
+def _age(path, seconds=60):
+    # the cache skips files modified in the last couple of seconds
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - int(seconds * 1e9)))
+
+
+def test_checksum_cache(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"hello")
+    _age(path)
+    db = tmp_path / "checksums.db"
+
+    cache = hashutil.ChecksumCache(db)
+    with mock.patch.object(
+        hashutil, "md5_file_b64", wraps=hashutil.md5_file_b64
+    ) as md5_file_b64:
+        assert cache.md5_file_b64(path) == hashutil.md5_string("hello")
+        assert cache.md5_file_b64(path) == hashutil.md5_string("hello")
+        cache.close()
+
+        # the digest is persisted
+        cache = hashutil.ChecksumCache(db)
+        assert cache.md5_file_b64(path) == hashutil.md5_string("hello")
+        assert md5_file_b64.call_count == 1
+
+        # changed files are hashed again
+        path.write_bytes(b"world!")
+        _age(path, 30)
+        assert cache.md5_file_b64(path) == hashutil.md5_string("world!")
+        assert md5_file_b64.call_count == 2
+    cache.close()
+
+
+def test_checksum_cache_racy_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"hello")
+    cache = hashutil.ChecksumCache(tmp_path / "checksums.db")
+    assert cache.md5_file_b64(path) == hashutil.md5_string("hello")
+    assert cache.get(path, os.stat(path)) is None
+    cache.close()
+
+
+def test_checksum_cache_put_written(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"hello")
+    db = tmp_path / "checksums.db"
+    cache = hashutil.ChecksumCache(db)
+    cache.put_written(path, hashutil.md5_string("hello"))
+    cache.close()
+
+    cache = hashutil.ChecksumCache(db)
+    with mock.patch.object(hashutil, "md5_file_b64") as md5_file_b64:
+        assert cache.md5_file_b64(path) == hashutil.md5_string("hello")
+    md5_file_b64.assert_not_called()
+    cache.close()
+
+
+def test_checksum_cache_md5_copy(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"hello")
+    _age(path)
+    cache = hashutil.ChecksumCache(tmp_path / "checksums.db")
+
+    copy_path = tmp_path / "copy.bin"
+    md5 = cache.md5_copy_b64(path, os.stat(path), copy_path)
+    assert md5 == hashutil.md5_string("hello")
+    assert copy_path.read_bytes() == b"hello"
+
+    # the cached digest is reused and the copy isn't hashed
+    copy_path.write_bytes(b"")
+    with mock.patch.object(hashutil, "copy_file_md5_b64") as copy_file_md5_b64:
+        assert cache.md5_copy_b64(path, os.stat(path), copy_path) == md5
+    copy_file_md5_b64.assert_not_called()
+    assert copy_path.read_bytes() == b"hello"
+    cache.close()
+
+
+def test_checksum_cache_unusable(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"hello")
+    _age(path)
+    cache = hashutil.ChecksumCache(tmp_path / "missing" / "checksums.db")
+    assert cache.md5_file_b64(path) == hashutil.md5_string("hello")
+    cache.flush()
+    assert cache.get(path, os.stat(path)) is None
+
+
+def test_checksum_cache_rollback_journal(tmp_path):
+    # WAL doesn't work on network filesystems
+    db_path = tmp_path / "checksums.db"
+    db = sqlite3.connect(db_path)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.close()
+
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"hello")
+    _age(path)
+    cache = hashutil.ChecksumCache(db_path)
+    assert cache.md5_file_b64(path) == hashutil.md5_string("hello")
+    cache.close()
+    db = sqlite3.connect(db_path)
+    assert db.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    db.close()
+    assert not os.path.exists(f"{db_path}-wal")
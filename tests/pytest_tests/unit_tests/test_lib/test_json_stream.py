@@ -0,0 +1,56 @@
+import json
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from wandb.sdk.lib import json_stream
+
+json_values = st.recursive(
+    st.none()
+    | st.booleans()
+    | st.integers()
+    | st.floats(allow_nan=False, allow_infinity=False)
+    | st.text(),
+    lambda children: st.lists(children) | st.dictionaries(st.text(), children),
+    max_leaves=10,
+)
+
+
+def split(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+@given(st.dictionaries(st.text(), json_values), st.integers(1, 20), st.booleans())
+def test_iter_object_items(obj, size, indent):
+    text = json.dumps(obj, indent=4 if indent else None)
+    assert dict(json_stream.iter_object_items(split(text, size))) == obj
+
+
+def test_stream_keys():
+    text = json.dumps({"a": 1, "contents": {"x": [1], "y": {"z": 2}}, "b": 12345})
+    items = []
+    for key, value in json_stream.iter_object_items(
+        split(text, 3), stream_keys=("contents",)
+    ):
+        if key == "contents":
+            value = list(value)
+        items.append((key, value))
+    assert items == [
+        ("a", 1),
+        ("contents", [("x", [1]), ("y", {"z": 2})]),
+        ("b", 12345),
+    ]
+
+
+def test_unconsumed_stream_keys_are_skipped():
+    text = json.dumps({"contents": {"x": 1, "y": 2}, "b": 2})
+    items = json_stream.iter_object_items(split(text, 4), stream_keys=("contents",))
+    assert [key for key, _ in items] == ["contents", "b"]
+
+
+@pytest.mark.parametrize(
+    "text", ["", "[1]", '{"a": 1', '{"a": 1}{}', '{"a" 1}', "{1: 2}"]
+)
+def test_invalid(text):
+    with pytest.raises(ValueError):
+        dict(json_stream.iter_object_items(split(text, 2)))
@@ -1,4 +1,8 @@
+import socket
+import threading
+
 import pytest
+from wandb.proto import wandb_internal_pb2 as pb
 from wandb.sdk.lib import sock_client
 
 
@@ -86,3 +90,104 @@ def test_get_index_error():
     assert buffer.length == 7
     with pytest.raises(IndexError):
         buffer.get(3, 8)
+
+
+def test_get_after_compact():
+    buffer = sock_client.SockBuffer(size=8)
+    buffer.put(b"012345", 6)
+    assert buffer.get(0, 4) == b"0123"
+    # no room after the unread data, it is moved to the front
+    buffer.put(b"abcd", 4)
+    assert buffer.length == 6
+    assert buffer.get(0, 6) == b"45abcd"
+
+
+def test_grow_keeps_views():
+    buffer = sock_client.SockBuffer(size=4)
+    buffer.put(b"0123", 4)
+    view = buffer.peek(0, 4)
+    buffer.put(b"abcdef", 6)
+    assert view == b"0123"
+    assert buffer.get(2, 10) == b"23abcdef"
+
+
+def test_recv_into():
+    a, b = socket.socketpair()
+    try:
+        buffer = sock_client.SockBuffer(size=4)
+        a.sendall(b"0123456789")
+        received = 0
+        while received < 10:
+            received += buffer.recv_into(b, 3)
+        assert buffer.get(0, 10) == b"0123456789"
+    finally:
+        a.close()
+        b.close()
+
+
+def test_read_messages():
+    a, b = socket.socketpair()
+    try:
+        sender = sock_client.SockClient()
+        sender.set_socket(a)
+        receiver = sock_client.SockClient()
+        receiver.set_socket(b)
+
+        def send():
+            for num in range(100):
+                record = pb.Record(num=num)
+                record.history.item.add(key="k", value_json="x" * num * 100)
+                sender.send_record_publish(record)
+
+        thread = threading.Thread(target=send)
+        thread.start()
+        for num in range(100):
+            request = receiver.read_server_request()
+            assert request.record_publish.num == num
+            assert len(request.record_publish.history.item[0].value_json) == num * 100
+        thread.join()
+    finally:
+        a.close()
+        b.close()
+
+
+def test_publish_batching():
+    a, b = socket.socketpair()
+    try:
+        sender = sock_client.SockClient()
+        sender.set_socket(a)
+        sender.enable_publish_batching(3600)
+        receiver = sock_client.SockClient()
+        receiver.set_socket(b)
+        for num in range(10):
+            sender.send_record_publish(pb.Record(num=num))
+        assert receiver.read_server_response(timeout=0.1) is None
+
+        # other messages are sent after the batched records
+        sender.send_record_communicate(pb.Record(num=10))
+        for num in range(10):
+            request = receiver.read_server_request()
+            assert request.record_publish == pb.Record(num=num)
+        assert receiver.read_server_request().record_communicate.num == 10
+
+        sender.send_record_publish(pb.Record(num=11))
+        sender.flush()
+        assert receiver.read_server_request().record_publish.num == 11
+    finally:
+        a.close()
+        b.close()
+
+
+def test_publish_batching_delay():
+    a, b = socket.socketpair()
+    try:
+        sender = sock_client.SockClient()
+        sender.set_socket(a)
+        sender.enable_publish_batching(0.01)
+        receiver = sock_client.SockClient()
+        receiver.set_socket(b)
+        sender.send_record_publish(pb.Record(num=1))
+        assert receiver.read_server_request().record_publish.num == 1
+    finally:
+        a.close()
+        b.close()
@@ -37,3 +37,27 @@ def test_all():
         for n in range(1000):
             sampled = doit(n, samples=s)
             check(n, sampled, samples=s)
+
+
+def test_int_values():
+    s = sample.UniformSampleAccumulator()
+    for n in range(10):
+        s.add(n)
+    assert s.integral
+    assert s.get() == tuple(range(10))
+    assert all(isinstance(v, int) for v in s.get())
+
+
+def test_widen_to_float():
+    s = sample.UniformSampleAccumulator()
+    s.add(1)
+    s.add(2**70)
+    s.add(0.5)
+    assert not s.integral
+    assert s.get() == (1.0, float(2**70), 0.5)
+
+
+def test_empty():
+    s = sample.UniformSampleAccumulator()
+    assert s.integral
+    assert s.get() == tuple()
@@ -13,6 +13,7 @@ from wandb.filesync.step_prepare import (
     RequestPrepare,
     ResponsePrepare,
     StepPrepare,
+    _BatchSizer,
     gather_batch,
 )
 
@@ -280,7 +281,11 @@ class TestStepPrepare:
         def prepare_and_resolve():
             q = step_prepare.prepare_sync(*args, **kwargs)
             enqueued.set()
-            future.set_result(q.get())
+            res = q.get()
+            if isinstance(res, Exception):
+                future.set_exception(res)
+            else:
+                future.set_result(res)
 
         threading.Thread(
             name="prepare_and_resolve",
@@ -310,7 +315,10 @@ class TestStepPrepare:
             prepare_async_future = step_prepare.prepare_async(*args, **kwargs)
             # Note: ^that's an asyncio.Future, not a concurrent.futures.Future
             enqueued.set()
-            future.set_result(await prepare_async_future)
+            try:
+                future.set_result(await prepare_async_future)
+            except Exception as e:
+                future.set_exception(e)
 
         threading.Thread(
             name="prepare_and_resolve",
@@ -362,6 +370,33 @@ class TestStepPrepare:
             birth_artifact_id=caf_result["foo"]["artifact"]["id"],
         )
 
+    def test_multipart_upload_urls(self, prepare: "PrepareFixture"):
+        caf_result = mock_create_artifact_files_result(["foo"])
+        caf_result["foo"]["storagePath"] = "some/storage/path"
+        caf_result["foo"]["uploadMultipartUrls"] = {
+            "uploadID": "some-upload-id",
+            "uploadUrlParts": [
+                {"partNumber": 1, "uploadUrl": "http://wandb-test/part-1"},
+                {"partNumber": 2, "uploadUrl": "http://wandb-test/part-2"},
+            ],
+        }
+        api = Mock(create_artifact_files=Mock(return_value=caf_result))
+
+        step_prepare = StepPrepare(
+            api=api, batch_time=1e-12, inter_event_time=1e-12, max_batch_size=1
+        )
+        step_prepare.start()
+
+        res = prepare(step_prepare, simple_file_spec(name="foo")).result()
+        step_prepare.finish()
+
+        assert res.upload_id == "some-upload-id"
+        assert res.storage_path == "some/storage/path"
+        assert res.multipart_upload_urls == {
+            1: "http://wandb-test/part-1",
+            2: "http://wandb-test/part-2",
+        }
+
     def test_batches_requests(self, prepare: "PrepareFixture"):
         caf_result = mock_create_artifact_files_result(["a", "b"])
         api = Mock(create_artifact_files=Mock(return_value=caf_result))
@@ -410,3 +445,103 @@ class TestStepPrepare:
 
         step_prepare._thread.join()
         assert not step_prepare.is_alive()
+
+    def test_failed_call_fails_requests(self, prepare: "PrepareFixture"):
+        api = Mock(create_artifact_files=Mock(side_effect=ValueError("oops")))
+        step_prepare = StepPrepare(
+            api=api, batch_time=1, inter_event_time=1, max_batch_size=2
+        )
+        step_prepare.start()
+
+        futures = [prepare(step_prepare, simple_file_spec(name=n)) for n in "ab"]
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result(timeout=5)
+
+        # later batches are still sent
+        api.create_artifact_files.side_effect = None
+        api.create_artifact_files.return_value = mock_create_artifact_files_result(
+            ["c"]
+        )
+        future = prepare(step_prepare, simple_file_spec(name="c"))
+        step_prepare.finish()
+        assert future.result(timeout=5).birth_artifact_id == "artifact-id-c"
+
+    def test_sends_batches_concurrently(self, prepare: "PrepareFixture"):
+        in_flight = threading.Semaphore(0)
+        release = threading.Event()
+
+        def create_artifact_files(specs):
+            in_flight.release()
+            assert release.wait(timeout=5)
+            return mock_create_artifact_files_result(spec["name"] for spec in specs)
+
+        api = Mock(create_artifact_files=Mock(side_effect=create_artifact_files))
+        step_prepare = StepPrepare(
+            api=api,
+            batch_time=1e-12,
+            inter_event_time=1e-12,
+            max_batch_size=1,
+            max_concurrent_batches=2,
+        )
+        step_prepare.start()
+
+        futures = [prepare(step_prepare, simple_file_spec(name=n)) for n in "abc"]
+        # two batches are in flight, the third waits for one of them
+        assert in_flight.acquire(timeout=5)
+        assert in_flight.acquire(timeout=5)
+        assert not in_flight.acquire(timeout=0.2)
+
+        release.set()
+        step_prepare.finish()
+        assert [f.result(timeout=5).birth_artifact_id for f in futures] == [
+            "artifact-id-a",
+            "artifact-id-b",
+            "artifact-id-c",
+        ]
+
+        stats = step_prepare.stats()
+        assert stats.batches == 3
+        assert stats.files == 3
+        assert stats.queue_wait_max >= 0.2
+        assert stats.queue_wait_total >= stats.queue_wait_max
+
+
+class TestBatchSizer:
+    def test_uses_max_batch_size_until_observed(self):
+        assert _BatchSizer(100, target_latency=2).batch_size() == 100
+
+    def test_targets_latency(self):
+        sizer = _BatchSizer(1000, target_latency=2)
+        sizer.observe(100, 1.0)
+        assert sizer.batch_size() == 200
+
+        sizer.observe(200, 8.0)
+        assert 10 <= sizer.batch_size() < 200
+
+    def test_clamps_batch_size(self):
+        sizer = _BatchSizer(1000, target_latency=2)
+        sizer.observe(100, 0.001)
+        assert sizer.batch_size() == 1000
+        sizer = _BatchSizer(1000, target_latency=2)
+        sizer.observe(1, 100)
+        assert sizer.batch_size() == 10
+
+    def test_fixed_cost_does_not_shrink_batches(self):
+        # a slow backend: 2.5s per call plus 0.5ms per file
+        sizer = _BatchSizer(1000, target_latency=2)
+        sizes = []
+        for _ in range(40):
+            size = sizer.batch_size()
+            sizes.append(size)
+            sizer.observe(size, 2.5 + 0.0005 * size)
+        # one smaller batch tells the fixed cost from the cost per file
+        assert min(sizes) >= 500
+        assert sizes[2:] == [1000] * 38
+
+    def test_fits_cost_per_file(self):
+        # 0.1s per call plus 10ms per file, 190 files take 2s
+        sizer = _BatchSizer(1000, target_latency=2)
+        for size in [1000, 50, 400, 100]:
+            sizer.observe(size, 0.1 + 0.01 * size)
+        assert 185 <= sizer.batch_size() <= 190
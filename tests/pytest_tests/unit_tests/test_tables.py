@@ -258,3 +258,88 @@ def test_datetime_conversion():
         [975628800000, 975628800000, 975628800000, 1],
         [975715200000, 975715200000, 975715200000, 2],
     ]
+
+
+@pytest.mark.parametrize(
+    "rows, optional",
+    [
+        ([[1, "a"], [2.5, "b"], [np.int64(3), "c"]], False),
+        ([[1, None], [None, "b"], [float("nan"), "c"]], True),
+        ([[float("nan"), "a"], [1.5, "b"]], True),
+        ([[True, [1, 2]], [np.bool_(False), [3]]], False),
+        ([[datetime.date(2020, 1, 1), {"a": 1}], [None, {"a": 2}]], True),
+        ([[np.zeros(3), "x"], [np.ones(3), None]], True),
+    ],
+)
+def test_add_rows_matches_add_data(rows, optional):
+    expected = wandb.Table(columns=["a", "b"], optional=optional)
+    for row in rows:
+        expected.add_data(*row)
+
+    table = wandb.Table(columns=["a", "b"], optional=optional)
+    table.add_rows(rows)
+    assert table._column_types == expected._column_types
+    # NaNs aren't equal to themselves
+    assert repr(table.data) == repr(expected.data)
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        [[1, "a"], [2, None]],
+        [[1, "a"], ["b", "c"]],
+        [[1.5, "a"], [float("nan"), "b"]],
+    ],
+)
+def test_add_rows_incompatible_types(rows):
+    expected = wandb.Table(columns=["a", "b"], optional=False)
+    with pytest.raises(TypeError) as expected_err:
+        for row in rows:
+            expected.add_data(*row)
+
+    table = wandb.Table(columns=["a", "b"], optional=False)
+    with pytest.raises(TypeError) as err:
+        table.add_rows(rows)
+    assert str(err.value) == str(expected_err.value)
+
+
+def test_add_rows_with_keys():
+    table_a = wandb.Table(columns=["b"], data=[["a"], ["b"]])
+    table = wandb.Table(columns=["fi", "c"])
+    table.add_rows([(ndx, "x") for ndx, _ in table_a.iterrows()])
+    assert all([row[0]._table == table_a for row in table.data])
+
+
+def test_from_arrays():
+    table = wandb.Table.from_arrays(
+        [np.arange(3), np.array([0.5, 1.5, 2.5]), ["a", "b", "c"]],
+        columns=["int", "float", "str"],
+    )
+    assert table.data == [[0, 0.5, "a"], [1, 1.5, "b"], [2, 2.5, "c"]]
+    assert type(table.data[0][0]) is int
+    assert table.get_column("float") == [0.5, 1.5, 2.5]
+    assert table == wandb.Table(
+        columns=["int", "float", "str"],
+        data=[[0, 0.5, "a"], [1, 1.5, "b"], [2, 2.5, "c"]],
+    )
+
+    with pytest.raises(ValueError):
+        wandb.Table.from_arrays([[1, 2], [1]], columns=["a", "b"])
+    with pytest.raises(ValueError):
+        wandb.Table.from_arrays([[1, 2]], columns=["a", "b"])
+
+
+def test_to_json_scalar_columns():
+    table = wandb.Table(
+        columns=["int", "float", "np", "mixed"],
+        data=[
+            [1, 0.5, np.float32(0.5), "a"],
+            [2, float("nan"), np.float32(1.5), datetime.date(2020, 1, 1)],
+        ],
+        allow_mixed_types=True,
+    )
+    json_dict = table.to_json(wandb.Artifact("table", "dataset"))
+    assert json_dict["data"] == [
+        [1, 0.5, 0.5, "a"],
+        [2, None, 1.5, 1577836800000],
+    ]
@@ -1,15 +1,31 @@
 import asyncio
+import base64
+import concurrent.futures
 import functools
+import hashlib
+import http.server
+import io
+import json
+import os
 import queue
+import threading
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Mapping, Optional
 from unittest.mock import Mock
 
 import pytest
+import requests
+from wandb.errors import CommError
 from wandb.filesync.step_prepare import ResponsePrepare, StepPrepare
+from wandb.sdk import wandb_artifacts
+from wandb.sdk.interface.artifacts import ArtifactManifest
+from wandb.sdk.internal.internal_api import Api as InternalApi
+from wandb.sdk.lib.hashutil import md5_string
 from wandb.sdk.wandb_artifacts import (
     Artifact,
     ArtifactManifestEntry,
+    ArtifactManifestV1,
     ArtifactsCache,
     WandbStoragePolicy,
 )
@@ -334,8 +350,382 @@ class TestStoreFile:
                 store()
             assert not is_cache_hit(artifacts_cache, "my-digest", f.stat().st_size)
 
+    def test_links_staged_file_into_cache(
+        self,
+        store_file: "StoreFileFixture",
+        api,
+        tmp_path: Path,
+        artifacts_cache: ArtifactsCache,
+        monkeypatch,
+    ):
+        staging_dir = tmp_path / "staging"
+        staging_dir.mkdir()
+        monkeypatch.setattr(
+            wandb_artifacts, "get_staging_dir", lambda: str(staging_dir)
+        )
+        f = some_file(staging_dir)
+        policy = WandbStoragePolicy(api=api, cache=artifacts_cache)
+
+        store_file(policy, entry_local_path=f)
+
+        path, hit, _ = artifacts_cache.check_md5_obj_path("my-digest", f.stat().st_size)
+        assert hit
+        assert os.path.samefile(path, f)
+
+
+@pytest.fixture
+def object_store():
+    """Local stand-in for an object store accepting the parts of multipart uploads."""
+    parts = {}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_PUT(self):  # noqa: N802
+            upload_id, part_number = self.path.strip("/").split("/")
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            md5 = hashlib.md5(body)
+            if (
+                upload_id in server.rejected_uploads
+                or int(part_number) in server.rejected_parts
+                or base64.b64encode(md5.digest()).decode()
+                != self.headers["Content-MD5"]
+            ):
+                self.send_response(403)
+                self.end_headers()
+                return
+            parts[(upload_id, int(part_number))] = body
+            self.send_response(200)
+            self.send_header("ETag", f'"{md5.hexdigest()}"')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.parts = parts
+    server.rejected_uploads = set()
+    server.rejected_parts = set()
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestStoreFileMultipart:
+    CONTENT = b"0123456789"
+
+    @pytest.fixture(autouse=True)
+    def small_parts(self, monkeypatch):
+        monkeypatch.setattr(wandb_artifacts, "_MULTIPART_MIN_SIZE", 8)
+        monkeypatch.setattr(wandb_artifacts, "_MULTIPART_PART_SIZE", 4)
+
+    @pytest.fixture
+    def api(self):
+        api = InternalApi()
+        api.complete_multipart_upload_artifact = Mock(return_value="my-digest")
+        return api
+
+    @staticmethod
+    def preparer(object_store, upload_id: str):
+        def prepare_sync(spec):
+            return singleton_queue(
+                dummy_response_prepare(spec)._replace(
+                    upload_id=upload_id,
+                    storage_path="my-storage-path",
+                    multipart_upload_urls={
+                        part["partNumber"]: f"{object_store.base_url}/{upload_id}/"
+                        f"{part['partNumber']}"
+                        for part in spec["uploadPartsInput"]
+                    },
+                )
+            )
+
+        return mock_preparer(prepare_sync=Mock(wraps=prepare_sync))
+
+    def store(self, policy, tmp_path, preparer, mode="sync"):
+        f = tmp_path / "some-file"
+        f.write_bytes(self.CONTENT)
+        kwargs = TestStoreFile._fixture_kwargs_to_kwargs(
+            entry_local_path=f, preparer=preparer
+        )
+        if mode == "sync":
+            return policy.store_file_sync(**kwargs)
+        return asyncio.new_event_loop().run_until_complete(
+            policy.store_file_async(**kwargs)
+        )
+
+    def completed_parts(self, upload_id):
+        return [
+            {
+                "partNumber": number,
+                "hexMD5": f'"{hashlib.md5(self.CONTENT[(number - 1) * 4 : number * 4]).hexdigest()}"',
+            }
+            for number in (1, 2, 3)
+        ]
+
+    @pytest.mark.parametrize("mode", ["sync", "async"])
+    def test_uploads_parts(
+        self, api, object_store, artifacts_cache, tmp_path: Path, mode
+    ):
+        preparer = self.preparer(object_store, "upload-1")
+        policy = WandbStoragePolicy(api=api, cache=artifacts_cache)
+
+        assert not self.store(policy, tmp_path, preparer, mode)
+
+        spec = preparer.prepare_sync.call_args[0][0]
+        assert [part["partNumber"] for part in spec["uploadPartsInput"]] == [1, 2, 3]
+        assert (
+            b"".join(object_store.parts[("upload-1", n)] for n in (1, 2, 3))
+            == self.CONTENT
+        )
+        api.complete_multipart_upload_artifact.assert_called_once_with(
+            "my-artifact-id",
+            "my-storage-path",
+            self.completed_parts("upload-1"),
+            "upload-1",
+        )
+        assert is_cache_hit(artifacts_cache, "my-digest", len(self.CONTENT))
+
+    def test_small_file_is_not_split(self, api, artifacts_cache, tmp_path: Path):
+        api.upload_file_retry = Mock()
+        preparer = mock_preparer()
+        policy = WandbStoragePolicy(api=api, cache=artifacts_cache)
+        f = some_file(tmp_path)
+        f.write_bytes(b"0123")
+
+        policy.store_file_sync(
+            **TestStoreFile._fixture_kwargs_to_kwargs(
+                entry_local_path=f, preparer=preparer
+            )
+        )
+
+        assert "uploadPartsInput" not in preparer.prepare_sync.call_args[0][0]
+        api.upload_file_retry.assert_called_once()
+
+    def test_resumes_interrupted_upload(
+        self, api, object_store, artifacts_cache, tmp_path: Path
+    ):
+        policy = WandbStoragePolicy(api=api, cache=artifacts_cache)
+        object_store.rejected_parts.add(2)
+        with pytest.raises(CommError):
+            self.store(policy, tmp_path, self.preparer(object_store, "upload-1"))
+        api.complete_multipart_upload_artifact.assert_not_called()
+        assert set(object_store.parts) == {("upload-1", 1), ("upload-1", 3)}
+
+        # a new process prepares a new upload, but only the missing part of
+        # the interrupted one is sent
+        object_store.rejected_parts.clear()
+        object_store.parts.clear()
+        self.store(policy, tmp_path, self.preparer(object_store, "upload-2"))
+
+        assert set(object_store.parts) == {("upload-1", 2)}
+        api.complete_multipart_upload_artifact.assert_called_once_with(
+            "my-artifact-id",
+            "my-storage-path",
+            self.completed_parts("upload-1"),
+            "upload-1",
+        )
+
+    def test_restarts_expired_upload(
+        self, api, object_store, artifacts_cache, tmp_path: Path
+    ):
+        policy = WandbStoragePolicy(api=api, cache=artifacts_cache)
+        object_store.rejected_parts.add(2)
+        with pytest.raises(CommError):
+            self.store(policy, tmp_path, self.preparer(object_store, "upload-1"))
+
+        object_store.rejected_parts.clear()
+        object_store.rejected_uploads.add("upload-1")
+        object_store.parts.clear()
+        self.store(policy, tmp_path, self.preparer(object_store, "upload-2"))
+
+        assert set(object_store.parts) == {("upload-2", n) for n in (1, 2, 3)}
+        api.complete_multipart_upload_artifact.assert_called_once_with(
+            "my-artifact-id",
+            "my-storage-path",
+            self.completed_parts("upload-2"),
+            "upload-2",
+        )
+
 
 @pytest.mark.parametrize("type", ["job", "wandb-history", "wandb-foo"])
 def test_invalid_artifact_type(type):
     with pytest.raises(ValueError, match="reserved for internal use"):
         Artifact("foo", type=type)
+
+
+@pytest.fixture
+def file_server():
+    """Local stand-in for the artifact file endpoint, honoring range requests."""
+    requests = []
+    active = []
+    lock = threading.Lock()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            with lock:
+                active.append(self)
+                server.max_active = max(server.max_active, len(active))
+            time.sleep(server.delay)
+            with lock:
+                active.remove(self)
+            range_header = self.headers.get("Range")
+            requests.append(range_header)
+            body = server.content
+            if range_header and server.ranges:
+                start, end = map(int, range_header[len("bytes=") :].split("-"))
+                if start in server.rejected_offsets:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = body[start : end + 1]
+                self.send_response(206)
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.requests = requests
+    server.content = bytes(range(256)) * 40
+    server.ranges = True
+    server.rejected_offsets = set()
+    server.delay = 0
+    server.max_active = 0
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestLoadFileRanged:
+    @pytest.fixture(autouse=True)
+    def small_parts(self, monkeypatch):
+        monkeypatch.setattr(wandb_artifacts, "_RANGED_DOWNLOAD_MIN_SIZE", 4096)
+        monkeypatch.setattr(wandb_artifacts, "_RANGED_DOWNLOAD_PART_SIZE", 1024)
+        monkeypatch.setattr(
+            wandb_artifacts,
+            "_download_budget",
+            wandb_artifacts._DownloadBudget(64, None),
+        )
+
+    @staticmethod
+    def load(file_server, artifacts_cache) -> bytes:
+        api = Mock(api_key="key")
+        api.settings.return_value = file_server.base_url
+        policy = WandbStoragePolicy(api=api, cache=artifacts_cache)
+        entry = ArtifactManifestEntry(
+            path="my-path",
+            digest=md5_string("my-content"),
+            size=len(file_server.content),
+        )
+        path = policy.load_file(Mock(entity="my-entity"), entry)
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_downloads_ranges(self, file_server, artifacts_cache):
+        assert self.load(file_server, artifacts_cache) == file_server.content
+        assert sorted(file_server.requests) == sorted(
+            f"bytes={start}-{start + 1023}" for start in range(0, 10240, 1024)
+        )
+
+    def test_server_without_ranges(self, file_server, artifacts_cache):
+        file_server.ranges = False
+        assert self.load(file_server, artifacts_cache) == file_server.content
+        assert len(file_server.requests) == 1
+
+    def test_resumes_interrupted_download(self, file_server, artifacts_cache):
+        file_server.rejected_offsets.add(4096)
+        with pytest.raises(requests.HTTPError):
+            self.load(file_server, artifacts_cache)
+
+        fetched = set(file_server.requests) - {"bytes=4096-5119"}
+        file_server.rejected_offsets.clear()
+        file_server.requests.clear()
+        assert self.load(file_server, artifacts_cache) == file_server.content
+        assert "bytes=4096-5119" in file_server.requests
+        assert not fetched & set(file_server.requests)
+
+    def test_download_is_indexed(self, file_server, artifacts_cache):
+        artifacts_cache.cleanup(0)
+        assert self.load(file_server, artifacts_cache) == file_server.content
+        assert artifacts_cache._index.total_size() == len(file_server.content)
+        assert artifacts_cache._index.temp_files() == []
+        assert artifacts_cache.cleanup(0) == len(file_server.content)
+
+    def test_cleanup_removes_interrupted_download(self, file_server, artifacts_cache):
+        artifacts_cache.cleanup(0)
+        file_server.rejected_offsets.add(4096)
+        with pytest.raises(requests.HTTPError):
+            self.load(file_server, artifacts_cache)
+
+        assert artifacts_cache.cleanup(0) >= len(file_server.content)
+        assert artifacts_cache._index.temp_files() == []
+        assert artifacts_cache._index.total_size() == 0
+
+    def test_shares_connection_budget(self, file_server, artifacts_cache):
+        wandb_artifacts._download_budget = wandb_artifacts._DownloadBudget(2, None)
+        file_server.delay = 0.05
+        assert self.load(file_server, artifacts_cache) == file_server.content
+        assert file_server.max_active == 2
+
+    def test_concurrent_loads_download_once(self, file_server, artifacts_cache):
+        file_server.delay = 0.01
+        # Separate caches on the same directory, like processes on one host.
+        caches = [ArtifactsCache(artifacts_cache._cache_dir) for _ in range(4)]
+        with concurrent.futures.ThreadPoolExecutor(len(caches)) as executor:
+            contents = list(
+                executor.map(lambda cache: self.load(file_server, cache), caches)
+            )
+        assert contents == [file_server.content] * len(caches)
+        assert len(file_server.requests) == 10
+
+
+class TestManifestJSON:
+    @pytest.fixture
+    def manifest(self) -> ArtifactManifestV1:
+        manifest = ArtifactManifestV1(WandbStoragePolicy(api=Mock()))
+        manifest.add_entry(
+            ArtifactManifestEntry(path="b/c.txt", digest="digest-1", size=3)
+        )
+        manifest.add_entry(
+            ArtifactManifestEntry(
+                path="aé.txt",
+                digest="digest-2",
+                ref="s3://bucket/key",
+                birth_artifact_id="artifact-id",
+                extra={"etag": "tag", "versionID": 2},
+            )
+        )
+        return manifest
+
+    def test_write_matches_json_dump(self, manifest: ArtifactManifestV1):
+        for m in [manifest, ArtifactManifestV1(WandbStoragePolicy(api=Mock()))]:
+            written = io.StringIO()
+            m.write_manifest_json(written)
+            assert written.getvalue() == json.dumps(m.to_manifest_json(), indent=4)
+
+    def test_load_stream(self, manifest: ArtifactManifestV1):
+        text = json.dumps(manifest.to_manifest_json(), indent=4)
+        chunks = [text[i : i + 7] for i in range(0, len(text), 7)]
+        loaded = ArtifactManifest.from_manifest_stream(chunks)
+        assert isinstance(loaded, ArtifactManifestV1)
+        assert loaded.to_manifest_json() == manifest.to_manifest_json()
+
+    def test_load_stream_contents_first(self, manifest: ArtifactManifestV1):
+        manifest_json = manifest.to_manifest_json()
+        contents = manifest_json.pop("contents")
+        text = json.dumps({"contents": contents, **manifest_json})
+        loaded = ArtifactManifest.from_manifest_stream([text])
+        assert loaded.to_manifest_json() == manifest.to_manifest_json()
+
+    def test_entries_have_no_dict(self, manifest: ArtifactManifestV1):
+        for entry in manifest.entries.values():
+            assert not hasattr(entry, "__dict__")
@@ -1174,3 +1174,15 @@ def test_is_instance_recursive_custom_types():
     assert is_instance_recursive(
         {"a": Custom(), "b": CustomSubclass()}, Mapping[str, Custom]
     )
+
+
+@pytest.mark.parametrize(
+    ["value", "ok"], [(None, True), ("gzip", True), ("zstd", True), ("lz4", False)]
+)
+def test_file_stream_compression(value: Optional[str], ok: bool, test_settings):
+    if ok:
+        settings = test_settings({"_file_stream_compression": value})
+        assert settings._file_stream_compression == value
+    else:
+        with pytest.raises(UsageError):
+            test_settings({"_file_stream_compression": value})
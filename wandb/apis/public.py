@@ -11,6 +11,7 @@ You might use the Public API to
 For more on using the Public API, check out [our guide](https://docs.wandb.com/guides/track/public-api-guide).
 """
 import ast
+import codecs
 import datetime
 import io
 import json
@@ -59,7 +60,7 @@ from wandb.sdk.launch.utils import (
 )
 from wandb.sdk.lib import filesystem, ipython, retry, runid
 from wandb.sdk.lib.gql_request import GraphQLSession
-from wandb.sdk.lib.hashutil import b64_to_hex_id, hex_to_b64_id, md5_file_b64
+from wandb.sdk.lib.hashutil import b64_to_hex_id, hex_to_b64_id
 from wandb.sdk.lib.paths import LogicalPath
 
 if TYPE_CHECKING:
@@ -71,6 +72,8 @@ logger = logging.getLogger(__name__)
 # Only retry requests for 20 seconds in the public api
 RETRY_TIMEDELTA = datetime.timedelta(seconds=20)
 WANDB_INTERNAL_KEYS = {"_wandb", "wandb_version"}
+# manifests are parsed as they download, in chunks of this many bytes
+_MANIFEST_CHUNK_SIZE = 1024 * 1024
 PROJECT_FRAGMENT = """fragment ProjectFragment on Project {
     id
     name
@@ -4111,6 +4114,8 @@ class ArtifactCollection:
 
 
 class _DownloadedArtifactEntry(artifacts.ArtifactManifestEntry):
+    __slots__ = ("_parent_artifact",)
+
     def __init__(
         self,
         entry: "artifacts.ArtifactManifestEntry",
@@ -4147,9 +4152,13 @@ class _DownloadedArtifactEntry(artifacts.ArtifactManifestEntry):
         manifest = self._parent_artifact._load_manifest()
 
         # Skip checking the cache (and possibly downloading) if the file already exists
-        # and has the digest we're expecting.
+        # and has the digest we're expecting. Files recorded when they were
+        # downloaded, and not changed since, are not hashed again.
         entry = manifest.entries[self.path]
-        if os.path.exists(dest_path) and entry.digest == md5_file_b64(dest_path):
+        checksums = artifacts.get_artifacts_cache().checksums
+        if os.path.exists(dest_path) and entry.digest == checksums.md5_file_b64(
+            dest_path
+        ):
             return dest_path
 
         if self.ref is not None:
@@ -4157,7 +4166,12 @@ class _DownloadedArtifactEntry(artifacts.ArtifactManifestEntry):
         else:
             cache_path = manifest.storage_policy.load_file(self._parent_artifact, entry)
 
-        return filesystem.copy_or_overwrite_changed(cache_path, dest_path)
+        dest_path = filesystem.copy_or_overwrite_changed(
+            cache_path, dest_path, mode=env.get_artifact_link_mode()
+        )
+        if self.ref is None:
+            checksums.put_written(dest_path, entry.digest)
+        return dest_path
 
     def ref_target(self):
         manifest = self._parent_artifact._load_manifest()
@@ -4336,10 +4350,10 @@ class Artifact(artifacts.Artifact):
             index_file_url = response["artifact"]["currentManifest"]["file"][
                 "directUrl"
             ]
-            with requests.get(index_file_url) as req:
+            with requests.get(index_file_url, stream=True) as req:
                 req.raise_for_status()
-                artifact._manifest = artifacts.ArtifactManifest.from_manifest_json(
-                    json.loads(util.ensure_text(req.content))
+                artifact._manifest = artifacts.ArtifactManifest.from_manifest_stream(
+                    codecs.iterdecode(req.iter_content(_MANIFEST_CHUNK_SIZE), "utf-8")
                 )
 
             artifact._load_dependent_manifests()
@@ -4758,6 +4772,7 @@ class Artifact(artifacts.Artifact):
             pool.map(lambda artifact: artifact.download(), self._dependent_artifacts)
         pool.close()
         pool.join()
+        artifacts.get_artifacts_cache().checksums.flush()
 
         self._is_downloaded = True
 
@@ -4806,12 +4821,15 @@ class Artifact(artifacts.Artifact):
                         )
                     )
 
+        checksums = artifacts.get_artifacts_cache().checksums
         for entry in manifest.entries.values():
             if entry.ref is None:
-                if md5_file_b64(os.path.join(dirpath, entry.path)) != entry.digest:
+                md5 = checksums.md5_file_b64(os.path.join(dirpath, entry.path))
+                if md5 != entry.digest:
                     raise ValueError("Digest mismatch for file: %s" % entry.path)
             else:
                 ref_count += 1
+        checksums.flush()
         if ref_count > 0:
             print("Warning: skipped verification of %s refs" % ref_count)
 
@@ -4835,7 +4853,9 @@ class Artifact(artifacts.Artifact):
                 '.get_path("filename").download()'
             )
 
-        return self._download_file(list(manifest.entries)[0], root=root)
+        path = self._download_file(list(manifest.entries)[0], root=root)
+        artifacts.get_artifacts_cache().checksums.flush()
+        return path
 
     def _download_file(
         self, name, root, download_logger: Optional[_ArtifactDownloadLogger] = None
@@ -5126,10 +5146,10 @@ class Artifact(artifacts.Artifact):
             index_file_url = response["project"]["artifact"]["currentManifest"]["file"][
                 "directUrl"
             ]
-            with requests.get(index_file_url) as req:
+            with requests.get(index_file_url, stream=True) as req:
                 req.raise_for_status()
-                self._manifest = artifacts.ArtifactManifest.from_manifest_json(
-                    json.loads(util.ensure_text(req.content))
+                self._manifest = artifacts.ArtifactManifest.from_manifest_stream(
+                    codecs.iterdecode(req.iter_content(_MANIFEST_CHUNK_SIZE), "utf-8")
                 )
 
             self._load_dependent_manifests()
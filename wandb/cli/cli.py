@@ -487,6 +487,12 @@ def init(ctx, project, entity, reset, mode):
 @click.option("--ignore", hidden=True)
 @click.option("--show", default=5, help="Number of runs to show")
 @click.option("--append", is_flag=True, default=False, help="Append run")
+@click.option(
+    "--parallel",
+    default=1,
+    type=int,
+    help="Number of runs to sync concurrently.",
+)
 @display_error
 def sync(
     ctx,
@@ -510,6 +516,7 @@ def sync(
     clean_old_hours=24,
     clean_force=None,
     append=None,
+    parallel=None,
 ):
     # TODO: rather unfortunate, needed to avoid creating a `wandb` directory
     os.environ["WANDB_DIR"] = TMPDIR.name
@@ -579,6 +586,7 @@ def sync(
             sync_tensorboard=_sync_tensorboard,
             log_path=_wandb_log_path,
             append=append,
+            parallel=parallel,
         )
         for p in _path:
             sm.add(p)
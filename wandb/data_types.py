@@ -18,8 +18,10 @@ import binascii
 import codecs
 import datetime
 import hashlib
+import itertools
 import json
 import logging
+import operator
 import os
 import pprint
 import tempfile
@@ -150,6 +152,65 @@ def _json_helper(val, artifact):
         return util.json_friendly(val)[0]
 
 
+# Table cells of these classes are written to JSON as they are
+_JSON_SCALAR_CLASSES = frozenset([int, float, str, bool, type(None)])
+
+
+def _is_json_scalar_column(values):
+    classes = set(map(type, values))
+    if not classes <= _JSON_SCALAR_CLASSES:
+        return False
+    # json_friendly writes NaN as null
+    return float not in classes or not any(
+        v != v for v in values if v.__class__ is float
+    )
+
+
+def _assigns_by_class(wbtype):
+    if isinstance(wbtype, _dtypes.UnionType):
+        return all(_assigns_by_class(t) for t in wbtype.params["allowed_types"])
+    return type(wbtype).assign is _dtypes.Type.assign
+
+
+def _assign_column(wbtype, values):
+    """Assign all values of a column to its type, like assigning them one by one.
+
+    The type of most values only depends on their class. For those it's enough
+    to assign one value of each class, in the order the classes first appear.
+    """
+    samples = []
+    if _assigns_by_class(wbtype):
+        types_by_class = _dtypes.TypeRegistry.types_by_class()
+        for cls in dict.fromkeys(map(type, values)):
+            handler = types_by_class.get(cls)
+            if (
+                handler is None
+                or handler.from_obj.__func__ is not _dtypes.Type.from_obj.__func__
+                or (cls is str and any(map(util._is_artifact_string, values)))
+            ):
+                samples = values
+                break
+            if cls is float:
+                # NaNs are typed as None
+                number = next(
+                    (v for v in values if v.__class__ is float and v == v), None
+                )
+                if number is not None:
+                    samples.append(number)
+                if any(v != v for v in values if v.__class__ is float):
+                    samples.append(None)
+            else:
+                samples.append(next(v for v in values if v.__class__ is cls))
+    else:
+        samples = values
+
+    for value in samples:
+        wbtype = wbtype.assign(value)
+        if isinstance(wbtype, _dtypes.InvalidType):
+            break
+    return wbtype
+
+
 class Table(Media):
     """The Table class used to display and analyze tabular data.
 
@@ -199,6 +260,9 @@ class Table(Media):
     assert tbl.get_column("feature_01") == [5, 7, 3]
     ```
 
+    Large tables are built much faster with `add_rows` or `Table.from_arrays`,
+    which check the column types once per batch of rows instead of once per row.
+
     Tables can be logged directly to runs using `run.log({"my_table": table})`
     or added to artifacts using `artifact.add(table, "my_table")`:
     <!--yeadoc-test:table-logging-direct-->
@@ -309,8 +373,7 @@ class Table(Media):
         self._assert_valid_columns(columns)
         self.columns = columns
         self._make_column_types(dtype, optional)
-        for row in data:
-            self.add_data(*row)
+        self.add_rows(data)
 
     def _init_from_ndarray(self, ndarray, columns, optional=True, dtype=None):
         assert util.is_numpy_array(
@@ -320,8 +383,7 @@ class Table(Media):
         self._assert_valid_columns(columns)
         self.columns = columns
         self._make_column_types(dtype, optional)
-        for row in ndarray:
-            self.add_data(*row)
+        self.add_rows(ndarray)
 
     def _init_from_dataframe(self, dataframe, columns, optional=True, dtype=None):
         assert util.is_pandas_data_frame(
@@ -332,8 +394,47 @@ class Table(Media):
         self._assert_valid_columns(columns)
         self.columns = columns
         self._make_column_types(dtype, optional)
-        for row in range(len(dataframe)):
-            self.add_data(*tuple(dataframe[col].values[row] for col in self.columns))
+        self.add_rows(zip(*(dataframe[col].values for col in self.columns)))
+
+    @classmethod
+    def from_arrays(
+        cls, arrays, columns, dtype=None, optional=True, allow_mixed_types=False
+    ):
+        """Construct a Table from one array of values per column.
+
+        Numeric numpy arrays are stored as python numbers, which are serialized
+        without any conversion.
+
+        Arguments:
+            arrays: (List[list | np.array]) the columns' values, all of the same length
+            columns: (List[str]) names of the columns
+            dtype, optional, allow_mixed_types: as for `wandb.Table`
+        """
+        if len(arrays) != len(columns):
+            raise ValueError(
+                f"Found {len(arrays)} arrays for {len(columns)} columns: {columns}"
+            )
+        lengths = {len(array) for array in arrays}
+        if len(lengths) > 1:
+            raise ValueError(f"Arrays must have the same length, found {lengths}")
+
+        values = []
+        for array in arrays:
+            if (
+                util.is_numpy_array(array)
+                and array.ndim == 1
+                and array.dtype.kind in "biuf"
+            ):
+                array = array.tolist()
+            values.append(array)
+        table = cls(
+            columns=list(columns),
+            dtype=dtype,
+            optional=optional,
+            allow_mixed_types=allow_mixed_types,
+        )
+        table.add_rows(zip(*values))
+        return table
 
     def _make_column_types(self, dtype=None, optional=True):
         if dtype is None:
@@ -490,7 +591,54 @@ class Table(Media):
         # Update the wrapper values if needed
         self._update_keys(force_last=True)
 
-    def _get_updated_result_type(self, row):
+    def add_rows(self, rows):
+        """Add many rows of data to the table.
+
+        Same as calling `add_data` for each row, but the column types are updated
+        once for all the rows.
+
+        Arguments:
+            rows: (Iterable[Sequence]) rows, each as long as the columns
+        """
+        rows = [list(row) for row in rows]
+        for row in rows:
+            if len(row) != len(self.columns):
+                raise ValueError(
+                    f"This table expects {len(self.columns)} columns: {self.columns}, found {len(row)}"
+                )
+        if not rows:
+            return
+
+        columns = list(zip(*rows))
+        # keys are wrapped row by row
+        if (
+            self._pk_col is not None
+            or self._fk_cols
+            or any(
+                issubclass(cls, _TableLinkMixin)
+                for values in columns
+                for cls in set(map(type, values))
+            )
+        ):
+            for row in rows:
+                self.add_data(*row)
+            return
+
+        type_map = dict(self._column_types.params["type_map"])
+        for col_name, values in zip(self.columns, columns):
+            type_map[col_name] = _assign_column(type_map[col_name], values)
+            if isinstance(type_map[col_name], _dtypes.InvalidType):
+                # assign row by row, which raises with the offending row
+                result_type = self._column_types
+                for row in rows:
+                    result_type = self._get_updated_result_type(row, result_type)
+                self._column_types = result_type
+                break
+        else:
+            self._column_types = _dtypes.TypedDictType(type_map)
+        self.data.extend(rows)
+
+    def _get_updated_result_type(self, row, current_type=None):
         """Return an updated result type based on incoming row.
 
         Raises:
@@ -499,7 +647,8 @@ class Table(Media):
         incoming_row_dict = {
             col_key: row[ndx] for ndx, col_key in enumerate(self.columns)
         }
-        current_type = self._column_types
+        if current_type is None:
+            current_type = self._column_types
         result_type = current_type.assign(incoming_row_dict)
         if isinstance(result_type, _dtypes.InvalidType):
             raise TypeError(
@@ -682,13 +831,21 @@ class Table(Media):
                     ndarray_type._set_serialization_path(entry.path, str(col_name))
                     ndarray_col_ndxs.add(col_ndx)
 
+            # columns of plain numbers and strings are copied as they are
+            convert_col_ndxs = [
+                ndx
+                for ndx in range(len(self.columns))
+                if ndx not in ndarray_col_ndxs
+                and not _is_json_scalar_column(
+                    list(map(operator.itemgetter(ndx), data))
+                )
+            ]
             for row in data:
-                mapped_row = []
-                for ndx, v in enumerate(row):
-                    if ndx in ndarray_col_ndxs:
-                        mapped_row.append(None)
-                    else:
-                        mapped_row.append(_json_helper(v, artifact))
+                mapped_row = list(row)
+                for ndx in convert_col_ndxs:
+                    mapped_row[ndx] = _json_helper(row[ndx], artifact)
+                for ndx in ndarray_col_ndxs:
+                    mapped_row[ndx] = None
                 mapped_data.append(mapped_row)
 
             json_dict.update(
@@ -884,15 +1041,14 @@ class Table(Media):
             np = util.get_module(
                 "numpy", required="Converting to numpy requires installing numpy"
             )
-        col = []
-        col_ndx = self.columns.index(name)
-        for row in self.data:
-            item = row[col_ndx]
-            if convert_to is not None and isinstance(item, WBValue):
-                item = item.to_data_array()
-            col.append(item)
+        col = list(map(operator.itemgetter(self.columns.index(name)), self.data))
         if convert_to == "numpy":
-            col = np.array(col)
+            col = np.array(
+                [
+                    item.to_data_array() if isinstance(item, WBValue) else item
+                    for item in col
+                ]
+            )
         return col
 
     def get_index(self):
@@ -965,6 +1121,7 @@ class PartitionedTable(Media):
     """A table which is composed of multiple sub-tables.
 
     Currently, PartitionedTable is designed to point to a directory within an artifact.
+    Use `PartitionedTableWriter` to write a large table into an artifact as one.
     """
 
     _log_type = "partitioned-table"
@@ -1047,6 +1204,114 @@ class PartitionedTable(Media):
         raise ValueError("PartitionedTables cannot be bound to runs")
 
 
+class PartitionedTableWriter:
+    """Write a large table into an artifact as a PartitionedTable, part by part.
+
+    Rows are collected into a Table of at most `rows_per_part` rows, which is added
+    to the artifact as soon as it's full. Memory use doesn't grow with the number of
+    rows, and unlike a single Table no rows are dropped past
+    `Table.MAX_ARTIFACT_ROWS`.
+
+    ```python
+    artifact = wandb.Artifact("predictions", type="dataset")
+    with PartitionedTableWriter(artifact, "preds", columns=["id", "score"]) as writer:
+        for batch in batches:
+            writer.add_rows(batch)
+    ```
+
+    Arguments:
+        artifact: (wandb.Artifact) the artifact to add the table to
+        name: (str) name of the table in the artifact, the parts are stored in the
+            directory of that name
+        columns, dtype, optional, allow_mixed_types: as for `wandb.Table`, the column
+            types are shared by all parts
+        rows_per_part: (int) number of rows in each part
+    """
+
+    ROWS_PER_PART = 50000
+
+    def __init__(
+        self,
+        artifact,
+        name,
+        columns,
+        dtype=None,
+        optional=True,
+        allow_mixed_types=False,
+        rows_per_part=None,
+    ):
+        self._artifact = artifact
+        self._name = name
+        self._columns = list(columns)
+        self._dtype = dtype
+        self._optional = optional
+        self._allow_mixed_types = allow_mixed_types
+        self._rows_per_part = rows_per_part or self.ROWS_PER_PART
+        assert 0 < self._rows_per_part <= Table.MAX_ARTIFACT_ROWS
+        self._part = None
+        self._num_parts = 0
+        self._table = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.finish()
+
+    def add_data(self, *data):
+        """Add a row of data to the table."""
+        self.add_rows([data])
+
+    def add_rows(self, rows):
+        """Add many rows of data to the table, see `Table.add_rows`."""
+        assert self._table is None, "Cannot add rows to a finished table"
+        rows = iter(rows)
+        while True:
+            if self._part is None:
+                self._part = Table(
+                    columns=list(self._columns),
+                    dtype=self._dtype,
+                    optional=self._optional,
+                    allow_mixed_types=self._allow_mixed_types,
+                )
+            batch = list(
+                itertools.islice(rows, self._rows_per_part - len(self._part.data))
+            )
+            if not batch:
+                return
+            self._part.add_rows(batch)
+            if len(self._part.data) >= self._rows_per_part:
+                self._write_part()
+
+    def _write_part(self):
+        part = self._part
+        # later parts start out with the column types seen so far, the types
+        # already contain the optionality. Read them before serializing, which
+        # rewrites the types of ndarray columns.
+        type_map = part._column_types.params["type_map"]
+        self._dtype = [type_map[col] for col in self._columns]
+        self._optional = False
+        self._artifact.add(part, f"{self._name}/part_{self._num_parts:05d}")
+        self._num_parts += 1
+        # the artifact holds on to the objects added to it
+        part.data = []
+        self._part = None
+
+    def finish(self):
+        """Add the last part and the PartitionedTable to the artifact.
+
+        Returns:
+            PartitionedTable: the table added to the artifact.
+        """
+        if self._table is None:
+            if self._part is not None and self._part.data:
+                self._write_part()
+            self._table = PartitionedTable(self._name)
+            self._artifact.add(self._table, self._name)
+        return self._table
+
+
 class Audio(BatchableMedia):
     """Wandb class for audio clips.
 
@@ -1084,12 +1349,21 @@ class Audio(BatchableMedia):
                 "soundfile",
                 required='Raw audio requires the soundfile package. To get it, run "pip install soundfile"',
             )
+            np = util.get_module(
+                "numpy",
+                required='Raw audio requires numpy. To get it, run "pip install numpy"',
+            )
 
+            # copied, the caller may reuse its buffer while the clip is encoded
+            data = np.array(data_or_path)
             tmp_path = os.path.join(MEDIA_TMP.name, runid.generate_id() + ".wav")
-            soundfile.write(tmp_path, data_or_path, sample_rate)
-            self._duration = len(data_or_path) / float(sample_rate)
+            self._duration = len(data) / float(sample_rate)
 
-            self._set_file(tmp_path, is_tmp=True)
+            self._set_file_async(
+                lambda: soundfile.write(tmp_path, data, sample_rate),
+                tmp_path,
+                is_tmp=True,
+            )
 
     @classmethod
     def get_media_subdir(cls):
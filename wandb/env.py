@@ -73,6 +73,11 @@ CONFIG_DIR = "WANDB_CONFIG_DIR"
 DATA_DIR = "WANDB_DATA_DIR"
 ARTIFACT_DIR = "WANDB_ARTIFACT_DIR"
 CACHE_DIR = "WANDB_CACHE_DIR"
+ARTIFACT_DOWNLOAD_CONNECTIONS = "WANDB_ARTIFACT_DOWNLOAD_CONNECTIONS"
+ARTIFACT_DOWNLOAD_BANDWIDTH = "WANDB_ARTIFACT_DOWNLOAD_BANDWIDTH"
+ARTIFACT_LINK_MODE = "WANDB_ARTIFACT_LINK_MODE"
+ARTIFACT_CACHE_MAX_SIZE = "WANDB_ARTIFACT_CACHE_MAX_SIZE"
+MEDIA_ENCODE_THREADS = "WANDB_MEDIA_ENCODE_THREADS"
 DISABLE_SSL = "WANDB_INSECURE_DISABLE_SSL"
 SERVICE = "WANDB_SERVICE"
 _DISABLE_SERVICE = "WANDB_DISABLE_SERVICE"
@@ -380,6 +385,65 @@ def get_use_v1_artifacts(env: Optional[Env] = None) -> bool:
     return val
 
 
+def get_artifact_download_connections(
+    default: Optional[int] = None, env: Optional[Env] = None
+) -> Optional[int]:
+    """Number of requests all artifact file downloads may make at the same time."""
+    if env is None:
+        env = os.environ
+    val = env.get(ARTIFACT_DOWNLOAD_CONNECTIONS, default)
+    try:
+        val = int(val)  # type: ignore
+    except (TypeError, ValueError):
+        val = default
+    return val
+
+
+def get_artifact_download_bandwidth(
+    default: Optional[int] = None, env: Optional[Env] = None
+) -> Optional[int]:
+    """Bytes per second shared by all artifact file downloads, unlimited if unset."""
+    if env is None:
+        env = os.environ
+    val = env.get(ARTIFACT_DOWNLOAD_BANDWIDTH, default)
+    try:
+        val = int(val)  # type: ignore
+    except (TypeError, ValueError):
+        val = default
+    return val
+
+
+def get_artifact_link_mode(env: Optional[Env] = None) -> str:
+    """How downloaded artifact files are materialized from the artifacts cache.
+
+    One of "copy" (the default), "reflink", "hardlink" or "symlink".
+    """
+    if env is None:
+        env = os.environ
+    return env.get(ARTIFACT_LINK_MODE) or "copy"
+
+
+def get_artifact_cache_max_size(env: Optional[Env] = None) -> Optional[str]:
+    """Size, like "100GB", above which the artifacts cache evicts old objects."""
+    if env is None:
+        env = os.environ
+    return env.get(ARTIFACT_CACHE_MAX_SIZE)
+
+
+def get_media_encode_threads(
+    default: Optional[int] = None, env: Optional[Env] = None
+) -> Optional[int]:
+    """Number of threads encoding media files, 0 encodes on the logging thread."""
+    if env is None:
+        env = os.environ
+    val = env.get(MEDIA_ENCODE_THREADS, default)
+    try:
+        val = int(val)  # type: ignore
+    except (TypeError, ValueError):
+        val = default
+    return val
+
+
 def get_agent_max_initial_failures(
     default: Optional[int] = None, env: Optional[Env] = None
 ) -> Optional[int]:
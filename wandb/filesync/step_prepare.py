@@ -1,13 +1,16 @@
 """Batching file prepare requests to our API."""
 
 import asyncio
+import concurrent.futures
 import functools
+import logging
 import queue
 import threading
 import time
 from typing import (
     TYPE_CHECKING,
     Callable,
+    Iterator,
     List,
     Mapping,
     NamedTuple,
@@ -25,13 +28,25 @@ if TYPE_CHECKING:
     )
 
 
+logger = logging.getLogger(__name__)
+
+# Batch sizes are tuned so a prepare call takes about this many seconds.
+_TARGET_BATCH_LATENCY = 2.0
+_MIN_BATCH_SIZE = 10
+# Weight of the latest observation in the fit of the latency.
+_LATENCY_SMOOTHING = 0.3
+
+
 # Request for a file to be prepared.
 class RequestPrepare(NamedTuple):
     file_spec: "CreateArtifactFileSpecInput"
+    # The queue receives the exception instead of a response if the call fails.
     response_channel: Union[
-        "queue.Queue[ResponsePrepare]",
+        "queue.Queue[Union[ResponsePrepare, Exception]]",
         Tuple["asyncio.AbstractEventLoop", "asyncio.Future[ResponsePrepare]"],
     ]
+    # time.monotonic() when the request was queued
+    enqueue_time: Optional[float] = None
 
 
 class RequestFinish(NamedTuple):
@@ -42,6 +57,20 @@ class ResponsePrepare(NamedTuple):
     upload_url: Optional[str]
     upload_headers: Sequence[str]
     birth_artifact_id: str
+    # Set when the file is uploaded in parts, see WandbStoragePolicy.
+    upload_id: Optional[str] = None
+    storage_path: Optional[str] = None
+    multipart_upload_urls: Optional[Mapping[int, str]] = None
+
+
+class PrepareStats(NamedTuple):
+    batches: int
+    files: int
+    # seconds requests spent queued before their batch was sent
+    queue_wait_total: float
+    queue_wait_max: float
+    # seconds spent in prepare calls, summed over concurrent calls
+    api_time_total: float
 
 
 Request = Union[RequestPrepare, RequestFinish]
@@ -88,11 +117,76 @@ def gather_batch(
     return False, batch
 
 
+class _BatchSizer:
+    """Picks batch sizes from the observed latency of prepare calls.
+
+    The latency of a call is fitted as a fixed cost plus a cost per file, by
+    least squares over the calls so far weighted toward the latest ones. Batches
+    are sized so that a call takes about target_latency, or twice the fixed cost
+    if that is longer: smaller batches would spend most of each call on the
+    fixed cost. Until the first call completes the largest batches are used.
+    """
+
+    def __init__(self, max_batch_size: int, target_latency: float) -> None:
+        self._max_batch_size = max_batch_size
+        self._target_latency = target_latency
+        # weighted sums of 1, n, latency, n * n and n * latency of the calls
+        self._sums: Tuple[float, ...] = (0.0, 0.0, 0.0, 0.0, 0.0)
+        # fixed cost from the last fit that could tell the costs apart
+        self._fixed = 0.0
+        self._lock = threading.Lock()
+
+    def _fit(self) -> Optional[Tuple[float, float]]:
+        """Return the fixed cost and the cost per file of a call."""
+        with self._lock:
+            weight, n, latency, n_squared, n_latency = self._sums
+            if not weight:
+                return None
+            mean_n = n / weight
+            mean_latency = latency / weight
+            var_n = n_squared / weight - mean_n**2
+            if var_n >= 1:
+                per_file = (n_latency / weight - mean_n * mean_latency) / var_n
+                fixed = mean_latency - per_file * mean_n
+                if fixed >= 0:
+                    self._fixed = fixed
+                    return fixed, per_file
+            # The batches had about the same size, so the latency can't be split
+            # between the costs. Keep the last known fixed cost, or count it all
+            # per file at first, which makes the next batches smaller and tells
+            # them apart.
+            fixed = min(self._fixed, mean_latency)
+        return fixed, (mean_latency - fixed) / mean_n
+
+    def batch_size(self) -> int:
+        fit = self._fit()
+        if fit is None or fit[1] <= 0:
+            return self._max_batch_size
+        fixed, per_file = fit
+        latency = max(self._target_latency, 2 * fixed)
+        size = int((latency - fixed) / per_file)
+        return int(
+            _clamp(
+                size, min(_MIN_BATCH_SIZE, self._max_batch_size), self._max_batch_size
+            )
+        )
+
+    def observe(self, batch_size: int, latency: float) -> None:
+        decay = 1 - _LATENCY_SMOOTHING
+        observed = (1, batch_size, latency, batch_size**2, batch_size * latency)
+        with self._lock:
+            self._sums = tuple(
+                total * decay + value for total, value in zip(self._sums, observed)
+            )
+
+
 class StepPrepare:
     """A thread that batches requests to our file prepare API.
 
     Any number of threads may call prepare_async() in parallel. The PrepareBatcher thread
-    will batch requests up and send them all to the backend at once.
+    will batch requests up and send them to the backend, with up to
+    max_concurrent_batches calls in flight. Batches are sized from the observed
+    latency of the calls, up to max_batch_size files.
     """
 
     def __init__(
@@ -102,43 +196,119 @@ class StepPrepare:
         inter_event_time: float,
         max_batch_size: int,
         request_queue: Optional["queue.Queue[Request]"] = None,
+        max_concurrent_batches: int = 4,
     ) -> None:
         self._api = api
         self._inter_event_time = inter_event_time
         self._batch_time = batch_time
         self._max_batch_size = max_batch_size
+        self._batch_sizer = _BatchSizer(max_batch_size, _TARGET_BATCH_LATENCY)
+        self._max_concurrent_batches = max_concurrent_batches
         self._request_queue: "queue.Queue[Request]" = request_queue or queue.Queue()
+        self._stats = PrepareStats(0, 0, 0.0, 0.0, 0.0)
+        self._stats_lock = threading.Lock()
         self._thread = threading.Thread(target=self._thread_body)
         self._thread.daemon = True
 
     def _thread_body(self) -> None:
-        while True:
-            finish, batch = gather_batch(
-                request_queue=self._request_queue,
-                batch_time=self._batch_time,
-                inter_event_time=self._inter_event_time,
-                max_batch_size=self._max_batch_size,
+        # Bounds the batches in flight, we keep gathering requests meanwhile.
+        slots = threading.BoundedSemaphore(self._max_concurrent_batches)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_concurrent_batches,
+            thread_name_prefix="StepPrepare",
+        ) as executor:
+            while True:
+                batch_size = self._batch_sizer.batch_size()
+                finish, batch = gather_batch(
+                    request_queue=self._request_queue,
+                    batch_time=self._batch_time,
+                    inter_event_time=self._inter_event_time,
+                    max_batch_size=batch_size,
+                )
+                if batch:
+                    slots.acquire()
+                    future = executor.submit(self._send_batch, batch)
+                    future.add_done_callback(functools.partial(self._batch_done, slots))
+                if finish:
+                    break
+        logger.debug("Prepared artifact files: %s", self.stats())
+
+    @staticmethod
+    def _batch_done(
+        slots: threading.BoundedSemaphore, future: "concurrent.futures.Future[None]"
+    ) -> None:
+        slots.release()
+        exc = future.exception()
+        if exc is not None:
+            logger.error("Failed to prepare artifact files", exc_info=exc)
+
+    def _send_batch(self, batch: Sequence[RequestPrepare]) -> None:
+        responded = 0
+        try:
+            for response in self._prepare_responses(batch):
+                self._respond(batch[responded], response)
+                responded += 1
+        except Exception as e:
+            # fail the requests that are waiting on this batch
+            for prepare_request in batch[responded:]:
+                self._respond(prepare_request, e)
+            raise
+
+    @staticmethod
+    def _respond(
+        prepare_request: RequestPrepare, response: Union[ResponsePrepare, Exception]
+    ) -> None:
+        if isinstance(prepare_request.response_channel, queue.Queue):
+            prepare_request.response_channel.put(response)
+            return
+        loop, future = prepare_request.response_channel
+        if isinstance(response, Exception):
+            loop.call_soon_threadsafe(future.set_exception, response)
+        else:
+            loop.call_soon_threadsafe(future.set_result, response)
+
+    def _prepare_responses(
+        self, batch: Sequence[RequestPrepare]
+    ) -> Iterator[ResponsePrepare]:
+        """Prepare a batch, yields the response to each request in order."""
+        start_time = time.monotonic()
+        queue_waits = [
+            start_time - req.enqueue_time
+            for req in batch
+            if req.enqueue_time is not None
+        ]
+        prepare_response = self._prepare_batch(batch)
+        latency = time.monotonic() - start_time
+        self._batch_sizer.observe(len(batch), latency)
+        with self._stats_lock:
+            stats = self._stats
+            self._stats = stats._replace(
+                batches=stats.batches + 1,
+                files=stats.files + len(batch),
+                queue_wait_total=stats.queue_wait_total + sum(queue_waits),
+                queue_wait_max=max([stats.queue_wait_max, *queue_waits]),
+                api_time_total=stats.api_time_total + latency,
             )
-            if batch:
-                prepare_response = self._prepare_batch(batch)
-                # send responses
-                for prepare_request in batch:
-                    name = prepare_request.file_spec["name"]
-                    response_file = prepare_response[name]
-                    upload_url = response_file["uploadUrl"]
-                    upload_headers = response_file["uploadHeaders"]
-                    birth_artifact_id = response_file["artifact"]["id"]
-
-                    response = ResponsePrepare(
-                        upload_url, upload_headers, birth_artifact_id
-                    )
-                    if isinstance(prepare_request.response_channel, queue.Queue):
-                        prepare_request.response_channel.put(response)
-                    else:
-                        loop, future = prepare_request.response_channel
-                        loop.call_soon_threadsafe(future.set_result, response)
-            if finish:
-                break
+
+        for prepare_request in batch:
+            name = prepare_request.file_spec["name"]
+            response_file = prepare_response[name]
+            upload_url = response_file["uploadUrl"]
+            upload_headers = response_file["uploadHeaders"]
+            birth_artifact_id = response_file["artifact"]["id"]
+            multipart = response_file.get("uploadMultipartUrls")
+
+            response = ResponsePrepare(upload_url, upload_headers, birth_artifact_id)
+            if multipart:
+                response = response._replace(
+                    upload_id=multipart["uploadID"],
+                    storage_path=response_file.get("storagePath"),
+                    multipart_upload_urls={
+                        part["partNumber"]: part["uploadUrl"]
+                        for part in multipart["uploadUrlParts"]
+                    },
+                )
+            yield response
 
     def _prepare_batch(
         self, batch: Sequence[RequestPrepare]
@@ -154,22 +324,31 @@ class StepPrepare:
         """
         return self._api.create_artifact_files([req.file_spec for req in batch])
 
+    def stats(self) -> PrepareStats:
+        """Counters of the prepared files and the time spent preparing them."""
+        with self._stats_lock:
+            return self._stats
+
     def prepare_async(
         self, file_spec: "CreateArtifactFileSpecInput"
     ) -> "asyncio.Future[ResponsePrepare]":
         """Request the backend to prepare a file for upload."""
         response: "asyncio.Future[ResponsePrepare]" = asyncio.Future()
         self._request_queue.put(
-            RequestPrepare(file_spec, (asyncio.get_event_loop(), response))
+            RequestPrepare(
+                file_spec, (asyncio.get_event_loop(), response), time.monotonic()
+            )
         )
         return response
 
     @functools.wraps(prepare_async)
     def prepare_sync(
         self, file_spec: "CreateArtifactFileSpecInput"
-    ) -> "queue.Queue[ResponsePrepare]":
-        response_queue: "queue.Queue[ResponsePrepare]" = queue.Queue()
-        self._request_queue.put(RequestPrepare(file_spec, response_queue))
+    ) -> "queue.Queue[Union[ResponsePrepare, Exception]]":
+        response_queue: "queue.Queue[Union[ResponsePrepare, Exception]]" = queue.Queue()
+        self._request_queue.put(
+            RequestPrepare(file_spec, response_queue, time.monotonic())
+        )
         return response_queue
 
     def start(self) -> None:
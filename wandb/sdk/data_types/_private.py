@@ -1,3 +1,69 @@
+import concurrent.futures
+import os
 import tempfile
+import threading
+from typing import Callable, Optional, TypeVar
+
+from wandb import env
 
 MEDIA_TMP = tempfile.TemporaryDirectory("wandb-media")
+
+# Media files are encoded by a small thread pool: the encoders (zlib, imageio,
+# ffmpeg) release the GIL, so several files are written in parallel while the
+# caller goes on building the next media objects.
+_DEFAULT_ENCODE_THREADS = min(4, os.cpu_count() or 1)
+# pending encodings per thread before submit_encode blocks the caller
+_ENCODE_QUEUE_FACTOR = 4
+
+_T = TypeVar("_T")
+
+_encoder_lock = threading.Lock()
+_encoder: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_encoder_slots: Optional[threading.BoundedSemaphore] = None
+
+
+def _reset_encoder() -> None:
+    # the worker threads don't survive a fork
+    global _encoder, _encoder_lock, _encoder_slots
+    _encoder_lock = threading.Lock()
+    _encoder = None
+    _encoder_slots = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_encoder)
+
+
+def submit_encode(fn: Callable[[], _T]) -> "concurrent.futures.Future[_T]":
+    """Run fn, which writes a media file, on the media encoding pool.
+
+    Only a few encodings per thread are queued, past that the caller blocks until
+    one of them is done, which bounds the memory held by the pending media.
+    With WANDB_MEDIA_ENCODE_THREADS=0 fn runs right away on the calling thread.
+    """
+    global _encoder, _encoder_slots
+    with _encoder_lock:
+        if _encoder is None:
+            threads = env.get_media_encode_threads(default=_DEFAULT_ENCODE_THREADS)
+            if threads is not None and threads > 0:
+                _encoder = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=threads, thread_name_prefix="wandb-media-encode"
+                )
+                _encoder_slots = threading.BoundedSemaphore(
+                    threads * _ENCODE_QUEUE_FACTOR
+                )
+        encoder, slots = _encoder, _encoder_slots
+
+    if encoder is None or slots is None:
+        future: concurrent.futures.Future[_T] = concurrent.futures.Future()
+        future.set_result(fn())
+        return future
+
+    slots.acquire()
+    try:
+        future = encoder.submit(fn)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future
@@ -3,7 +3,7 @@ import os
 import platform
 import re
 import shutil
-from typing import TYPE_CHECKING, Optional, Sequence, Type, Union, cast
+from typing import TYPE_CHECKING, Callable, Optional, Sequence, Tuple, Type, Union, cast
 
 import wandb
 from wandb import util
@@ -11,9 +11,12 @@ from wandb._globals import _datatypes_callback
 from wandb.sdk.lib import filesystem
 from wandb.sdk.lib.paths import LogicalPath
 
+from .._private import submit_encode
 from .wb_value import WBValue
 
 if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Future
+
     import numpy as np  # type: ignore
 
     from wandb.apis.public import Artifact as PublicArtifact
@@ -31,6 +34,12 @@ def _wb_filename(
     return f"{str(key)}_{str(step)}_{str(id)}{extension}"
 
 
+def _file_info(path: str) -> Tuple[str, str, int]:
+    with open(path, "rb") as f:
+        sha256 = hashlib.sha256(f.read()).hexdigest()
+    return path, sha256, os.path.getsize(path)
+
+
 class Media(WBValue):
     """A WBValue stored as a file outside JSON that can be rendered in a media panel.
 
@@ -38,13 +47,16 @@ class Media(WBValue):
     gets uploaded.
     """
 
-    _path: Optional[str]
     _run: Optional["LocalRun"]
     _caption: Optional[str]
     _is_tmp: Optional[bool]
     _extension: Optional[str]
-    _sha256: Optional[str]
-    _size: Optional[int]
+    _file_path: Optional[str]
+    _file_sha256: Optional[str]
+    _file_size: Optional[int]
+    # The file while it is still being written by the media encoding pool, see
+    # _set_file_async.
+    _pending_file: Optional["Future[Tuple[str, str, int]]"] = None
 
     def __init__(self, caption: Optional[str] = None) -> None:
         super().__init__()
@@ -53,10 +65,39 @@ class Media(WBValue):
         self._run = None
         self._caption = caption
 
+    # The path, digest and size of the file wait for a pending encoding.
+
+    @property
+    def _path(self) -> Optional[str]:
+        self._resolve_file()
+        return self._file_path
+
+    @_path.setter
+    def _path(self, path: Optional[str]) -> None:
+        self._file_path = path
+
+    @property
+    def _sha256(self) -> Optional[str]:
+        self._resolve_file()
+        return self._file_sha256
+
+    @_sha256.setter
+    def _sha256(self, sha256: Optional[str]) -> None:
+        self._file_sha256 = sha256
+
+    @property
+    def _size(self) -> Optional[int]:
+        self._resolve_file()
+        return self._file_size
+
+    @_size.setter
+    def _size(self, size: Optional[int]) -> None:
+        self._file_size = size
+
     def _set_file(
         self, path: str, is_tmp: bool = False, extension: Optional[str] = None
     ) -> None:
-        self._path = path
+        self._pending_file = None
         self._is_tmp = is_tmp
         self._extension = extension
         assert extension is None or path.endswith(
@@ -65,9 +106,40 @@ class Media(WBValue):
             extension, path
         )
 
-        with open(self._path, "rb") as f:
-            self._sha256 = hashlib.sha256(f.read()).hexdigest()
-        self._size = os.path.getsize(self._path)
+        self._path, self._sha256, self._size = _file_info(path)
+
+    def _set_file_async(
+        self,
+        write: Callable[[], None],
+        path: str,
+        is_tmp: bool = False,
+        extension: Optional[str] = None,
+    ) -> None:
+        """Like _set_file, for a file that write() creates at path.
+
+        write runs on the media encoding pool, so it must not use anything the
+        caller may still change. The file is waited for when it's first needed.
+        """
+        assert extension is None or path.endswith(
+            extension
+        ), 'Media file extension "{}" must occur at the end of path "{}".'.format(
+            extension, path
+        )
+        self._is_tmp = is_tmp
+        self._extension = extension
+
+        def encode() -> Tuple[str, str, int]:
+            write()
+            return _file_info(path)
+
+        self._pending_file = submit_encode(encode)
+
+    def _resolve_file(self) -> None:
+        pending = self._pending_file
+        if pending is not None:
+            # raises the encoding error, if any, on every access
+            self._file_path, self._file_sha256, self._file_size = pending.result()
+            self._pending_file = None
 
     @classmethod
     def get_media_subdir(cls: Type["Media"]) -> str:
@@ -122,8 +194,28 @@ class Media(WBValue):
         else:
             extension = self._extension
 
+        # Files named after their content are stored and uploaded once per run,
+        # logging the same content again refers to the first file. Files named
+        # by the caller's id_ are always written, they may be looked up by name.
+        content_key = None
         if id_ is None:
             id_ = self._sha256[:20]
+            content_key = os.path.join(
+                self.get_media_subdir(), self._sha256 + extension
+            )
+            stored_path = run._media_paths.get(content_key)
+            if stored_path is not None and os.path.exists(
+                os.path.join(run.dir, stored_path)
+            ):
+                if self._is_tmp:
+                    try:
+                        os.remove(self._path)
+                    except FileNotFoundError:
+                        # another object sharing the file bound it already
+                        pass
+                    self._is_tmp = False
+                self._path = os.path.join(run.dir, stored_path)
+                return
 
         file_path = _wb_filename(key, step, id_, extension)
         media_path = os.path.join(self.get_media_subdir(), file_path)
@@ -144,6 +236,9 @@ class Media(WBValue):
             self._path = new_path
             _datatypes_callback(media_path)
 
+        if content_key is not None:
+            run._media_paths[content_key] = media_path
+
     def to_json(self, run: Union["LocalRun", "LocalArtifact"]) -> dict:
         """Serialize the object into a JSON blob.
 
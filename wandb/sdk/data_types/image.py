@@ -72,6 +72,9 @@ class Image(BatchableMedia):
         mode: (string) The PIL mode for an image. Most common are "L", "RGB",
             "RGBA". Full explanation at https://pillow.readthedocs.io/en/4.2.x/handbook/concepts.html#concept-modes.
         caption: (string) Label for display of image.
+        file_type: (string) The format images created from data are encoded in:
+            "png" (default), "jpg" or "webp" (lossless). JPEG is the fastest to
+            encode, but lossy and without an alpha channel.
 
     Note : When logging a `torch.Tensor` as a `wandb.Image`, images are normalized. If you do not want to normalize your images, please convert your tensors to a PIL Image.
 
@@ -114,6 +117,12 @@ class Image(BatchableMedia):
     # PIL limit
     MAX_DIMENSION = 65500
 
+    # Encoder settings for images created from data, lower PNG compression
+    # levels encode faster into larger files.
+    PNG_COMPRESS_LEVEL = 6
+    JPEG_QUALITY = 95
+    FILE_TYPES = ("png", "jpg", "webp")
+
     _log_type = "image-file"
 
     format: Optional[str]
@@ -135,6 +144,7 @@ class Image(BatchableMedia):
         classes: Optional[Union["Classes", Sequence[dict]]] = None,
         boxes: Optional[Union[Dict[str, "BoundingBoxes2D"], Dict[str, dict]]] = None,
         masks: Optional[Union[Dict[str, "ImageMask"], Dict[str, dict]]] = None,
+        file_type: Optional[str] = None,
     ) -> None:
         super().__init__()
         # TODO: We should remove grouping, it's a terrible name and I don't
@@ -159,7 +169,7 @@ class Image(BatchableMedia):
             else:
                 self._initialize_from_path(data_or_path)
         else:
-            self._initialize_from_data(data_or_path, mode)
+            self._initialize_from_data(data_or_path, mode, file_type)
 
         self._set_initialization_meta(grouping, caption, classes, boxes, masks)
 
@@ -271,7 +281,15 @@ class Image(BatchableMedia):
         self,
         data: "ImageDataType",
         mode: Optional[str] = None,
+        file_type: Optional[str] = None,
     ) -> None:
+        file_type = (file_type or "png").lower()
+        if file_type == "jpeg":
+            file_type = "jpg"
+        if file_type not in self.FILE_TYPES:
+            raise ValueError(
+                "wandb.Image accepts %s file types" % ", ".join(self.FILE_TYPES)
+            )
         pil_image = util.get_module(
             "PIL.Image",
             required='wandb.Image needs the PIL package. To get it, run "pip install pillow".',
@@ -280,6 +298,7 @@ class Image(BatchableMedia):
             buf = BytesIO()
             util.ensure_matplotlib_figure(data).savefig(buf)
             self._image = pil_image.open(buf)
+            self._image.load()
         elif isinstance(data, pil_image.Image):
             self._image = data
         elif util.is_pytorch_tensor_typename(util.get_full_typename(data)):
@@ -301,11 +320,28 @@ class Image(BatchableMedia):
                 self.to_uint8(data), mode=mode or self.guess_mode(data)
             )
 
-        tmp_path = os.path.join(MEDIA_TMP.name, runid.generate_id() + ".png")
-        self.format = "png"
+        tmp_path = os.path.join(MEDIA_TMP.name, runid.generate_id() + "." + file_type)
+        self.format = file_type
         assert self._image is not None
-        self._image.save(tmp_path, transparency=None)
-        self._set_file(tmp_path, is_tmp=True)
+        # the caller may keep changing an image it passed in
+        image = self._image.copy() if self._image is data else self._image
+        options = self._encoder_options(file_type)
+
+        def write() -> None:
+            encoded = image
+            if file_type == "jpg" and encoded.mode not in ("1", "L", "RGB", "CMYK"):
+                encoded = encoded.convert("RGB")
+            encoded.save(tmp_path, **options)
+
+        self._set_file_async(write, tmp_path, is_tmp=True)
+
+    @classmethod
+    def _encoder_options(cls, file_type: str) -> Dict[str, Any]:
+        if file_type == "jpg":
+            return {"quality": cls.JPEG_QUALITY}
+        if file_type == "webp":
+            return {"lossless": True, "exact": True}
+        return {"transparency": None, "compress_level": cls.PNG_COMPRESS_LEVEL}
 
     @classmethod
     def from_json(
@@ -457,25 +493,33 @@ class Image(BatchableMedia):
         """Convert image data to uint8.
 
         Convert floating point image on the range [0,1] and integer images on the range
-        [0,255] to uint8, clipping if necessary.
+        [0,255] to uint8, clipping if necessary. Always returns a new array.
         """
         np = util.get_module(
             "numpy",
             required="wandb.Image requires numpy if not supplying PIL Images: pip install numpy",
         )
 
+        if data.dtype == np.uint8:
+            # already pixel values, unless it's an image of 0s and 1s
+            return data * np.uint8(255) if np.max(data) <= 1 else data.copy()
+
         # I think it's better to check the image range vs the data type, since many
         # image libraries will return floats between 0 and 255
 
         # some images have range -1...1 or 0-1
-        dmin = np.min(data)
+        dmin, dmax = np.min(data), np.max(data)
         if dmin < 0:
-            data = (data - np.min(data)) / np.ptp(data)
-        if np.max(data) <= 1.0:
-            data = (data * 255).astype(np.int32)
+            data = (data - dmin) / (dmax - dmin)
+            dmax = 1.0
+        if dmax <= 1.0:
+            data = data * 255
+            dmax = 255
 
-        # assert issubclass(data.dtype.type, np.integer), 'Illegal image format.'
-        return data.clip(0, 255).astype(np.uint8)
+        # data is not negative anymore, astype truncates like the int conversion
+        if dmax > 255:
+            data = np.minimum(data, 255)
+        return data.astype(np.uint8)
 
     @classmethod
     def seq_to_json(
@@ -640,9 +684,15 @@ class Image(BatchableMedia):
         return res
 
     def _free_ram(self) -> None:
-        if self._path is not None:
+        # keep the image until it's encoded, freeing it now would wait for that
+        if self._pending_file is None and self._path is not None:
             self._image = None
 
+    def _resolve_file(self) -> None:
+        if self._pending_file is not None:
+            super()._resolve_file()
+            self._free_ram()
+
     @property
     def image(self) -> Optional["PILImage"]:
         if self._image is None:
@@ -131,8 +131,15 @@ class Video(BatchableMedia):
             "moviepy.editor",
             required='wandb.Video requires moviepy and imageio when passing raw data.  Install with "pip install moviepy imageio"',
         )
+        np = util.get_module(
+            "numpy",
+            required='wandb.Video requires numpy when passing raw data. To get it, run "pip install numpy".',
+        )
         tensor = self._prepare_video(self.data)
         _, self._height, self._width, self._channels = tensor.shape
+        if np.may_share_memory(tensor, self.data):
+            # the caller may reuse its buffer while the video is encoded
+            tensor = tensor.copy()
 
         # encode sequence of images into gif string
         clip = mpy.ImageSequenceClip(list(tensor), fps=self._fps)
@@ -140,30 +147,34 @@ class Video(BatchableMedia):
         filename = os.path.join(
             MEDIA_TMP.name, runid.generate_id() + "." + self._format
         )
-        if TYPE_CHECKING:
-            kwargs: Dict[str, Optional[bool]] = {}
-        try:  # older versions of moviepy do not support logger argument
-            kwargs = {"logger": None}
-            if self._format == "gif":
-                write_gif_with_image_io(clip, filename)
-            else:
-                clip.write_videofile(filename, **kwargs)
-        except TypeError:
-            try:  # even older versions of moviepy do not support progress_bar argument
-                kwargs = {"verbose": False, "progress_bar": False}
-                if self._format == "gif":
-                    clip.write_gif(filename, **kwargs)
+        video_format = self._format
+
+        def write() -> None:
+            if TYPE_CHECKING:
+                kwargs: Dict[str, Optional[bool]] = {}
+            try:  # older versions of moviepy do not support logger argument
+                kwargs = {"logger": None}
+                if video_format == "gif":
+                    write_gif_with_image_io(clip, filename)
                 else:
                     clip.write_videofile(filename, **kwargs)
             except TypeError:
-                kwargs = {
-                    "verbose": False,
-                }
-                if self._format == "gif":
-                    clip.write_gif(filename, **kwargs)
-                else:
-                    clip.write_videofile(filename, **kwargs)
-        self._set_file(filename, is_tmp=True)
+                try:  # even older versions of moviepy do not support progress_bar argument
+                    kwargs = {"verbose": False, "progress_bar": False}
+                    if video_format == "gif":
+                        clip.write_gif(filename, **kwargs)
+                    else:
+                        clip.write_videofile(filename, **kwargs)
+                except TypeError:
+                    kwargs = {
+                        "verbose": False,
+                    }
+                    if video_format == "gif":
+                        clip.write_gif(filename, **kwargs)
+                    else:
+                        clip.write_videofile(filename, **kwargs)
+
+        self._set_file_async(write, filename, is_tmp=True)
 
     @classmethod
     def get_media_subdir(cls: Type["Video"]) -> str:
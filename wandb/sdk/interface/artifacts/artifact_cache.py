@@ -1,13 +1,31 @@
+import atexit
 import contextlib
 import hashlib
+import logging
 import os
 import secrets
-from typing import IO, TYPE_CHECKING, ContextManager, Dict, Generator, Optional, Tuple
+import sqlite3
+import threading
+import time
+import weakref
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    ContextManager,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from wandb import env, util
 from wandb.sdk.interface.artifacts import Artifact, ArtifactNotLoggedError
-from wandb.sdk.lib.filesystem import mkdir_exists_ok
-from wandb.sdk.lib.hashutil import B64MD5, ETag, b64_to_hex_id
+from wandb.sdk.lib.filesystem import lock_file, mkdir_exists_ok
+from wandb.sdk.lib.hashutil import B64MD5, ChecksumCache, ETag, b64_to_hex_id
 from wandb.sdk.lib.paths import FilePathStr, StrPath, URIStr
 
 if TYPE_CHECKING:
@@ -25,16 +43,320 @@ if TYPE_CHECKING:
             pass
 
 
+logger = logging.getLogger(__name__)
+
+
+class CacheIndex:
+    """Persistent index of the objects in an ArtifactsCache.
+
+    The size and last access time of each object is kept in a sqlite table
+    indexed by access time, along with the total size of the cache, so that
+    recording an access and finding the least recently used objects don't
+    need to walk the cache. The temporary files the cache writes are tracked
+    too, so the ones left behind by interrupted writes can be removed. If the
+    database can't be used, the total size is unknown and the cache falls back
+    to walking its directory.
+    """
+
+    # pending accesses are written in transactions of this size, or once they
+    # are this many seconds old, and when the process exits
+    COMMIT_EVERY = 1000
+    COMMIT_SECONDS = 10.0
+
+    def __init__(self, db_path: StrPath) -> None:
+        self._db_path = os.fspath(db_path)
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[int, float]] = {}
+        self._flushed = time.monotonic()
+        self._failed = False
+        _open_indexes.add(self)
+
+    def __del__(self) -> None:
+        with contextlib.suppress(Exception):
+            self.close()
+
+    def _reset(self) -> None:
+        # the connection and the pending accesses belong to the parent process
+        self._db = None
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        # called with self._lock held
+        if self._db is None and not self._failed:
+            try:
+                db = sqlite3.connect(self._db_path, timeout=10, check_same_thread=False)
+                # The cache may be shared over NFS, where WAL doesn't work as it
+                # needs shared memory. Switch back databases created in WAL mode.
+                db.execute("PRAGMA journal_mode=DELETE")
+                db.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS objects (
+                        path TEXT PRIMARY KEY, size INTEGER, atime REAL
+                    );
+                    CREATE INDEX IF NOT EXISTS objects_atime ON objects (atime);
+                    CREATE TABLE IF NOT EXISTS temp_files (path TEXT PRIMARY KEY);
+                    CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+                    INSERT OR IGNORE INTO meta VALUES ('total_size', 0), ('walked', 0);
+                    CREATE TRIGGER IF NOT EXISTS objects_insert AFTER INSERT ON objects
+                    BEGIN
+                        UPDATE meta SET value = value + NEW.size WHERE key = 'total_size';
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS objects_delete AFTER DELETE ON objects
+                    BEGIN
+                        UPDATE meta SET value = value - OLD.size WHERE key = 'total_size';
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS objects_update
+                    AFTER UPDATE OF size ON objects
+                    BEGIN
+                        UPDATE meta SET value = value - OLD.size + NEW.size
+                        WHERE key = 'total_size';
+                    END;
+                    """
+                )
+                db.commit()
+                self._db = db
+            except sqlite3.Error as e:
+                logger.warning(f"Artifacts cache index {self._db_path} disabled: {e}")
+                self._failed = True
+        return self._db
+
+    def record(self, path: StrPath, size: int) -> None:
+        """Note that the object at path, of the given size, was just used."""
+        with self._lock:
+            self._pending[os.fspath(path)] = (size, time.time())
+            if (
+                len(self._pending) < self.COMMIT_EVERY
+                and time.monotonic() - self._flushed < self.COMMIT_SECONDS
+            ):
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """Write pending accesses to the database."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flushed = time.monotonic()
+            db = self._connect()
+            if not pending or db is None:
+                return
+            try:
+                with db:
+                    db.executemany(
+                        "INSERT INTO objects VALUES (?, ?, ?) ON CONFLICT (path)"
+                        " DO UPDATE SET size = excluded.size, atime = excluded.atime",
+                        [
+                            (path, size, atime)
+                            for path, (size, atime) in pending.items()
+                        ],
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Unable to update artifacts cache index: {e}")
+
+    def _meta(self, key: str) -> Optional[int]:
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return None
+            try:
+                row = db.execute(
+                    "SELECT value FROM meta WHERE key=?", (key,)
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+        return row[0] if row else None
+
+    def total_size(self) -> Optional[int]:
+        """The total size of the indexed objects, None if the index is unusable."""
+        return self._meta("total_size")
+
+    def walked(self) -> Optional[float]:
+        """When the cache was last walked to update the index, 0 if it never was."""
+        return self._meta("walked")
+
+    def update(self, objects: Iterable[Tuple[str, int, float]], walked: float) -> None:
+        """Update the index with (path, size, atime) of every object in the cache.
+
+        Objects that are already indexed keep their last recorded access unless
+        the file was accessed later. Objects recorded since the walk started at
+        `walked` are kept even if the walk missed them.
+        """
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                db.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS walked_objects"
+                    " (path TEXT PRIMARY KEY, size INTEGER, atime REAL)"
+                )
+                with db:
+                    db.execute("DELETE FROM walked_objects")
+                    db.executemany(
+                        "INSERT INTO walked_objects VALUES (?, ?, ?)", objects
+                    )
+                    db.execute(
+                        "DELETE FROM objects WHERE atime < ?"
+                        " AND path NOT IN (SELECT path FROM walked_objects)",
+                        (walked,),
+                    )
+                    db.execute(
+                        "INSERT INTO objects SELECT * FROM walked_objects WHERE true"
+                        " ON CONFLICT (path) DO UPDATE SET size = excluded.size,"
+                        " atime = max(atime, excluded.atime)"
+                    )
+                    db.execute("DELETE FROM walked_objects")
+                    db.execute(
+                        "UPDATE meta SET value = ? WHERE key = 'walked'", (walked,)
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Unable to update artifacts cache index: {e}")
+
+    def add_temp_files(self, paths: Iterable[str]) -> None:
+        """Note that the temporary files at paths are about to be written."""
+        self._execute(
+            "INSERT OR IGNORE INTO temp_files VALUES (?)", [(p,) for p in paths]
+        )
+
+    def remove_temp_files(self, paths: Iterable[str]) -> None:
+        self._execute("DELETE FROM temp_files WHERE path=?", [(p,) for p in paths])
+
+    def temp_files(self) -> List[str]:
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return []
+            try:
+                return [row[0] for row in db.execute("SELECT path FROM temp_files")]
+            except sqlite3.Error:
+                return []
+
+    def fill(self, temp_path: str, path: StrPath, size: int) -> None:
+        """Note that the temporary file temp_path was moved to the object at path."""
+        with self._lock:
+            self._pending.pop(os.fspath(path), None)
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.execute("DELETE FROM temp_files WHERE path=?", (temp_path,))
+                    db.execute(
+                        "INSERT INTO objects VALUES (?, ?, ?) ON CONFLICT (path)"
+                        " DO UPDATE SET size = excluded.size, atime = excluded.atime",
+                        (os.fspath(path), size, time.time()),
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Unable to update artifacts cache index: {e}")
+
+    def least_recently_used(self, limit: int) -> List[Tuple[str, int]]:
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return []
+            try:
+                return db.execute(
+                    "SELECT path, size FROM objects ORDER BY atime LIMIT ?", (limit,)
+                ).fetchall()
+            except sqlite3.Error:
+                return []
+
+    def remove(self, paths: Iterable[str]) -> None:
+        self._execute("DELETE FROM objects WHERE path=?", [(p,) for p in paths])
+
+    def _execute(self, sql: str, params: List[Tuple[str]]) -> None:
+        if not params:
+            return
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.executemany(sql, params)
+            except sqlite3.Error as e:
+                logger.warning(f"Unable to update artifacts cache index: {e}")
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_open_indexes: "weakref.WeakSet[CacheIndex]" = weakref.WeakSet()
+
+
+def _flush_indexes() -> None:
+    # record the accesses of the objects used since the last flush
+    for index in list(_open_indexes):
+        index.flush()
+
+
+def _reset_indexes() -> None:
+    for index in list(_open_indexes):
+        index._reset()
+
+
+atexit.register(_flush_indexes)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_indexes)
+
+
 class ArtifactsCache:
     _TMP_PREFIX = "tmp"
+    _CHECKSUMS_DB = "checksums.db"
+    _INDEX_DB = "index.db"
+    _LOCKS_DIR = "locks"
+    # objects evicted from the index in one query while cleaning up
+    _EVICT_BATCH = 1000
+    # minimum seconds between checks of the size of a cache with a max_size
+    _EVICT_CHECK_SECONDS = 1.0
+    # seconds after which cleanup walks the cache again, to index objects and
+    # find temporary files that were written without going through the cache
+    _REWALK_SECONDS = 24 * 60 * 60
 
-    def __init__(self, cache_dir: StrPath) -> None:
+    def __init__(self, cache_dir: StrPath, max_size: Optional[int] = None) -> None:
         self._cache_dir = cache_dir
         mkdir_exists_ok(self._cache_dir)
+        self._max_size = max_size
+        self._evict_checked = 0.0
         self._md5_obj_dir = os.path.join(self._cache_dir, "obj", "md5")
         self._etag_obj_dir = os.path.join(self._cache_dir, "obj", "etag")
         self._artifacts_by_id: Dict[str, Artifact] = {}
         self._artifacts_by_client_id: Dict[str, "wandb_artifacts.Artifact"] = {}
+        self._init_local_state()
+
+    def _init_local_state(self) -> None:
+        # database connections and locks, which can't be shared with other processes
+        self._index = CacheIndex(
+            os.path.join(self._cache_dir, ArtifactsCache._INDEX_DB)
+        )
+        self._evict_lock = threading.Lock()
+        self._checksums: Optional[ChecksumCache] = None
+        # temporary files this process is writing
+        self._writing: Set[str] = set()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for key in ("_index", "_evict_lock", "_checksums", "_writing"):
+            del state[key]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_local_state()
+
+    @property
+    def checksums(self) -> ChecksumCache:
+        """Persistent MD5 cache of local files, see ChecksumCache."""
+        if self._checksums is None:
+            self._checksums = ChecksumCache(
+                os.path.join(self._cache_dir, ArtifactsCache._CHECKSUMS_DB)
+            )
+        return self._checksums
 
     def check_md5_obj_path(
         self, b64_md5: B64MD5, size: int
@@ -43,6 +365,7 @@ class ArtifactsCache:
         path = os.path.join(self._cache_dir, "obj", "md5", hex_md5[:2], hex_md5[2:])
         opener = self._cache_opener(path)
         if os.path.isfile(path) and os.path.getsize(path) == size:
+            self._index.record(path, size)
             return FilePathStr(path), True, opener
         mkdir_exists_ok(os.path.dirname(path))
         return FilePathStr(path), False, opener
@@ -62,10 +385,39 @@ class ArtifactsCache:
         path = os.path.join(self._cache_dir, "obj", "etag", hexhash[:2], hexhash[2:])
         opener = self._cache_opener(path)
         if os.path.isfile(path) and os.path.getsize(path) == size:
+            self._index.record(path, size)
             return FilePathStr(path), True, opener
         mkdir_exists_ok(os.path.dirname(path))
         return FilePathStr(path), False, opener
 
+    def check_upload_state_path(
+        self, upload_key: str
+    ) -> Tuple[FilePathStr, bool, "Opener"]:
+        """Path of the saved progress of an interrupted multipart upload."""
+        hexhash = hashlib.sha256(upload_key.encode("utf-8")).hexdigest()
+        path = os.path.join(self._cache_dir, "uploads", hexhash[:2], hexhash[2:])
+        opener = self._cache_opener(path)
+        if os.path.isfile(path):
+            return FilePathStr(path), True, opener
+        mkdir_exists_ok(os.path.dirname(path))
+        return FilePathStr(path), False, opener
+
+    @contextlib.contextmanager
+    def fill_lock(self, path: StrPath) -> Generator[None, None, None]:
+        """Hold the lock for filling the cache entry at path.
+
+        Every process and thread sharing the cache directory takes this lock
+        before downloading an object, so only one of them fetches it. The others
+        wait, and should check the cache again once they hold the lock.
+        """
+        # Objects share a fixed set of lock files so they don't pile up.
+        stripe = hashlib.sha256(str(path).encode("utf-8")).hexdigest()[:3]
+        lock_path = os.path.join(
+            self._cache_dir, ArtifactsCache._LOCKS_DIR, f"{stripe}.lock"
+        )
+        with lock_file(lock_path):
+            yield
+
     def get_artifact(self, artifact_id: str) -> Optional["Artifact"]:
         return self._artifacts_by_id.get(artifact_id)
 
@@ -82,26 +434,114 @@ class ArtifactsCache:
     def store_client_artifact(self, artifact: "wandb_artifacts.Artifact") -> None:
         self._artifacts_by_client_id[artifact._client_id] = artifact
 
-    def cleanup(self, target_size: int) -> int:
+    def cleanup(self, target_size: int, remove_temp_files: bool = True) -> int:
+        """Evict the least recently used objects until the cache fits target_size.
+
+        Temporary files left behind by interrupted writes are removed as well,
+        unless remove_temp_files is False.
+
+        Returns:
+            The number of bytes reclaimed.
+        """
+        self._index.flush()
+        bytes_reclaimed = 0
+        if remove_temp_files:
+            bytes_reclaimed += self._remove_temp_files()
+        walked = self._index.walked()
+        if walked is not None and time.time() - walked >= self._REWALK_SECONDS:
+            bytes_reclaimed += self._update_index(remove_temp_files)
+        total_size = self._index.total_size()
+        if total_size is None:
+            return bytes_reclaimed + self._cleanup_walk(target_size, remove_temp_files)
+
+        while total_size > target_size:
+            objects = self._index.least_recently_used(ArtifactsCache._EVICT_BATCH)
+            if not objects:
+                break
+            evicted = []
+            for path, size in objects:
+                if total_size <= target_size:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                evicted.append(path)
+                total_size -= size
+                bytes_reclaimed += size
+            self._index.remove(evicted)
+        return bytes_reclaimed
+
+    def _remove_temp_files(self) -> int:
+        """Remove the tracked temporary files this process isn't writing."""
+        bytes_reclaimed = 0
+        writing = set(self._writing)
+        removed = []
+        for path in self._index.temp_files():
+            if path in writing:
+                continue
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                bytes_reclaimed += size
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            removed.append(path)
+        self._index.remove_temp_files(removed)
+        return bytes_reclaimed
+
+    def _walk(
+        self, remove_temp_files: bool = True
+    ) -> Tuple[List[Tuple[str, os.stat_result]], int]:
+        """Stat every object in the cache, removing leftover temporary files.
+
+        Returns:
+            The (path, stat) of each object and the bytes of temp files removed.
+        """
+        writing = set(self._writing)
+        temp_files = set(self._index.temp_files())
+        objects = []
         bytes_reclaimed = 0
-        paths = {}
-        total_size = 0
-        for root, _, files in os.walk(self._cache_dir):
+        for root, dirs, files in os.walk(self._cache_dir):
+            if root == os.fspath(self._cache_dir) and ArtifactsCache._LOCKS_DIR in dirs:
+                dirs.remove(ArtifactsCache._LOCKS_DIR)
             for file in files:
+                if file.startswith(
+                    (ArtifactsCache._CHECKSUMS_DB, ArtifactsCache._INDEX_DB)
+                ):
+                    continue
+                path = os.path.join(root, file)
                 try:
-                    path = os.path.join(root, file)
                     stat = os.stat(path)
-
-                    if file.startswith(ArtifactsCache._TMP_PREFIX):
-                        os.remove(path)
-                        bytes_reclaimed += stat.st_size
+                    if (
+                        file.startswith(ArtifactsCache._TMP_PREFIX)
+                        or path in temp_files
+                    ):
+                        if remove_temp_files and path not in writing:
+                            os.remove(path)
+                            bytes_reclaimed += stat.st_size
                         continue
                 except OSError:
                     continue
-                paths[path] = stat
-                total_size += stat.st_size
+                objects.append((path, stat))
+        return objects, bytes_reclaimed
+
+    def _update_index(self, remove_temp_files: bool = True) -> int:
+        """Index every object in the cache, returns the bytes of temp files removed."""
+        walked = time.time()
+        objects, bytes_reclaimed = self._walk(remove_temp_files)
+        self._index.update(
+            ((path, stat.st_size, stat.st_atime) for path, stat in objects), walked
+        )
+        return bytes_reclaimed
+
+    def _cleanup_walk(self, target_size: int, remove_temp_files: bool = True) -> int:
+        objects, bytes_reclaimed = self._walk(remove_temp_files)
+        total_size = sum(stat.st_size for _, stat in objects)
 
-        sorted_paths = sorted(paths.items(), key=lambda x: x[1].st_atime)
+        sorted_paths = sorted(objects, key=lambda x: x[1].st_atime)
         for path, stat in sorted_paths:
             if total_size < target_size:
                 return bytes_reclaimed
@@ -115,39 +555,113 @@ class ArtifactsCache:
             bytes_reclaimed += stat.st_size
         return bytes_reclaimed
 
+    def _maybe_evict(self) -> None:
+        """Start evicting in the background once the cache outgrows max_size."""
+        if self._max_size is None:
+            return
+        now = time.monotonic()
+        if now - self._evict_checked < ArtifactsCache._EVICT_CHECK_SECONDS:
+            return
+        self._evict_checked = now
+        total_size = self._index.total_size()
+        if total_size is None or total_size <= self._max_size:
+            return
+        if not self._evict_lock.acquire(blocking=False):
+            return
+
+        def evict() -> None:
+            try:
+                assert self._max_size is not None
+                # temp files may belong to downloads in other processes
+                self.cleanup(self._max_size, remove_temp_files=False)
+            except Exception as e:
+                logger.warning(f"Unable to evict from artifacts cache: {e}")
+            finally:
+                self._evict_lock.release()
+
+        threading.Thread(target=evict, name="ArtifactsCacheEvict", daemon=True).start()
+
+    @contextlib.contextmanager
+    def writing_temp_files(self, *paths: str) -> Generator[None, None, None]:
+        """Track temporary files in the cache while they are written.
+
+        Cleanup removes the tracked files left behind by interrupted writes, but
+        not the ones this process is still writing. Move them into place with
+        `fill_obj`.
+        """
+        self._writing.update(paths)
+        self._index.add_temp_files(paths)
+        try:
+            yield
+        finally:
+            self._writing.difference_update(paths)
+
+    def fill_obj(self, path: StrPath, temp_path: str) -> None:
+        """Fill the cache entry at path by moving a temporary file into place."""
+        try:
+            # Use replace where we can, as it implements an atomic
+            # move on most platforms. If it doesn't exist, we have
+            # to use rename which isn't atomic in all cases but there
+            # isn't a better option.
+            #
+            # The atomic replace is important in the event multiple processes
+            # attempt to write to / read from the cache at the same time. Each
+            # writer firsts stages its writes to a temporary file in the cache.
+            # Once it is finished, we issue an atomic replace operation to update
+            # the cache. Although this can result in redundant downloads, this
+            # guarantees that readers can NEVER read incomplete files from the
+            # cache.
+            #
+            # IMPORTANT: Replace is NOT atomic across different filesystems. This why
+            # it is critical that the temporary files sit directly in the cache --
+            # they need to be on the same filesystem!
+            os.replace(temp_path, path)
+        except AttributeError:
+            os.rename(temp_path, path)
+
+        self._index.fill(temp_path, path, os.path.getsize(path))
+        self._maybe_evict()
+
+    def remove_temp_files(self, *paths: str) -> None:
+        """Remove tracked temporary files that are no longer needed."""
+        for path in paths:
+            with contextlib.suppress(OSError):
+                os.remove(path)
+        self._index.remove_temp_files(paths)
+
+    def _temp_path(self, path: StrPath) -> str:
+        return os.path.join(
+            os.path.dirname(path),
+            f"{ArtifactsCache._TMP_PREFIX}_{secrets.token_hex(8)}",
+        )
+
+    def link_obj(self, path: StrPath, source: StrPath) -> bool:
+        """Fill the cache entry at path with a hard link to source.
+
+        The caller must never modify source afterwards. Returns False if source
+        can't be linked, e.g. because it is on another filesystem.
+        """
+        tmp_file = self._temp_path(path)
+        with self.writing_temp_files(tmp_file):
+            try:
+                os.link(source, tmp_file)
+            except OSError:
+                self.remove_temp_files(tmp_file)
+                return False
+            self.fill_obj(path, tmp_file)
+        return True
+
     def _cache_opener(self, path: StrPath) -> "Opener":
         @contextlib.contextmanager
         def helper(mode: str = "w") -> Generator[IO, None, None]:
             if "a" in mode:
                 raise ValueError("Appending to cache files is not supported")
 
-            dirname = os.path.dirname(path)
-            tmp_file = os.path.join(
-                dirname, f"{ArtifactsCache._TMP_PREFIX}_{secrets.token_hex(8)}"
-            )
-            with util.fsync_open(tmp_file, mode=mode) as f:
-                yield f
-
-            try:
-                # Use replace where we can, as it implements an atomic
-                # move on most platforms. If it doesn't exist, we have
-                # to use rename which isn't atomic in all cases but there
-                # isn't a better option.
-                #
-                # The atomic replace is important in the event multiple processes
-                # attempt to write to / read from the cache at the same time. Each
-                # writer firsts stages its writes to a temporary file in the cache.
-                # Once it is finished, we issue an atomic replace operation to update
-                # the cache. Although this can result in redundant downloads, this
-                # guarantees that readers can NEVER read incomplete files from the
-                # cache.
-                #
-                # IMPORTANT: Replace is NOT atomic across different filesystems. This why
-                # it is critical that the temporary files sit directly in the cache --
-                # they need to be on the same filesystem!
-                os.replace(tmp_file, path)
-            except AttributeError:
-                os.rename(tmp_file, path)
+            tmp_file = self._temp_path(path)
+            with self.writing_temp_files(tmp_file):
+                with util.fsync_open(tmp_file, mode=mode) as f:
+                    yield f
+                self.fill_obj(path, tmp_file)
 
         return helper
 
@@ -159,5 +673,8 @@ def get_artifacts_cache() -> ArtifactsCache:
     global _artifacts_cache
     if _artifacts_cache is None:
         cache_dir = os.path.join(env.get_cache_dir(), "artifacts")
-        _artifacts_cache = ArtifactsCache(cache_dir)
+        max_size = env.get_artifact_cache_max_size()
+        _artifacts_cache = ArtifactsCache(
+            cache_dir, max_size=util.from_human_size(max_size) if max_size else None
+        )
     return _artifacts_cache
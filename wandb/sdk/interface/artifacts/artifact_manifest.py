@@ -1,6 +1,19 @@
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Union
-
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from wandb.sdk.lib import json_stream
 from wandb.sdk.lib.hashutil import B64MD5, ETag, HexMD5
 from wandb.sdk.lib.paths import FilePathStr, LogicalPath, StrPath, URIStr
 
@@ -12,6 +25,17 @@ if TYPE_CHECKING:
 class ArtifactManifestEntry:
     """A single entry in an artifact manifest."""
 
+    # Artifacts can have millions of entries, keep them small.
+    __slots__ = (
+        "path",
+        "digest",
+        "ref",
+        "birth_artifact_id",
+        "size",
+        "extra",
+        "local_path",
+    )
+
     path: LogicalPath
     digest: Union[B64MD5, URIStr, FilePathStr, ETag]
     ref: Optional[Union[FilePathStr, URIStr]]
@@ -98,16 +122,54 @@ class ArtifactManifest:
     def from_manifest_json(cls, manifest_json: Dict) -> "ArtifactManifest":
         if "version" not in manifest_json:
             raise ValueError("Invalid manifest format. Must contain version field.")
-        version = manifest_json["version"]
-        for sub in cls.__subclasses__():
+        return cls._version_class(manifest_json["version"]).from_manifest_json(
+            manifest_json
+        )
+
+    @classmethod
+    def from_manifest_stream(cls, chunks: Iterable[str]) -> "ArtifactManifest":
+        """Load a manifest from the chunks of text of its JSON.
+
+        Entries are created as their JSON is parsed, so unlike
+        from_manifest_json the JSON of all the entries is never in memory at
+        once. This needs "version" to come before "contents", as it does in
+        the manifests we write.
+        """
+        manifest_json: Dict[str, Any] = {}
+        entries: Dict[str, ArtifactManifestEntry] = {}
+        for key, value in json_stream.iter_object_items(
+            chunks, stream_keys=("contents",)
+        ):
+            if key != "contents":
+                manifest_json[key] = value
+            elif "version" in manifest_json:
+                entries = cls._version_class(
+                    manifest_json["version"]
+                ).entries_from_json(value)
+            else:
+                manifest_json[key] = dict(value)
+        manifest = cls.from_manifest_json({"contents": {}, **manifest_json})
+        manifest.entries.update(entries)
+        return manifest
+
+    @classmethod
+    def _version_class(cls, version: int) -> Type["ArtifactManifest"]:
+        for sub in ArtifactManifest.__subclasses__():
             if sub.version() == version:
-                return sub.from_manifest_json(manifest_json)
+                return sub
         raise ValueError("Invalid manifest version.")
 
     @classmethod
     def version(cls) -> int:
         raise NotImplementedError
 
+    @classmethod
+    def entries_from_json(
+        cls, contents: Iterable[Tuple[str, Dict]]
+    ) -> Dict[str, ArtifactManifestEntry]:
+        """Create the entries of the (path, JSON) items of the manifest contents."""
+        raise NotImplementedError
+
     def __init__(
         self,
         storage_policy: "wandb_artifacts.WandbStoragePolicy",
@@ -119,6 +181,9 @@ class ArtifactManifest:
     def to_manifest_json(self) -> Dict:
         raise NotImplementedError
 
+    def write_manifest_json(self, fp: IO[str]) -> None:
+        raise NotImplementedError
+
     def digest(self) -> HexMD5:
         raise NotImplementedError
 
@@ -50,6 +50,11 @@ class InterfaceSock(InterfaceShared):
         self._assign(record)
         self._sock_client.send_record_publish(record)
 
+    def _publish_exit(self, exit_data: "pb.RunExitRecord") -> None:
+        super()._publish_exit(exit_data)
+        # don't hold the exit record back in a batch
+        self._sock_client.flush()
+
     def _communicate_async(
         self, rec: "pb.Record", local: Optional[bool] = None
     ) -> MessageFuture:
@@ -1,5 +1,4 @@
 import concurrent.futures
-import json
 import os
 import sys
 import tempfile
@@ -212,7 +211,7 @@ class ArtifactSaver:
             self._resolve_client_id_manifest_references()
             with tempfile.NamedTemporaryFile("w+", suffix=".json", delete=False) as fp:
                 path = os.path.abspath(fp.name)
-                json.dump(self._manifest.to_manifest_json(), fp, indent=4)
+                self._manifest.write_manifest_json(fp)
             digest = md5_file_b64(path)
             if distributed_id or incremental:
                 # If we're in the distributed flow, we want to update the
@@ -19,10 +19,12 @@ header :=
 # TODO: possibly restructure code by porting the C++ or go implementation
 
 import logging
+import mmap
 import os
 import struct
+import time
 import zlib
-from typing import TYPE_CHECKING, Tuple
+from typing import TYPE_CHECKING, Iterator, Optional, Tuple, Union
 
 import wandb
 
@@ -46,6 +48,9 @@ LEVELDBLOG_HEADER_MAGIC = (
 )
 LEVELDBLOG_HEADER_VERSION = 0
 
+# Default amount of data buffered before it is written out in buffered mode
+LEVELDBLOG_BUFFER_BLOCKS = 4
+
 try:
     bytes("", "ascii")
 
@@ -64,6 +69,8 @@ except Exception:
 class DataStore:
     _index: int
     _flush_offset: int
+    _mm: Optional[mmap.mmap]
+    _view: Optional[memoryview]
 
     def __init__(self) -> None:
         self._opened_for_scan = False
@@ -72,6 +79,18 @@ class DataStore:
         self._flush_offset = 0
         self._size_bytes = 0
 
+        # memory-mapped scan state
+        self._mm = None
+        self._view = None
+
+        # buffered (group commit) write state, see open_for_write()
+        self._write_buf: Optional[bytearray] = None
+        self._write_buf_len = 0
+        self._write_buf_limit = 0
+        self._written_offset = 0
+        self._flush_interval: Optional[float] = None
+        self._last_sync_time = 0.0
+
         self._crc = [0] * (LEVELDBLOG_LAST + 1)
         for x in range(1, LEVELDBLOG_LAST + 1):
             self._crc[x] = zlib.crc32(strtobytes(chr(x))) & 0xFFFFFFFF
@@ -80,11 +99,43 @@ class DataStore:
             wandb._assert_is_internal_process
         ), "DataStore can only be used in the internal process"
 
-    def open_for_write(self, fname: str) -> None:
+    def open_for_write(
+        self,
+        fname: str,
+        flush_interval: Optional[float] = None,
+        flush_bytes: Optional[int] = None,
+    ) -> None:
+        """Create the log for writing.
+
+        By default every record is handed to the file object as it is written
+        and multi-block records are fsynced immediately.  Passing either
+        flush_interval or flush_bytes enables buffered mode: records are packed
+        into whole blocks in a preallocated buffer which is written out with a
+        single write once flush_bytes (rounded up to a block) are pending, and
+        fsynced at most once every flush_interval seconds.  Without a
+        flush_interval every write of the buffer is fsynced.
+
+        Arguments:
+            fname: Path to the transaction log.
+            flush_interval: Seconds between group commits (write + fsync).
+            flush_bytes: Bytes to accumulate before writing out the buffer.
+        """
         self._fname = fname
         logger.info("open: %s", fname)
         open_flags = "xb"
-        self._fp = open(fname, open_flags)
+        if flush_interval is None and flush_bytes is None:
+            self._fp = open(fname, open_flags)
+        else:
+            # our buffer replaces the file object buffer
+            self._fp = open(fname, open_flags, buffering=0)
+            num_blocks = max(
+                -(-(flush_bytes or 0) // LEVELDBLOG_BLOCK_LEN),
+                LEVELDBLOG_BUFFER_BLOCKS if flush_bytes is None else 1,
+            )
+            self._write_buf = bytearray(num_blocks * LEVELDBLOG_BLOCK_LEN)
+            self._write_buf_limit = len(self._write_buf)
+            self._flush_interval = flush_interval
+            self._last_sync_time = time.monotonic()
         self._write_header()
 
     def open_for_append(self, fname):
@@ -94,20 +145,70 @@ class DataStore:
         self._fp = open(fname, "wb")
         # do something with _index
 
-    def open_for_scan(self, fname):
+    def open_for_scan(self, fname, use_mmap=False):
+        """Open the log for scanning.
+
+        Arguments:
+            fname: Path to the transaction log.
+            use_mmap: Memory-map the log instead of reading it through the
+                file object.  Records are then returned as memoryviews into
+                the mapping rather than copied into new bytes objects.
+        """
         self._fname = fname
         logger.info("open for scan: %s", fname)
         self._fp = open(fname, "r+b")
         self._index = 0
         self._size_bytes = os.stat(fname).st_size
         self._opened_for_scan = True
+        if use_mmap:
+            self._remap()
         self._read_header()
 
+    def _remap(self) -> None:
+        """(Re)map the log, picking up anything written since the last map."""
+        size = os.fstat(self._fp.fileno()).st_size
+        self._size_bytes = size
+        if self._view is not None and size <= len(self._view):
+            return
+        # the previous mapping is released once no records reference it
+        self._release_mmap()
+        # mmap can't map an empty file, keep an empty view until data shows up
+        if size:
+            self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mm)
+        else:
+            self._view = memoryview(b"")
+
+    def _release_mmap(self) -> None:
+        if self._view is not None:
+            try:
+                self._view.release()
+            except BufferError:
+                pass
+            self._view = None
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                # records returned by scan_data() still reference the map
+                pass
+            self._mm = None
+
+    def _read(self, size: int) -> Union[bytes, memoryview]:
+        if self._view is None:
+            return self._fp.read(size)
+        end = self._index + size
+        if end > len(self._view):
+            self._remap()
+        return self._view[self._index : end]
+
     def seek(self, offset: int) -> None:
         self._fp.seek(offset)
         self._index = offset
 
     def get_offset(self) -> int:
+        if self._view is not None:
+            return self._index
         offset = self._fp.tell()
         return offset
 
@@ -119,7 +220,7 @@ class DataStore:
         assert self._opened_for_scan, "file not open for scanning"
         # TODO(jhr): handle some assertions as file corruption issues
         # assume we have enough room to read header, checked by caller?
-        header = self._fp.read(LEVELDBLOG_HEADER_LEN)
+        header = self._read(LEVELDBLOG_HEADER_LEN)
         if len(header) == 0:
             return None
         assert (
@@ -131,7 +232,7 @@ class DataStore:
         checksum, dlength, dtype = fields
         # check len, better fit in the block
         self._index += LEVELDBLOG_HEADER_LEN
-        data = self._fp.read(dlength)
+        data = self._read(dlength)
         checksum_computed = zlib.crc32(data, self._crc[dtype]) & 0xFFFFFFFF
         assert (
             checksum == checksum_computed
@@ -146,7 +247,7 @@ class DataStore:
         space_left = LEVELDBLOG_BLOCK_LEN - offset
         if space_left < LEVELDBLOG_HEADER_LEN:
             pad_check = strtobytes("\x00" * space_left)
-            pad = self._fp.read(space_left)
+            pad = self._read(space_left)
             # verify they are zero
             assert pad == pad_check, "invalid padding"
             self._index += space_left
@@ -161,6 +262,7 @@ class DataStore:
         assert (
             dtype == LEVELDBLOG_FIRST
         ), f"expected record to be type {LEVELDBLOG_FIRST} but found {dtype}"
+        parts = [data]
         while True:
             offset = self._index % LEVELDBLOG_BLOCK_LEN
             record = self.scan_record()
@@ -168,15 +270,23 @@ class DataStore:
                 return None
             dtype, new_data = record
             if dtype == LEVELDBLOG_LAST:
-                data += new_data
+                parts.append(new_data)
                 break
             assert (
                 dtype == LEVELDBLOG_MIDDLE
             ), "expected record to be type {} but found {}".format(
                 LEVELDBLOG_MIDDLE, dtype
             )
-            data += new_data
-        return data
+            parts.append(new_data)
+        return b"".join(parts)
+
+    def scan_records(self) -> Iterator[Union[bytes, memoryview]]:
+        """Iterate over the remaining records in the log."""
+        while True:
+            data = self.scan_data()
+            if data is None:
+                return
+            yield data
 
     def _write_header(self):
         data = struct.pack(
@@ -190,11 +300,11 @@ class DataStore:
         ), "header size is {} bytes, expected {}".format(
             len(data), LEVELDBLOG_HEADER_LEN
         )
-        self._fp.write(data)
+        self._write_bytes(data)
         self._index += len(data)
 
     def _read_header(self):
-        header = self._fp.read(LEVELDBLOG_HEADER_LEN)
+        header = self._read(LEVELDBLOG_HEADER_LEN)
         assert (
             len(header) == LEVELDBLOG_HEADER_LEN
         ), "header is {} bytes instead of the expected {}".format(
@@ -223,9 +333,9 @@ class DataStore:
         checksum = zlib.crc32(s, self._crc[dtype]) & 0xFFFFFFFF
         # logger.info("write_record: index=%d len=%d dtype=%d",
         #     self._index, dlength, dtype)
-        self._fp.write(struct.pack("<IHB", checksum, dlength, dtype))
+        self._write_bytes(struct.pack("<IHB", checksum, dlength, dtype))
         if dlength:
-            self._fp.write(s)
+            self._write_bytes(s)
         self._index += LEVELDBLOG_HEADER_LEN + len(s)
 
     def _write_data(self, s):
@@ -239,7 +349,7 @@ class DataStore:
         #     self._index, offset, data_left)
         if space_left < LEVELDBLOG_HEADER_LEN:
             pad = "\x00" * space_left
-            self._fp.write(strtobytes(pad))
+            self._write_bytes(strtobytes(pad))
             self._index += space_left
             offset = 0
             space_left = LEVELDBLOG_BLOCK_LEN
@@ -267,13 +377,72 @@ class DataStore:
 
             # write last and flush the entire block to disk
             self._write_record(s[data_used:], LEVELDBLOG_LAST)
-            self._fp.flush()
-            os.fsync(self._fp.fileno())
-            self._flush_offset = self._index
+            if self._write_buf is None:
+                self._fp.flush()
+                os.fsync(self._fp.fileno())
+                self._flush_offset = self._index
+
+        if self._write_buf is not None:
+            self._maybe_sync()
 
         return start_offset, self._index, self._flush_offset
 
+    def _write_bytes(self, data: bytes) -> None:
+        buf = self._write_buf
+        if buf is None:
+            self._fp.write(data)
+            return
+        view = memoryview(data)
+        while view:
+            room = self._write_buf_limit - self._write_buf_len
+            chunk = view[:room]
+            buf[self._write_buf_len : self._write_buf_len + len(chunk)] = chunk
+            self._write_buf_len += len(chunk)
+            view = view[len(chunk) :]
+            if self._write_buf_len == self._write_buf_limit:
+                self._write_buffer()
+
+    def _write_buffer(self) -> None:
+        """Write out everything pending in the buffer with a single write."""
+        assert self._write_buf is not None
+        pending = memoryview(self._write_buf)[: self._write_buf_len]
+        while pending:
+            written = self._fp.write(pending)
+            pending = pending[written:]
+        self._written_offset += self._write_buf_len
+        self._write_buf_len = 0
+        # fill up to the next block boundary so later writes are whole blocks
+        self._write_buf_limit = len(self._write_buf) - (
+            self._written_offset % LEVELDBLOG_BLOCK_LEN
+        )
+        if self._flush_interval is None:
+            # group commit on every write when only flush_bytes is set
+            os.fsync(self._fp.fileno())
+            self._flush_offset = self._written_offset
+            self._last_sync_time = time.monotonic()
+
+    def _sync(self) -> None:
+        if self._write_buf is not None:
+            self._write_buffer()
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+        self._flush_offset = self._index
+        self._last_sync_time = time.monotonic()
+
+    def _maybe_sync(self) -> None:
+        if self._flush_interval is None or self._flush_offset == self._index:
+            return
+        if time.monotonic() - self._last_sync_time >= self._flush_interval:
+            self._sync()
+
+    def flush(self) -> None:
+        """Group commit: write out and fsync buffered records if they are due."""
+        if self._write_buf is not None:
+            self._maybe_sync()
+
     def ensure_flushed(self, off: int) -> None:
+        if self._write_buf is not None and off > self._written_offset:
+            self._write_buffer()
         self._fp.flush()
 
     def write(self, obj: "Record") -> Tuple[int, int, int]:
@@ -294,6 +463,10 @@ class DataStore:
         return ret
 
     def close(self) -> None:
+        self._release_mmap()
+        if self._write_buf is not None and self._fp is not None:
+            self._sync()
+            self._write_buf = None
         if self._fp is not None:
             logger.info("close: %s", self._fname)
             self._fp.close()
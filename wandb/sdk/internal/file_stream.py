@@ -1,18 +1,25 @@
 import base64
+import concurrent.futures
 import itertools
+import json
 import logging
 import os
+import pickle
 import queue
 import random
 import sys
+import tempfile
 import threading
 import time
+import zlib
 from types import TracebackType
 from typing import (
+    IO,
     TYPE_CHECKING,
     Any,
     Callable,
     Dict,
+    Iterable,
     List,
     NamedTuple,
     Optional,
@@ -292,6 +299,135 @@ class BinaryFilePolicy(DefaultFilePolicy):
         return {"offset": self._offset, "content": enc, "encoding": "base64"}
 
 
+class SpillQueue:
+    """FIFO queue of file stream items that spills to disk when it grows too big.
+
+    Items are held in memory until they add up to max_bytes of chunk data.
+    From then on new items are pickled to a temporary file instead, until the
+    reader has caught up with everything spilled, so items always come out in
+    the order they were put in.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._memory: queue.Queue = queue.Queue()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._spill_file: Optional[IO[bytes]] = None
+        self._spill_read_offset = 0
+        self._spilled = 0
+
+    @staticmethod
+    def _item_size(item: Any) -> int:
+        if isinstance(item, Chunk) and isinstance(item.data, (str, bytes)):
+            return len(item.data)
+        return 0
+
+    def put(self, item: Any) -> None:
+        size = self._item_size(item)
+        with self._lock:
+            if self._spilled or self._memory_bytes + size > self._max_bytes:
+                self._spill(item)
+                return
+            self._memory_bytes += size
+            self._memory.put(item)
+
+    def _spill(self, item: Any) -> None:
+        if self._spill_file is None:
+            logger.info("file stream backlog exceeded memory limit, spilling to disk")
+            self._spill_file = tempfile.TemporaryFile(prefix="wandb-file-stream-")
+        self._spill_file.seek(0, os.SEEK_END)
+        pickle.dump(item, self._spill_file)
+        self._spilled += 1
+
+    def _read_spilled(self, max_items: int) -> List[Any]:
+        assert self._spill_file is not None
+        items = []
+        self._spill_file.seek(self._spill_read_offset)
+        while self._spilled and len(items) < max_items:
+            items.append(pickle.load(self._spill_file))
+            self._spilled -= 1
+        self._spill_read_offset = self._spill_file.tell()
+        if not self._spilled:
+            # caught up with the writer, go back to buffering in memory
+            self._spill_file.seek(0)
+            self._spill_file.truncate()
+            self._spill_read_offset = 0
+        return items
+
+    def _read_memory(self, max_items: int, timeout: float) -> List[Any]:
+        items = util.read_many_from_queue(self._memory, max_items - 1, timeout)
+        size = sum(map(self._item_size, items))
+        with self._lock:
+            self._memory_bytes -= size
+        return items
+
+    def read_many(self, max_items: int, timeout: float) -> List[Any]:
+        """Read up to max_items, blocking up to timeout for the first one."""
+        with self._lock:
+            if self._spilled and self._memory.empty():
+                return self._read_spilled(max_items)
+        items = self._read_memory(max_items, timeout)
+        if len(items) < max_items:
+            # once spilling starts, no new items go to memory, so anything
+            # spilled is newer than what was just read
+            with self._lock:
+                if self._spilled and self._memory.empty():
+                    items += self._read_spilled(max_items - len(items))
+        return items
+
+    def qsize(self) -> int:
+        with self._lock:
+            return self._memory.qsize() + self._spilled
+
+    def spilled(self) -> int:
+        with self._lock:
+            return self._spilled
+
+    def close(self) -> None:
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+                self._spilled = 0
+
+
+class RateController:
+    """Adapts file stream batch size and send interval to backlog and latency.
+
+    The batch size doubles while the backlog is larger than a batch and halves
+    back towards min_batch as the backlog drains.  The send interval never
+    drops below the rate limit requested by the server, and backs off to
+    twice the (smoothed) request latency when the server gets slow, up to the
+    heartbeat interval.
+    """
+
+    LATENCY_SMOOTHING = 0.3
+
+    def __init__(self, min_batch: int, max_batch: int) -> None:
+        self._min_batch = min_batch
+        self._max_batch = max_batch
+        self.batch_size = min_batch
+        self.latency: Optional[float] = None
+
+    def observe_latency(self, seconds: float) -> None:
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += self.LATENCY_SMOOTHING * (seconds - self.latency)
+
+    def observe_backlog(self, backlog: int) -> None:
+        if backlog > self.batch_size:
+            self.batch_size = min(self.batch_size * 2, self._max_batch)
+        elif backlog < self.batch_size // 4:
+            self.batch_size = max(self.batch_size // 2, self._min_batch)
+
+    def send_interval(self, rate_limit: float, max_interval: float) -> float:
+        if self.latency is None:
+            return rate_limit
+        return max(rate_limit, min(2 * self.latency, max_interval))
+
+
 class FileStreamApi:
     """Pushes chunks of files to our streaming endpoint.
 
@@ -313,6 +449,9 @@ class FileStreamApi:
 
     HTTP_TIMEOUT = env.get_http_timeout(10)
     MAX_ITEMS_PER_PUSH = 10000
+    MAX_ITEMS_PER_PUSH_ADAPTIVE = 100000
+    # chunk data buffered in memory before the backlog spills to disk
+    MAX_QUEUE_BYTES = 128 * 1024 * 1024
 
     def __init__(
         self,
@@ -320,6 +459,8 @@ class FileStreamApi:
         run_id: str,
         start_time: float,
         settings: Optional[dict] = None,
+        compression: Optional[str] = None,
+        max_inflight: int = 1,
     ) -> None:
         settings = settings or dict()
         # NOTE: exc_info is set in thread_except_body context and readable by calling threads
@@ -344,9 +485,41 @@ class FileStreamApi:
                 "X-WANDB-USER-EMAIL": env.get_user_email() or "",
             }
         )
+        api.mount_http_adapter(self._client)
+        self._compression = compression
+        self._zstd_compressor = None
+        if compression == "zstd":
+            zstd = util.get_module("zstandard")
+            if zstd is None:
+                wandb.termwarn(
+                    "zstandard is not installed, compressing file stream with gzip",
+                    repeat=False,
+                )
+                self._compression = "gzip"
+            else:
+                self._zstd_compressor = zstd.ZstdCompressor()
+        self._bytes_uncompressed = 0
+        self._bytes_compressed = 0
         self._file_policies: Dict[str, "DefaultFilePolicy"] = {}
         self._dropped_chunks: int = 0
-        self._queue: queue.Queue = queue.Queue()
+        self._queue = SpillQueue(max_bytes=self.MAX_QUEUE_BYTES)
+        self._rate_controller = RateController(
+            min_batch=self.MAX_ITEMS_PER_PUSH,
+            max_batch=self.MAX_ITEMS_PER_PUSH_ADAPTIVE,
+        )
+        # With max_inflight > 1, requests are pipelined: up to max_inflight
+        # requests are outstanding at once, but a request that carries chunks
+        # of a file is only sent after earlier requests for that file finished.
+        self._pipeline: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        if max_inflight > 1:
+            self._pipeline = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_inflight, thread_name_prefix="FileStreamPost"
+            )
+        self._inflight_slots = threading.BoundedSemaphore(max_inflight)
+        self._inflight: List[concurrent.futures.Future] = []
+        self._inflight_files: Dict[str, concurrent.futures.Future] = {}
+        self._failed_uploaded: Set[str] = set()
+        self._lock = threading.Lock()
         self._thread = threading.Thread(target=self._thread_except_body)
         # It seems we need to make this a daemon thread to get sync.py's atexit handler to run, which
         # cleans this thread up.
@@ -368,6 +541,41 @@ class FileStreamApi:
         self._init_endpoint()
         self._thread.start()
 
+    @property
+    def bytes_uncompressed(self) -> int:
+        """Size of the request bodies sent so far, before compression."""
+        return self._bytes_uncompressed
+
+    @property
+    def bytes_compressed(self) -> int:
+        """Size of the request bodies sent so far, after compression."""
+        return self._bytes_compressed
+
+    def _encode(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the keyword arguments to post payload with.
+
+        When compression is enabled the payload is serialized and compressed
+        once here, so retries of the request resend the same body.
+        """
+        if self._compression is None:
+            return {"json": payload}
+        raw = json.dumps(payload).encode("utf-8")
+        if self._zstd_compressor is not None:
+            body = self._zstd_compressor.compress(raw)
+        else:
+            # wbits=31 produces a gzip container
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+            body = compressor.compress(raw) + compressor.flush()
+        self._bytes_uncompressed += len(raw)
+        self._bytes_compressed += len(body)
+        return {
+            "data": body,
+            "headers": {
+                "Content-Type": "application/json",
+                "Content-Encoding": self._compression,
+            },
+        }
+
     def set_default_file_policy(
         self, filename: str, file_policy: "DefaultFilePolicy"
     ) -> None:
@@ -395,18 +603,37 @@ class FileStreamApi:
         else:
             return max(5.0, self.heartbeat_seconds)
 
+    def send_interval_seconds(self) -> float:
+        return self._rate_controller.send_interval(
+            self.rate_limit_seconds(), self.heartbeat_seconds
+        )
+
+    @property
+    def backlog(self) -> int:
+        """Number of items waiting to be sent, in memory or spilled to disk."""
+        return self._queue.qsize()
+
     def _read_queue(self) -> List:
         # called from the push thread (_thread_body), this does an initial read
-        # that'll block for up to rate_limit_seconds. Then it tries to read
+        # that'll block for up to the send interval. Then it tries to read
         # as much out of the queue as it can. We do this because the http post
         # to the server happens within _thread_body, and can take longer than
         # our rate limit. So next time we get a chance to read the queue we want
         # read all the stuff that queue'd up since last time.
         #
-        # If we have more than MAX_ITEMS_PER_PUSH in the queue then the push thread
-        # will get behind and data will buffer up in the queue.
-        return util.read_many_from_queue(
-            self._queue, self.MAX_ITEMS_PER_PUSH, self.rate_limit_seconds()
+        # If the backlog outgrows the batch size, the rate controller grows the
+        # batch so each request drains more of it; data beyond MAX_QUEUE_BYTES
+        # waits on disk instead of in memory.
+        backlog = self.backlog
+        self._rate_controller.observe_backlog(backlog)
+        if backlog > self._rate_controller.batch_size:
+            logger.info(
+                "file stream backlog: %d items (%d spilled to disk)",
+                backlog,
+                self._queue.spilled(),
+            )
+        return self._queue.read_many(
+            self._rate_controller.batch_size, self.send_interval_seconds()
         )
 
     def _thread_body(self) -> None:
@@ -417,19 +644,21 @@ class FileStreamApi:
         finished: Optional["FileStreamApi.Finish"] = None
         while finished is None:
             items = self._read_queue()
+            uploaded.update(self._take_failed_uploaded())
             for item in items:
                 if isinstance(item, self.Finish):
                     finished = item
                 elif isinstance(item, self.Preempting):
-                    request_with_retry(
-                        self._client.post,
-                        self._endpoint,
-                        json={
+                    # data that was already pushed goes out before the notice
+                    self._wait_inflight()
+                    self._post(
+                        {
                             "complete": False,
                             "preempting": True,
                             "dropped": self._dropped_chunks,
                             "uploaded": list(uploaded),
                         },
+                        uploaded=list(uploaded),
                     )
                     uploaded = set()
                 elif isinstance(item, self.PushSuccess):
@@ -441,7 +670,7 @@ class FileStreamApi:
             cur_time = time.time()
 
             if ready_chunks and (
-                finished or cur_time - posted_data_time > self.rate_limit_seconds()
+                finished or cur_time - posted_data_time > self.send_interval_seconds()
             ):
                 posted_data_time = cur_time
                 posted_anything_time = cur_time
@@ -459,32 +688,39 @@ class FileStreamApi:
                 # If we encountered an error trying to publish the
                 # list of uploaded files, don't reset the `uploaded`
                 # list. Retry publishing the list on the next attempt.
-                if not isinstance(
-                    request_with_retry(
-                        self._client.post,
-                        self._endpoint,
-                        json={
-                            "complete": False,
-                            "failed": False,
-                            "dropped": self._dropped_chunks,
-                            "uploaded": list(uploaded),
-                        },
-                    ),
-                    Exception,
+                if self._post(
+                    {
+                        "complete": False,
+                        "failed": False,
+                        "dropped": self._dropped_chunks,
+                        "uploaded": list(uploaded),
+                    },
+                    uploaded=list(uploaded),
                 ):
                     uploaded = set()
 
-        # post the final close message. (item is self.Finish instance now)
-        request_with_retry(
-            self._client.post,
-            self._endpoint,
-            json={
-                "complete": True,
-                "exitcode": int(finished.exitcode),
-                "dropped": self._dropped_chunks,
-                "uploaded": list(uploaded),
-            },
+        # post the final close message once everything else has been sent.
+        # (item is self.Finish instance now)
+        self._wait_inflight()
+        uploaded.update(self._take_failed_uploaded())
+        self._request(
+            self._encode(
+                {
+                    "complete": True,
+                    "exitcode": int(finished.exitcode),
+                    "dropped": self._dropped_chunks,
+                    "uploaded": list(uploaded),
+                }
+            )
         )
+        if self._pipeline is not None:
+            self._pipeline.shutdown(wait=False)
+        if self._compression is not None:
+            logger.info(
+                "file stream sent %d bytes compressed from %d bytes",
+                self._bytes_compressed,
+                self._bytes_uncompressed,
+            )
 
     def _thread_except_body(self) -> None:
         # TODO: Consolidate with internal_util.ExceptionThread
@@ -516,6 +752,84 @@ class FileStreamApi:
                 if isinstance(limits, dict):
                     self._api.dynamic_settings.update(limits)
 
+    def _request(self, kwargs: Dict[str, Any]) -> Union[Exception, "requests.Response"]:
+        start_time = time.monotonic()
+        response = request_with_retry(self._client.post, self._endpoint, **kwargs)
+        self._rate_controller.observe_latency(time.monotonic() - start_time)
+        return response
+
+    def _post_after(
+        self,
+        dependencies: List["concurrent.futures.Future"],
+        kwargs: Dict[str, Any],
+        uploaded: List[str],
+        is_data: bool,
+    ) -> None:
+        # called from a pipeline worker. Requests touching the same file must
+        # reach the server in offset order, so wait until the earlier ones
+        # (including their retries) are done.
+        concurrent.futures.wait(dependencies)
+        response = self._request(kwargs)
+        with self._lock:
+            if is_data:
+                self._handle_response(response)
+            if uploaded and isinstance(response, Exception):
+                self._failed_uploaded.update(uploaded)
+
+    def _post(
+        self,
+        payload: Dict[str, Any],
+        filenames: Iterable[str] = (),
+        uploaded: Optional[List[str]] = None,
+    ) -> bool:
+        """Post a payload to the file stream endpoint.
+
+        Without pipelining this blocks until the request (and its retries)
+        finishes. With pipelining the request is handed to a worker and this
+        only blocks while max_inflight requests are outstanding; uploaded
+        names of a failed request are published again with a later request.
+
+        Returns:
+            False if the request is known to have failed.
+        """
+        filenames = list(filenames)
+        is_data = bool(filenames)
+        kwargs = self._encode(payload)
+        if is_data:
+            kwargs["retry_callback"] = self._api.retry_callback
+        if self._pipeline is None:
+            response = self._request(kwargs)
+            if is_data:
+                self._handle_response(response)
+            return not isinstance(response, Exception)
+
+        self._inflight = [f for f in self._inflight if not f.done()]
+        dependencies = [
+            self._inflight_files[name]
+            for name in filenames
+            if name in self._inflight_files
+        ]
+        self._inflight_slots.acquire()
+        future = self._pipeline.submit(
+            self._post_after, dependencies, kwargs, uploaded or [], is_data
+        )
+        future.add_done_callback(lambda _: self._inflight_slots.release())
+        self._inflight.append(future)
+        for name in filenames:
+            self._inflight_files[name] = future
+        return True
+
+    def _wait_inflight(self) -> None:
+        """Block until every pipelined request has completed."""
+        concurrent.futures.wait(self._inflight)
+        self._inflight = []
+        self._inflight_files = {}
+
+    def _take_failed_uploaded(self) -> Set[str]:
+        with self._lock:
+            failed, self._failed_uploaded = self._failed_uploaded, set()
+        return failed
+
     def _send(self, chunks: List[Chunk], uploaded: Optional[Set[str]] = None) -> bool:
         uploaded_list = list(uploaded or [])
         # create files dict. dict of <filename: chunks> pairs where chunks are a list of
@@ -533,37 +847,50 @@ class FileStreamApi:
             if not files[filename]:
                 del files[filename]
 
-        for fs in file_stream_utils.split_files(files, max_bytes=util.MAX_LINE_BYTES):
-            self._handle_response(
-                request_with_retry(
-                    self._client.post,
-                    self._endpoint,
-                    json={"files": fs, "dropped": self._dropped_chunks},
-                    retry_callback=self._api.retry_callback,
-                )
+        payloads: List[Dict[str, Any]] = [
+            {"files": fs, "dropped": self._dropped_chunks}
+            for fs in file_stream_utils.split_files(
+                files, max_bytes=util.MAX_LINE_BYTES
+            )
+        ]
+        # When compressing, coalesce the uploaded files notification into the
+        # last files request rather than making a separate request for it.
+        coalesce_uploaded = bool(
+            self._compression is not None and uploaded_list and payloads
+        )
+        if coalesce_uploaded:
+            payloads[-1].update(
+                {"complete": False, "failed": False, "uploaded": uploaded_list}
+            )
+
+        success = True
+        for i, payload in enumerate(payloads):
+            last = i == len(payloads) - 1
+            success = self._post(
+                payload,
+                filenames=payload["files"].keys(),
+                uploaded=uploaded_list if coalesce_uploaded and last else None,
             )
 
+        if coalesce_uploaded:
+            return success
         if uploaded_list:
-            if isinstance(
-                request_with_retry(
-                    self._client.post,
-                    self._endpoint,
-                    json={
-                        "complete": False,
-                        "failed": False,
-                        "dropped": self._dropped_chunks,
-                        "uploaded": uploaded_list,
-                    },
-                ),
-                Exception,
-            ):
-                return False
+            return self._post(
+                {
+                    "complete": False,
+                    "failed": False,
+                    "dropped": self._dropped_chunks,
+                    "uploaded": uploaded_list,
+                },
+                uploaded=uploaded_list,
+            )
         return True
 
     def stream_file(self, path: str) -> None:
         name = path.split("/")[-1]
         with open(path) as f:
             self._send([Chunk(name, line) for line in f])
+        self._wait_inflight()
 
     def enqueue_preempting(self) -> None:
         self._queue.put(self.Preempting())
@@ -597,6 +924,7 @@ class FileStreamApi:
         self._queue.put(self.Finish(exitcode))
         # TODO(jhr): join on a thread which exited with an exception is a noop, clean up this path
         self._thread.join()
+        self._queue.close()
         if self._exc_info:
             logger.error("FileStream exception", exc_info=self._exc_info)
             # re-raising the original exception, will get re-caught in internal.py for the sender thread
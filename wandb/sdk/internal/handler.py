@@ -40,7 +40,7 @@ from .settings_static import SettingsStatic
 from .system.system_monitor import SystemMonitor
 
 if TYPE_CHECKING:
-    from wandb.proto.wandb_internal_pb2 import ArtifactDoneRequest, MetricSummary
+    from wandb.proto.wandb_internal_pb2 import ArtifactDoneRequest
 
 
 SummaryDict = Dict[str, Any]
@@ -61,6 +61,74 @@ def _dict_nested_set(target: Dict[str, Any], key_list: Sequence[str], v: Any) ->
     target[key_list[-1]] = v
 
 
+def _dict_nested_get(target: Dict[str, Any], key_list: Sequence[str]) -> Any:
+    # like _dict_nested_set, returns the dictionary at key_list creating it
+    # if needed
+    for k in key_list:
+        target.setdefault(k, {})
+        target = target[k]
+    return target
+
+
+class _SummaryPlan:
+    """How summary metrics of one (possibly nested) history key are updated.
+
+    The plan is compiled from the metric definition that applies to the key
+    when the key is first seen and whenever metric definitions change. The
+    running values of the summary metrics are kept in flat slots, so they
+    survive recompiling.
+    """
+
+    __slots__ = (
+        "key_list",
+        "metric_key",
+        "metric",
+        "has_summary",
+        "copy_leaf",
+        "none",
+        "copy",
+        "last",
+        "max",
+        "min",
+        "mean",
+        "best",
+        "track_max",
+        "track_min",
+        "last_value",
+        "max_value",
+        "min_value",
+        "tot",
+        "num",
+    )
+
+    def __init__(self, key_list: Tuple[str, ...]) -> None:
+        self.key_list = key_list
+        self.metric_key = ".".join([k.replace(".", "\\.") for k in key_list])
+        self.last_value: Optional[float] = None
+        self.max_value: Optional[float] = None
+        self.min_value: Optional[float] = None
+        self.tot = 0.0
+        self.num = 0
+
+    def compile(self, metric: Optional[MetricRecord]) -> None:
+        self.metric = metric
+        self.has_summary = bool(metric and metric.HasField("summary"))
+        s = metric.summary if metric else MetricRecord().summary
+        # Store copy metric if not specified, or copy behavior
+        self.copy_leaf = not self.has_summary or s.copy
+        self.none = s.none
+        self.copy = s.copy
+        self.last = s.last
+        self.max = s.max
+        self.min = s.min
+        self.mean = s.mean
+        self.best = s.best
+        # defaulting to minimize if goal is not specified
+        goal_max = bool(metric and metric.goal == metric.GOAL_MAXIMIZE)
+        self.track_max = s.max or (s.best and goal_max)
+        self.track_min = s.min or (s.best and not goal_max)
+
+
 class HandleManager:
     _consolidated_summary: SummaryDict
     _sampled_history: Dict[str, sample.UniformSampleAccumulator]
@@ -76,7 +144,7 @@ class HandleManager:
     _tb_watcher: Optional[tb_watcher.TBWatcher]
     _metric_defines: Dict[str, MetricRecord]
     _metric_globs: Dict[str, MetricRecord]
-    _metric_track: Dict[Tuple[str, ...], float]
+    _summary_plans: Dict[Tuple[str, ...], _SummaryPlan]
     _metric_copy: Dict[Tuple[str, ...], Any]
     _track_time: Optional[float]
     _accumulate_time: float
@@ -117,7 +185,7 @@ class HandleManager:
         self._partial_history = dict()
         self._metric_defines = defaultdict(MetricRecord)
         self._metric_globs = defaultdict(MetricRecord)
-        self._metric_track = dict()
+        self._summary_plans = dict()
         self._metric_copy = dict()
 
         # TODO: implement release protocol to clean this up
@@ -239,125 +307,115 @@ class HandleManager:
 
     def _save_history(
         self,
-        history: HistoryRecord,
+        history_dict: Dict[str, Any],
     ) -> None:
-        for item in history.item:
+        # history_dict holds the already decoded values of the history record
+        for k, v in history_dict.items():
             # TODO(jhr) save nested keys?
-            k = item.key
-            v = json.loads(item.value_json)
             if isinstance(v, numbers.Real):
                 self._sampled_history[k].add(v)
 
     def _update_summary_metrics(
         self,
-        s: "MetricSummary",
-        kl: List[str],
+        plan: _SummaryPlan,
         v: "numbers.Real",
         float_v: float,
-        goal_max: Optional[bool],
     ) -> bool:
-        updated = False
-        best_key: Optional[Tuple[str, ...]] = None
-        if s.none:
+        kl = plan.key_list
+        if plan.none:
             return False
-        if s.copy:
+        if plan.copy:
             # non key list copy already done in _update_summary
             if len(kl) > 1:
                 _dict_nested_set(self._consolidated_summary, kl, v)
                 return True
-        if s.last:
-            last_key = tuple(kl + ["last"])
-            old_last = self._metric_track.get(last_key)
-            if old_last is None or float_v != old_last:
-                self._metric_track[last_key] = float_v
-                _dict_nested_set(self._consolidated_summary, last_key, v)
-                updated = True
-        if s.best:
-            best_key = tuple(kl + ["best"])
-        if s.max or best_key and goal_max:
-            max_key = tuple(kl + ["max"])
-            old_max = self._metric_track.get(max_key)
-            if old_max is None or float_v > old_max:
-                self._metric_track[max_key] = float_v
-                if s.max:
-                    _dict_nested_set(self._consolidated_summary, max_key, v)
-                    updated = True
-                if best_key:
-                    _dict_nested_set(self._consolidated_summary, best_key, v)
-                    updated = True
-        # defaulting to minimize if goal is not supecified
-        if s.min or best_key and not goal_max:
-            min_key = tuple(kl + ["min"])
-            old_min = self._metric_track.get(min_key)
-            if old_min is None or float_v < old_min:
-                self._metric_track[min_key] = float_v
-                if s.min:
-                    _dict_nested_set(self._consolidated_summary, min_key, v)
-                    updated = True
-                if best_key:
-                    _dict_nested_set(self._consolidated_summary, best_key, v)
-                    updated = True
-        if s.mean:
-            tot_key = tuple(kl + ["tot"])
-            num_key = tuple(kl + ["num"])
-            avg_key = tuple(kl + ["mean"])
-            tot = self._metric_track.get(tot_key, 0.0)
-            num = self._metric_track.get(num_key, 0)
-            tot += float_v
-            num += 1
-            self._metric_track[tot_key] = tot
-            self._metric_track[num_key] = num
-            _dict_nested_set(self._consolidated_summary, avg_key, tot / num)
-            updated = True
-        return updated
+        updates: Dict[str, Any] = {}
+        if plan.last:
+            if plan.last_value is None or float_v != plan.last_value:
+                plan.last_value = float_v
+                updates["last"] = v
+        if plan.track_max:
+            if plan.max_value is None or float_v > plan.max_value:
+                plan.max_value = float_v
+                if plan.max:
+                    updates["max"] = v
+                if plan.best:
+                    updates["best"] = v
+        if plan.track_min:
+            if plan.min_value is None or float_v < plan.min_value:
+                plan.min_value = float_v
+                if plan.min:
+                    updates["min"] = v
+                if plan.best:
+                    updates["best"] = v
+        if plan.mean:
+            plan.tot += float_v
+            plan.num += 1
+            updates["mean"] = plan.tot / plan.num
+        if not updates:
+            return False
+        # walk down the nested summary once for all the updated metrics
+        _dict_nested_get(self._consolidated_summary, kl).update(updates)
+        return True
 
-    def _update_summary_leaf(
-        self,
-        kl: List[str],
-        v: Any,
-        d: Optional[MetricRecord] = None,
-    ) -> bool:
-        has_summary = d and d.HasField("summary")
+    def _update_summary_leaf(self, plan: _SummaryPlan, v: Any) -> bool:
+        kl = plan.key_list
         if len(kl) == 1:
-            copy_key = tuple(kl)
-            old_copy = self._metric_copy.get(copy_key)
+            old_copy = self._metric_copy.get(kl)
             if old_copy is None or v != old_copy:
-                self._metric_copy[copy_key] = v
-                # Store copy metric if not specified, or copy behavior
-                if not has_summary or (d and d.summary.copy):
+                self._metric_copy[kl] = v
+                if plan.copy_leaf:
                     self._consolidated_summary[kl[0]] = v
                     return True
-        if not d:
-            return False
-        if not has_summary:
+        if not plan.has_summary:
             return False
         if not isinstance(v, numbers.Real):
             return False
         if math.isnan(v):
             return False
-        float_v = float(v)
-        goal_max = None
-        if d.goal:
-            goal_max = d.goal == d.GOAL_MAXIMIZE
-        if self._update_summary_metrics(
-            d.summary, kl=kl, v=v, float_v=float_v, goal_max=goal_max
-        ):
-            return True
-        return False
+        return self._update_summary_metrics(plan, v=v, float_v=float(v))
+
+    def _summary_plan(
+        self, kl: Tuple[str, ...], parent: Optional[_SummaryPlan]
+    ) -> _SummaryPlan:
+        plan = _SummaryPlan(kl)
+        plan.compile(
+            self._metric_defines.get(plan.metric_key, parent.metric if parent else None)
+        )
+        self._summary_plans[kl] = plan
+        return plan
+
+    def _recompile_summary_plans(self, name: str) -> None:
+        """Recompile the plans of metric name and the keys nested under it."""
+        prefix = name + "."
+        affected = [
+            plan
+            for plan in self._summary_plans.values()
+            if plan.metric_key == name or plan.metric_key.startswith(prefix)
+        ]
+        # parents are compiled before the nested keys inheriting their metric
+        for plan in sorted(affected, key=lambda p: len(p.key_list)):
+            parent = self._summary_plans.get(plan.key_list[:-1])
+            plan.compile(
+                self._metric_defines.get(
+                    plan.metric_key, parent.metric if parent else None
+                )
+            )
 
     def _update_summary_list(
         self,
-        kl: List[str],
+        kl: Tuple[str, ...],
         v: Any,
-        d: Optional[MetricRecord] = None,
+        parent: Optional[_SummaryPlan] = None,
     ) -> bool:
-        metric_key = ".".join([k.replace(".", "\\.") for k in kl])
-        d = self._metric_defines.get(metric_key, d)
+        plan = self._summary_plans.get(kl)
+        if plan is None:
+            plan = self._summary_plan(kl, parent)
         # if the dict has _type key, it's a wandb table object
         if isinstance(v, dict) and not handler_util.metric_is_wandb_dict(v):
             updated = False
             for nk, nv in v.items():
-                if self._update_summary_list(kl=kl[:] + [nk], v=nv, d=d):
+                if self._update_summary_list(kl=kl + (nk,), v=nv, parent=plan):
                     updated = True
             return updated
         # If the dict is a media object, update the pointer to the latest alias
@@ -365,7 +423,7 @@ class HandleManager:
             if "_latest_artifact_path" in v and "artifact_path" in v:
                 # TODO: Make non-destructive?
                 v["artifact_path"] = v["_latest_artifact_path"]
-        updated = self._update_summary_leaf(kl=kl, v=v, d=d)
+        updated = self._update_summary_leaf(plan, v)
         return updated
 
     def _update_summary_media_objects(self, v: Dict[str, Any]) -> Dict[str, Any]:
@@ -390,7 +448,7 @@ class HandleManager:
             return list(history_dict.keys())
         updated_keys = []
         for k, v in history_dict.items():
-            if self._update_summary_list(kl=[k], v=v):
+            if self._update_summary_list(kl=(k,), v=v):
                 updated_keys.append(k)
         return updated_keys
 
@@ -505,7 +563,7 @@ class HandleManager:
 
         self._history_update(record.history, history_dict)
         self._dispatch_record(record)
-        self._save_history(record.history)
+        self._save_history(history_dict)
         updated_keys = self._update_summary(history_dict)
         if updated_keys:
             updated_items = {k: self._consolidated_summary[k] for k in updated_keys}
@@ -771,6 +829,10 @@ class HandleManager:
             mr.control.local = True  # Don't store this, just send it
             self._dispatch_record(mr)
 
+        if self._summary_plans:
+            self._recompile_summary_plans(metric.name)
+            if metric.step_metric:
+                self._recompile_summary_plans(metric.step_metric)
         self._dispatch_record(record)
 
     def _handle_glob_metric(self, record: Record) -> None:
@@ -816,9 +878,9 @@ class HandleManager:
             item = SampledHistoryItem()
             item.key = key
             values: Iterable[Any] = sampled.get()
-            if all(isinstance(i, numbers.Integral) for i in values):
+            if sampled.integral:
                 item.values_int.extend(values)
-            elif all(isinstance(i, numbers.Real) for i in values):
+            else:
                 item.values_float.extend(values)
             result.response.sampled_history_response.item.append(item)
         self._respond_result(result)
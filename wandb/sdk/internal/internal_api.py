@@ -25,6 +25,7 @@ from typing import (
     TextIO,
     Tuple,
     Union,
+    cast,
 )
 
 import click
@@ -46,7 +47,7 @@ from ..lib import retry
 from ..lib.filenames import DIFF_FNAME, METADATA_FNAME
 from ..lib.git import GitRepo
 from . import context
-from .progress import AsyncProgress, Progress
+from .progress import AsyncProgress, FilePart, Progress
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +67,13 @@ if TYPE_CHECKING:
         md5: str
         mimetype: Optional[str]
         artifactManifestID: Optional[str]  # noqa: N815
+        uploadPartsInput: Optional[List["UploadPartsInput"]]  # noqa: N815
+
+    class UploadPartsInput(TypedDict):
+        """Corresponds to `type UploadPartsInput` in schema.graphql."""
+
+        partNumber: int  # noqa: N815
+        hexMD5: str  # noqa: N815
 
     class CreateArtifactFilesResponseFile(TypedDict):
         id: str
@@ -73,11 +81,21 @@ if TYPE_CHECKING:
         displayName: str  # noqa: N815
         uploadUrl: Optional[str]  # noqa: N815
         uploadHeaders: Sequence[str]  # noqa: N815
+        storagePath: Optional[str]  # noqa: N815
+        uploadMultipartUrls: Optional["UploadMultipartUrls"]  # noqa: N815
         artifact: "CreateArtifactFilesResponseFileNode"
 
     class CreateArtifactFilesResponseFileNode(TypedDict):
         id: str
 
+    class UploadMultipartUrls(TypedDict):
+        uploadID: str  # noqa: N815
+        uploadUrlParts: List["UploadUrlPart"]  # noqa: N815
+
+    class UploadUrlPart(TypedDict):
+        partNumber: int  # noqa: N815
+        uploadUrl: str  # noqa: N815
+
     class DefaultSettings(TypedDict):
         section: str
         git_remote: str
@@ -237,11 +255,16 @@ class Api:
         self._current_run_id: Optional[str] = None
         self._file_stream_api = None
         self._upload_file_session = requests.Session()
+        # Connection pool shared with other Api instances, see set_http_adapter
+        self._http_adapter: Optional[requests.adapters.HTTPAdapter] = None
         # This Retry class is initialized once for each Api instance, so this
         # defaults to retrying 1 million times per process or 7 days
         self.upload_file_retry = normalize_exceptions(
             retry.retriable(retry_timedelta=retry_timedelta)(self.upload_file)
         )
+        self.upload_file_part_retry = normalize_exceptions(
+            retry.retriable(retry_timedelta=retry_timedelta)(self.upload_file_part)
+        )
         self._client_id_mapping: Dict[str, str] = {}
         # Large file uploads to azure can optionally use their SDK
         self._azure_blob_module = util.get_module("azure.storage.blob")
@@ -253,6 +276,22 @@ class Api:
         self._max_cli_version: Optional[str] = None
         self._server_settings_type: Optional[List[str]] = None
 
+    def set_http_adapter(self, adapter: requests.adapters.HTTPAdapter) -> None:
+        """Route HTTP requests through a connection pool shared with other Apis.
+
+        Used when many runs are synced concurrently from one process, so that
+        they reuse connections instead of each opening their own.
+        """
+        self._http_adapter = adapter
+        self.mount_http_adapter(self.client.transport.session)
+        self.mount_http_adapter(self._upload_file_session)
+
+    def mount_http_adapter(self, session: requests.Session) -> None:
+        if self._http_adapter is None:
+            return
+        session.mount("http://", self._http_adapter)
+        session.mount("https://", self._http_adapter)
+
     def gql(self, *args: Any, **kwargs: Any) -> Any:
         ret = self._retry_gql(
             *args,
@@ -548,6 +587,11 @@ class Api:
         _, _, mutations = self.server_info_introspection()
         return "failRunQueueItem" in mutations
 
+    @normalize_exceptions
+    def multipart_upload_introspection(self) -> bool:
+        _, _, mutations = self.server_info_introspection()
+        return "completeMultipartUploadArtifact" in mutations
+
     @normalize_exceptions
     def fail_run_queue_item(self, run_queue_item_id: str) -> bool:
         mutation = gql(
@@ -2096,36 +2140,82 @@ class Api:
                 )
                 response.raise_for_status()
         except requests.exceptions.RequestException as e:
-            logger.error(f"upload_file exception {url}: {e}")
-            request_headers = e.request.headers if e.request is not None else ""
-            logger.error(f"upload_file request headers: {request_headers}")
-            response_content = e.response.content if e.response is not None else ""
-            logger.error(f"upload_file response body: {response_content}")
-            status_code = e.response.status_code if e.response is not None else 0
-            # S3 reports retryable request timeouts out-of-band
-            is_aws_retryable = (
-                "x-amz-meta-md5" in extra_headers
-                and status_code == 400
-                and "RequestTimeout" in str(response_content)
-            )
             # We need to rewind the file for the next retry (the file passed in is seeked to 0)
             progress.rewind()
-            # Retry errors from cloud storage or local network issues
-            if (
-                status_code in (308, 408, 409, 429, 500, 502, 503, 504)
-                or isinstance(
-                    e,
-                    (requests.exceptions.Timeout, requests.exceptions.ConnectionError),
-                )
-                or is_aws_retryable
-            ):
-                _e = retry.TransientError(exc=e)
-                raise _e.with_traceback(sys.exc_info()[2])
-            else:
-                wandb._sentry.reraise(e)
+            self._reraise_upload_exception("upload_file", url, extra_headers, e)
 
         return response
 
+    def upload_file_part(
+        self,
+        url: str,
+        part: FilePart,
+        md5_b64: str,
+        callback: Optional["ProgressFn"] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Upload one part of a multipart upload.
+
+        Arguments:
+            url: The signed url of this part
+            part: The range of the file to upload
+            md5_b64: The base64 encoded MD5 of the part, checked by the object store
+            callback: A callback which is passed the number of
+            bytes uploaded since the last time it was called, used to report progress
+            extra_headers: Headers of the whole upload, only the content type is
+            sent along with each part
+
+        Returns:
+            The ETag of the uploaded part, needed to complete the upload
+        """
+        extra_headers = extra_headers or {}
+        headers = {"Content-MD5": md5_b64}
+        if "Content-Type" in extra_headers:
+            headers["Content-Type"] = extra_headers["Content-Type"]
+        progress = Progress(part, callback=callback)
+        try:
+            response = self._upload_file_session.put(
+                url, data=progress, headers=headers
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            progress.rewind()
+            self._reraise_upload_exception("upload_file_part", url, headers, e)
+
+        return response.headers.get("ETag", "")
+
+    def _reraise_upload_exception(
+        self,
+        name: str,
+        url: str,
+        headers: Dict[str, str],
+        e: requests.exceptions.RequestException,
+    ) -> None:
+        logger.error(f"{name} exception {url}: {e}")
+        request_headers = e.request.headers if e.request is not None else ""
+        logger.error(f"{name} request headers: {request_headers}")
+        response_content = e.response.content if e.response is not None else ""
+        logger.error(f"{name} response body: {response_content}")
+        status_code = e.response.status_code if e.response is not None else 0
+        # S3 reports retryable request timeouts out-of-band
+        is_aws_retryable = (
+            "x-amz-meta-md5" in headers
+            and status_code == 400
+            and "RequestTimeout" in str(response_content)
+        )
+        # Retry errors from cloud storage or local network issues
+        if (
+            status_code in (308, 408, 409, 429, 500, 502, 503, 504)
+            or isinstance(
+                e,
+                (requests.exceptions.Timeout, requests.exceptions.ConnectionError),
+            )
+            or is_aws_retryable
+        ):
+            _e = retry.TransientError(exc=e)
+            raise _e.with_traceback(sys.exc_info()[2])
+        wandb._sentry.reraise(e)
+
     async def upload_file_async(
         self,
         url: str,
@@ -3175,8 +3265,7 @@ class Api:
     def create_artifact_files(
         self, artifact_files: Iterable["CreateArtifactFileSpecInput"]
     ) -> Mapping[str, "CreateArtifactFilesResponseFile"]:
-        mutation = gql(
-            """
+        query_string = """
         mutation CreateArtifactFiles(
             $storageLayout: ArtifactStorageLayout!
             $artifactFiles: [CreateArtifactFileSpecInput!]!
@@ -3193,6 +3282,7 @@ class Api:
                             displayName
                             uploadUrl
                             uploadHeaders
+                            _MULTIPART_FIELDS_
                             artifact {
                                 id
                             }
@@ -3202,7 +3292,30 @@ class Api:
             }
         }
         """
-        )
+        multipart_fields = """
+                            storagePath
+                            uploadMultipartUrls {
+                                uploadID
+                                uploadUrlParts {
+                                    partNumber
+                                    uploadUrl
+                                }
+                            }
+        """
+        # Servers without multipart uploads reject the parts in the spec, their
+        # files are uploaded with a single request instead.
+        if self.multipart_upload_introspection():
+            query_string = query_string.replace("_MULTIPART_FIELDS_", multipart_fields)
+        else:
+            query_string = query_string.replace("_MULTIPART_FIELDS_", "")
+            artifact_files = [
+                cast(
+                    "CreateArtifactFileSpecInput",
+                    {k: v for k, v in af.items() if k != "uploadPartsInput"},
+                )
+                for af in artifact_files
+            ]
+        mutation = gql(query_string)
 
         # TODO: we should use constants here from interface/artifacts.py
         # but probably don't want the dependency. We're going to remove
@@ -3225,6 +3338,61 @@ class Api:
             result[node["displayName"]] = node
         return result
 
+    @normalize_exceptions
+    def complete_multipart_upload_artifact(
+        self,
+        artifact_id: str,
+        storage_path: str,
+        completed_parts: List["UploadPartsInput"],
+        upload_id: Optional[str],
+    ) -> Optional[str]:
+        """Assemble the uploaded parts of a file into a single object.
+
+        Arguments:
+            artifact_id: The artifact the file was uploaded for
+            storage_path: The storage path returned when preparing the file
+            completed_parts: The part numbers with the ETag of each uploaded part
+            upload_id: The id of the multipart upload
+
+        Returns:
+            The digest of the assembled object
+        """
+        mutation = gql(
+            """
+        mutation CompleteMultipartUploadArtifact(
+            $completeMultipartAction: CompleteMultipartAction!,
+            $completedParts: [UploadPartsInput!]!,
+            $artifactID: ID!
+            $storagePath: String!
+            $uploadID: String!
+        ) {
+            completeMultipartUploadArtifact(
+                input: {
+                    completeMultipartAction: $completeMultipartAction,
+                    completedParts: $completedParts,
+                    artifactID: $artifactID,
+                    storagePath: $storagePath
+                    uploadID: $uploadID
+                }
+            ) {
+                digest
+            }
+        }
+        """
+        )
+        response = self.gql(
+            mutation,
+            variable_values={
+                "completeMultipartAction": "Complete",
+                "artifactID": artifact_id,
+                "storagePath": storage_path,
+                "completedParts": completed_parts,
+                "uploadID": upload_id,
+            },
+        )
+        digest: Optional[str] = response["completeMultipartUploadArtifact"]["digest"]
+        return digest
+
     @normalize_exceptions
     def notify_scriptable_run_alert(
         self,
@@ -2,7 +2,7 @@
 
 import os
 import sys
-from typing import IO, TYPE_CHECKING, Optional
+from typing import IO, TYPE_CHECKING, Optional, Union
 
 from wandb.errors import CommError
 
@@ -17,13 +17,45 @@ if TYPE_CHECKING:
             pass
 
 
+class FilePart:
+    """A read-only view of `length` bytes of a file, starting at `offset`.
+
+    Used to upload one part of a multipart upload straight from disk.
+    """
+
+    def __init__(self, file: IO[bytes], offset: int, length: int) -> None:
+        self.file = file
+        self.name = file.name
+        self.offset = offset
+        self.length = length
+        self.pos = 0
+        self.file.seek(offset)
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self.length - self.pos
+        if size < 0 or size > remaining:
+            size = remaining
+        bites = self.file.read(size)
+        self.pos += len(bites)
+        return bites
+
+    def seek(self, pos: int) -> None:
+        self.pos = pos
+        self.file.seek(self.offset + pos)
+
+    def __len__(self) -> int:
+        return self.length
+
+
 class Progress:
     """A helper class for displaying progress."""
 
     ITER_BYTES = 1024 * 1024
 
     def __init__(
-        self, file: IO[bytes], callback: Optional["ProgressFn"] = None
+        self,
+        file: Union[IO[bytes], FilePart],
+        callback: Optional["ProgressFn"] = None,
     ) -> None:
         self.file = file
         if callback is None:
@@ -35,7 +67,10 @@ class Progress:
 
         self.callback: "ProgressFn" = callback
         self.bytes_read = 0
-        self.len = os.fstat(file.fileno()).st_size
+        if isinstance(file, FilePart):
+            self.len = len(file)
+        else:
+            self.len = os.fstat(file.fileno()).st_size
 
     def read(self, size=-1):
         """Read bytes and call the callback."""
@@ -1,6 +1,12 @@
 """sample."""
 
 import math
+from array import array
+
+# typecodes of the sample buffers: integers until the first non integer
+# value is added, then doubles.
+_INT_TYPECODE = "q"
+_FLOAT_TYPECODE = "d"
 
 
 class UniformSampleAccumulator:
@@ -18,24 +24,41 @@ class UniformSampleAccumulator:
         self._buckets_bits = int(math.log(self._buckets, 2))
         self._buckets_mask = (1 << self._buckets_bits + 1) - 1
         self._buckets_index = 0
-        self._bucket = []
+        # all buckets live in one flat array, bucket b starts at b * self._max.
+        # It is allocated on the first add so idle keys stay small.
+        self._bucket = None
         self._index = [0] * self._buckets
         self._count = 0
         self._log2 = [0]
 
-        # pre-allocate buckets
-        for _ in range(self._buckets):
-            self._bucket.append([0] * self._max)
         # compute integer log2
         self._log2 += [int(math.log(i, 2)) for i in range(1, 2**self._buckets + 1)]
 
+    @property
+    def integral(self):
+        """Whether every value added so far was an integer."""
+        return self._bucket is None or self._bucket.typecode == _INT_TYPECODE
+
     def _show(self):
         print("=" * 20)
         for b in range(self._buckets):
             b = (b + self._buckets_index) % self._buckets
-            vals = [self._bucket[b][i] for i in range(self._index[b])]
+            start = b * self._max
+            vals = list(self._bucket[start : start + self._index[b]])
             print(f"{b}: {vals}")
 
+    def _store(self, pos, val):
+        if self._bucket is None:
+            typecode = _INT_TYPECODE if isinstance(val, int) else _FLOAT_TYPECODE
+            self._bucket = array(typecode, bytes(8 * self._buckets * self._max))
+        try:
+            self._bucket[pos] = val
+        except (TypeError, OverflowError):
+            # a float (or an integer too large for int64) was added to an
+            # integer buffer, widen it to doubles
+            self._bucket = array(_FLOAT_TYPECODE, self._bucket)
+            self._bucket[pos] = val
+
     def add(self, val):
         self._count += 1
         cnt = self._count
@@ -50,21 +73,22 @@ class UniformSampleAccumulator:
             self._mask = (self._mask << 1) | 1
             b += self._buckets - 1
         b = (b + self._buckets_index) % self._buckets
-        self._bucket[b][self._index[b]] = val
+        self._store(b * self._max + self._index[b], val)
         self._index[b] += 1
 
     def get(self):
-        full = []
-        sampled = []
-        # self._show()
+        if self._bucket is None:
+            return tuple()
+        full = array(self._bucket.typecode)
+        sampled = array(self._bucket.typecode)
         for b in range(self._buckets):
             max_num = 2**b
             b = (b + self._buckets_index) % self._buckets
+            start = b * self._max
+            end = start + self._index[b]
             modb = self._index[b] // max_num
-            for i in range(self._index[b]):
-                if not modb or i % modb == 0:
-                    sampled.append(self._bucket[b][i])
-                full.append(self._bucket[b][i])
+            full.extend(self._bucket[start:end])
+            sampled.extend(self._bucket[start : end : modb or 1])
         if len(sampled) < self._samples:
             return tuple(full)
         return tuple(sampled)
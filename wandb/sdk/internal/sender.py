@@ -339,6 +339,8 @@ class SendManager:
             _live_policy_wait_time=None,
             disable_job_creation=False,
             _async_upload_concurrency_limit=None,
+            _file_stream_compression=None,
+            _file_stream_max_inflight=None,
         )
         settings = SettingsStatic(sd)
         record_q: "Queue[Record]" = queue.Queue()
@@ -440,7 +442,7 @@ class SendManager:
     def send_request_sender_read(self, record: "Record") -> None:
         if self._ds is None:
             self._ds = datastore.DataStore()
-            self._ds.open_for_scan(self._settings.sync_file)
+            self._ds.open_for_scan(self._settings.sync_file, use_mmap=True)
 
         # TODO(cancel_paused): implement cancel_set logic
         # The idea is that there is an active request to cancel a
@@ -1094,6 +1096,8 @@ class SendManager:
             self._run.run_id,
             self._run.start_time.ToMicroseconds() / 1e6,
             settings=self._api_settings,
+            compression=self._settings._file_stream_compression,
+            max_inflight=self._settings._file_stream_max_inflight or 1,
         )
         # Ensure the streaming polices have the proper offsets
         self._fs.set_file_policy("wandb-summary.json", file_stream.SummaryFilePolicy())
@@ -34,6 +34,8 @@ class SettingsStatic:
     _jupyter_name: Optional[str]
     _jupyter_root: Optional[str]
     _network_buffer: Optional[int]
+    _datastore_flush_interval: Optional[float]
+    _datastore_flush_bytes: Optional[int]
     _disable_service: Optional[bool]
     _live_policy_rate_limit: Optional[int]
     resume: Optional[str]
@@ -65,6 +67,8 @@ class SettingsStatic:
     disable_job_creation: bool
     _async_upload_concurrency_limit: Optional[int]
     _extra_http_headers: Optional[Mapping[str, str]]
+    _file_stream_compression: Optional[str]
+    _file_stream_max_inflight: Optional[int]
     job_source: Optional[str]
 
     # TODO(jhr): clean this up, it is only in SettingsStatic and not in Settings
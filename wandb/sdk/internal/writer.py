@@ -68,7 +68,11 @@ class WriteManager:
 
     def open(self) -> None:
         self._ds = datastore.DataStore()
-        self._ds.open_for_write(self._settings.sync_file)
+        self._ds.open_for_write(
+            self._settings.sync_file,
+            flush_interval=self._settings._datastore_flush_interval,
+            flush_bytes=self._settings._datastore_flush_bytes,
+        )
         self._flow_control = flow_control.FlowControl(
             settings=self._settings,
             write_record=self._write_record,
@@ -203,4 +207,5 @@ class WriteManager:
         # self._context_keeper._debug_print_orphans(print_to_stdout=self._settings._debug)
 
     def debounce(self) -> None:
-        pass
+        if self._ds:
+            self._ds.flush()
@@ -19,6 +19,8 @@ _Setting = Literal[
     "_config_dict",
     "_console",
     "_cuda",
+    "_datastore_flush_bytes",
+    "_datastore_flush_interval",
     "_disable_meta",
     "_disable_service",
     "_disable_stats",
@@ -26,6 +28,8 @@ _Setting = Literal[
     "_except_exit",
     "_executable",
     "_extra_http_headers",
+    "_file_stream_compression",
+    "_file_stream_max_inflight",
     "_flow_control_custom",
     "_flow_control_disabled",
     "_internal_check_process",
@@ -49,6 +53,7 @@ _Setting = Literal[
     "_python",
     "_runqueue_item_id",
     "_save_requirements",
+    "_service_publish_batch_seconds",
     "_service_transport",
     "_service_wait",
     "_start_datetime",
@@ -157,6 +162,9 @@ _Setting = Literal[
 
 SETTINGS_TOPOLOGICALLY_SORTED: Final[Tuple[_Setting, ...]] = (
     "_async_upload_concurrency_limit",
+    "_file_stream_compression",
+    "_file_stream_max_inflight",
+    "_service_publish_batch_seconds",
     "_service_wait",
     "_stats_sample_rate_seconds",
     "_stats_samples_to_average",
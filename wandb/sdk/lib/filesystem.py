@@ -1,4 +1,5 @@
 import contextlib
+import errno
 import logging
 import os
 import platform
@@ -16,6 +17,12 @@ logger = logging.getLogger(__name__)
 
 WRITE_PERMISSIONS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH | stat.S_IWRITE
 
+# Ways copy_or_overwrite_changed can materialize a file.
+LINK_MODES = ("copy", "reflink", "hardlink", "symlink")
+
+# ioctl request cloning a whole file on Linux (btrfs, xfs, ...), from linux/fs.h
+_FICLONE = 0x40049409
+
 
 def mkdir_exists_ok(dir_name: StrPath) -> None:
     """Create `dir_name` and any parent directories if they don't exist.
@@ -84,19 +91,29 @@ class CRDedupedFile(WriteSerializingFile):
         super().close()
 
 
-def copy_or_overwrite_changed(source_path: StrPath, target_path: StrPath) -> StrPath:
+def copy_or_overwrite_changed(
+    source_path: StrPath, target_path: StrPath, mode: str = "copy"
+) -> StrPath:
     """Copy source_path to target_path, unless it already exists with the same mtime.
 
     We liberally add write permissions to deal with the case of multiple users needing
     to share the same cache or run directory.
 
+    Instead of copying, the file can share the data of source_path: "reflink" clones
+    it on filesystems with copy-on-write support, "hardlink" and "symlink" link to
+    it. Linked files are made read-only, as writing to them would change
+    source_path. Modes the filesystem doesn't support fall back to a copy.
+
     Args:
         source_path: The path to the file to copy.
         target_path: The path to copy the file to.
+        mode: One of LINK_MODES.
 
     Returns:
         The path to the copied file (which may be different from target_path).
     """
+    if mode not in LINK_MODES:
+        raise ValueError(f"Unknown link mode {mode!r}, expected one of {LINK_MODES}")
     return_type = type(target_path)
 
     if platform.system() == "Windows":
@@ -107,12 +124,20 @@ def copy_or_overwrite_changed(source_path: StrPath, target_path: StrPath) -> Str
 
     need_copy = (
         not os.path.isfile(target_path)
+        or os.path.islink(target_path) != (mode == "symlink")
         or os.stat(source_path).st_mtime != os.stat(target_path).st_mtime
     )
 
     permissions_plus_write = os.stat(source_path).st_mode | WRITE_PERMISSIONS
     if need_copy:
         mkdir_exists_ok(os.path.dirname(target_path))
+        # Never write through a link, that would change the file it points to.
+        if os.path.islink(target_path) or (
+            os.path.isfile(target_path) and os.stat(target_path).st_nlink > 1
+        ):
+            os.remove(target_path)
+        if mode != "copy" and _link(source_path, target_path, mode):
+            return return_type(target_path)  # type: ignore
         try:
             # Use copy2 to preserve file metadata (including modified time).
             shutil.copy2(source_path, target_path)
@@ -129,6 +154,45 @@ def copy_or_overwrite_changed(source_path: StrPath, target_path: StrPath) -> Str
     return return_type(target_path)  # type: ignore  # 'os.PathLike' is abstract.
 
 
+def _link(source_path: StrPath, target_path: StrPath, mode: str) -> bool:
+    """Materialize target_path from source_path without copying its data.
+
+    Returns False if the filesystem doesn't support `mode`.
+    """
+    try:
+        if os.path.lexists(target_path):
+            os.remove(target_path)
+        if mode == "reflink":
+            _reflink(source_path, target_path)
+            shutil.copystat(source_path, target_path)
+            os.chmod(target_path, os.stat(source_path).st_mode | WRITE_PERMISSIONS)
+            return True
+        if mode == "hardlink":
+            os.link(source_path, target_path)
+        else:
+            os.symlink(os.path.abspath(source_path), target_path)
+    except OSError as e:
+        logger.info("Unable to %s %s, copying it instead: %s", mode, target_path, e)
+        with contextlib.suppress(OSError):
+            if os.path.islink(target_path) or os.path.getsize(target_path) == 0:
+                os.remove(target_path)
+        return False
+    # Windows can't replace or remove read-only files, which the cache needs to do.
+    if platform.system() != "Windows":
+        os.chmod(source_path, os.stat(source_path).st_mode & ~WRITE_PERMISSIONS)
+    return True
+
+
+def _reflink(source_path: StrPath, target_path: StrPath) -> None:
+    """Clone source_path to target_path, sharing its blocks until either changes."""
+    if platform.system() != "Linux":
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are only supported on Linux")
+    import fcntl
+
+    with open(source_path, "rb") as source, open(target_path, "wb") as target:
+        fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+
+
 @contextlib.contextmanager
 def safe_open(
     path: StrPath, mode: str = "r", *args: Any, **kwargs: Any
@@ -190,3 +254,39 @@ def safe_copy(source_path: StrPath, target_path: StrPath) -> StrPath:
         shutil.copy2(source_path, tmp_path)
         tmp_path.replace(output_path)
     return target_path
+
+
+@contextlib.contextmanager
+def lock_file(path: StrPath) -> Generator[None, None, None]:
+    """Hold an exclusive lock on path, blocking until it is available.
+
+    The lock is advisory and shared by every process and thread on the host
+    that locks the same path. The operating system releases it if the holder
+    dies, so a crashed process never leaves it held.
+    """
+    mkdir_exists_ok(os.path.dirname(path) or ".")
+    with open(path, "a+b") as f:
+        if platform.system() == "Windows":
+            import msvcrt
+
+            while True:
+                f.seek(0)
+                try:
+                    # LK_LOCK gives up with an OSError after about 10 seconds.
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # type: ignore[attr-defined]
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)  # type: ignore[attr-defined]
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -1,14 +1,23 @@
 import base64
+import contextlib
 import hashlib
+import logging
+import os
+import sqlite3
 import sys
-from typing import NewType, Union
+import threading
+import time
+from typing import List, NewType, Optional, Tuple, Union
 
+from wandb.sdk.lib import filesystem
 from wandb.sdk.lib.paths import StrPath
 
 ETag = NewType("ETag", str)
 HexMD5 = NewType("HexMD5", str)
 B64MD5 = NewType("B64MD5", str)
 
+logger = logging.getLogger(__name__)
+
 
 def _md5(data: bytes = b"") -> "hashlib._Hash":
     """Allow FIPS-compliant md5 hash when supported."""
@@ -52,3 +61,169 @@ def _md5_file_hasher(*paths: StrPath) -> "hashlib._Hash":
             for chunk in iter(lambda: f.read(64 * 1024), b""):
                 md5_hash.update(chunk)
     return md5_hash
+
+
+def copy_file_md5_b64(source: StrPath, target: StrPath) -> B64MD5:
+    """Copy source to target and return the MD5 of the copied data.
+
+    The data is hashed as it is written, so source is only read once.
+    """
+    md5_hash = _md5()
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        for chunk in iter(lambda: src.read(1024 * 1024), b""):
+            md5_hash.update(chunk)
+            dst.write(chunk)
+    return _b64_from_hasher(md5_hash)
+
+
+class ChecksumCache:
+    """Persistent cache of file MD5s.
+
+    Digests are keyed by the file path together with its inode, size and
+    modification time, so a file is only hashed again after it changed.
+    The cache is a sqlite database shared by all processes; if it can't be
+    used, lookups miss and everything is hashed as before.
+    """
+
+    # files modified this recently are not cached: a change in the same
+    # mtime tick as the hash would go unnoticed
+    RACY_SECONDS = 2.0
+    # pending digests are written in transactions of this size
+    COMMIT_EVERY = 1000
+
+    def __init__(self, db_path: StrPath) -> None:
+        self._db_path = os.fspath(db_path)
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, int, int, int, str]] = []
+        self._failed = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        # called with self._lock held
+        if self._db is None and not self._failed:
+            try:
+                db = sqlite3.connect(self._db_path, timeout=10, check_same_thread=False)
+                # The artifacts cache may be shared over NFS, where WAL doesn't
+                # work. Switch back databases created in WAL mode.
+                db.execute("PRAGMA journal_mode=DELETE")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS checksums (path TEXT PRIMARY KEY,"
+                    " inode INTEGER, size INTEGER, mtime_ns INTEGER, md5 TEXT)"
+                )
+                db.commit()
+                self._db = db
+            except sqlite3.Error as e:
+                logger.warning(f"Checksum cache {self._db_path} disabled: {e}")
+                self._failed = True
+        return self._db
+
+    @staticmethod
+    def _key(path: StrPath, stat: os.stat_result) -> Tuple[str, int, int, int]:
+        return os.path.abspath(path), stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def get(self, path: StrPath, stat: os.stat_result) -> Optional[B64MD5]:
+        """Return the cached digest of path if it still matches stat."""
+        key = self._key(path, stat)
+        with self._lock:
+            for pending in reversed(self._pending):
+                if pending[:4] == key:
+                    return B64MD5(pending[4])
+            db = self._connect()
+            if db is None:
+                return None
+            try:
+                row = db.execute(
+                    "SELECT md5 FROM checksums"
+                    " WHERE path=? AND inode=? AND size=? AND mtime_ns=?",
+                    key,
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+        return B64MD5(row[0]) if row else None
+
+    def put(self, path: StrPath, stat: os.stat_result, md5: B64MD5) -> None:
+        """Remember the digest of path, as of stat."""
+        if time.time() - stat.st_mtime < self.RACY_SECONDS:
+            return
+        with self._lock:
+            self._pending.append(self._key(path, stat) + (md5,))
+            if len(self._pending) < self.COMMIT_EVERY:
+                return
+        self.flush()
+
+    def put_written(self, path: StrPath, md5: B64MD5) -> None:
+        """Remember the digest of a file that was just written with known content.
+
+        Unlike `put`, recently modified files are recorded, since the digest
+        comes from the data that was written rather than from a read racing
+        with the writer.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            self._pending.append(self._key(path, stat) + (md5,))
+            if len(self._pending) < self.COMMIT_EVERY:
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """Write pending digests to the database."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            db = self._connect()
+            if not pending or db is None:
+                return
+            try:
+                with db:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO checksums VALUES (?, ?, ?, ?, ?)",
+                        pending,
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Unable to update checksum cache: {e}")
+
+    def md5_file_b64(self, path: StrPath) -> B64MD5:
+        """Return the MD5 of path, hashing it only if it changed."""
+        stat = os.stat(path)
+        md5 = self.get(path, stat)
+        if md5 is None:
+            md5 = md5_file_b64(path)
+            if _same_file_version(os.stat(path), stat):
+                self.put(path, stat, md5)
+        return md5
+
+    def md5_copy_b64(
+        self, path: StrPath, stat: os.stat_result, copy_path: StrPath
+    ) -> B64MD5:
+        """Copy path to copy_path and return the MD5 of the copy.
+
+        stat is the stat of path before the copy. If the digest of path is
+        cached, the copy is a reflink where the filesystem supports it, so no
+        data is read. Otherwise the copy is hashed as it is written.
+        """
+        md5 = self.get(path, stat)
+        if md5 is None:
+            md5 = copy_file_md5_b64(path, copy_path)
+            if _same_file_version(os.stat(path), stat):
+                self.put(path, stat, md5)
+            return md5
+        # copy_or_overwrite_changed skips targets that look up to date
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(copy_path)
+        filesystem.copy_or_overwrite_changed(path, copy_path, mode="reflink")
+        if not _same_file_version(os.stat(path), stat):
+            md5 = md5_file_b64(copy_path)
+        return md5
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def _same_file_version(a: os.stat_result, b: os.stat_result) -> bool:
+    return (a.st_ino, a.st_size, a.st_mtime_ns) == (b.st_ino, b.st_size, b.st_mtime_ns)
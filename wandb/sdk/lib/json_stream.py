@@ -0,0 +1,112 @@
+"""Incremental parsing of large JSON documents."""
+
+import json
+import re
+from typing import Any, Container, Iterable, Iterator, Tuple
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_START = "-0123456789"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class _Reader:
+    """Decodes JSON values from a stream of text chunks."""
+
+    def __init__(self, chunks: Iterable[str]) -> None:
+        self._chunks = iter(chunks)
+        self._buf = ""
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, returns False at the end."""
+        for chunk in self._chunks:
+            if chunk:
+                self._buf = self._buf[self._pos :] + chunk
+                self._pos = 0
+                return True
+        return False
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or "" at the end."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number cut off by the end of the buffer can still be valid, e.g.
+            # "1" of "1.5", check it doesn't continue in the next chunk.
+            if (
+                self._buf[self._pos] in _NUMBER_START
+                and (end == len(self._buf) or self._buf[end] in _NUMBER_CHARS)
+                and self._fill()
+            ):
+                continue
+            self._pos = end
+            return value
+
+
+def _iter_items(
+    reader: _Reader, stream_keys: Container[str] = ()
+) -> Iterator[Tuple[str, Any]]:
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.expect("}")
+        return
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError(f"Expected an object key but found {key!r}")
+        reader.expect(":")
+        if key in stream_keys:
+            nested = _iter_items(reader)
+            yield key, nested
+            # skip whatever the caller didn't consume
+            for _ in nested:
+                pass
+        else:
+            yield key, reader.value()
+        if reader.peek() == "}":
+            reader.expect("}")
+            return
+        reader.expect(",")
+
+
+def iter_object_items(
+    chunks: Iterable[str], stream_keys: Container[str] = ()
+) -> Iterator[Tuple[str, Any]]:
+    """Parse a JSON object from chunks of its text, yielding one item at a time.
+
+    Values of the keys in stream_keys must be objects themselves. Instead of
+    being decoded, they are yielded as iterators over their own items, which
+    are parsed as the iterator advances. Only a single item of such an object
+    is held in memory at a time.
+
+    Arguments:
+        chunks: The text of the document, split anywhere.
+        stream_keys: Keys of the top-level object whose values are streamed.
+
+    Raises:
+        ValueError: If the text isn't a JSON object.
+    """
+    reader = _Reader(chunks)
+    yield from _iter_items(reader, stream_keys)
+    if reader.peek():
+        raise ValueError("Extra data after the JSON object")
@@ -1,3 +1,5 @@
+import atexit
+import logging
 import socket
 import struct
 import threading
@@ -5,6 +7,8 @@ import time
 import uuid
 from typing import TYPE_CHECKING, Any, List, Optional
 
+from google.protobuf.internal.encoder import _VarintBytes  # type: ignore
+
 from wandb.proto import wandb_server_pb2 as spb
 
 from . import tracelog
@@ -13,6 +17,12 @@ if TYPE_CHECKING:
     from wandb.proto import wandb_internal_pb2 as pb
 
 
+logger = logging.getLogger("wandb")
+
+# ServerRequest.record_publish is field 1 with wire type 2 (length delimited)
+_RECORD_PUBLISH_TAG = b"\x0a"
+
+
 class SockClientClosedError(Exception):
     """Socket has been closed."""
 
@@ -20,62 +30,73 @@ class SockClientClosedError(Exception):
 
 
 class SockBuffer:
-    _buf_list: List[bytes]
-    _buf_lengths: List[int]
-    _buf_total: int
+    """Receive buffer for the framed messages read from a socket.
 
-    def __init__(self) -> None:
-        self._buf_list = []
-        self._buf_lengths = []
-        self._buf_total = 0
+    Data is received directly into a reusable bytearray and frames are
+    returned as memoryview slices of it, without copying. A returned slice
+    is only valid until more data is added to the buffer.
+    """
+
+    _buf: bytearray
+    _head: int
+    _tail: int
+
+    def __init__(self, size: int = 65536) -> None:
+        self._buf = bytearray(size)
+        self._head = 0
+        self._tail = 0
 
     @property
     def length(self) -> int:
-        return self._buf_total
-
-    def _get(self, start: int, end: int, peek: bool = False) -> bytes:
-        index: Optional[int] = None
-        buffers = []
-        need = end
-
-        # compute buffers needed
-        for i, (buf_len, buf_data) in enumerate(zip(self._buf_lengths, self._buf_list)):
-            buffers.append(buf_data[:need] if need < buf_len else buf_data)
-            if need <= buf_len:
-                index = i
-                break
-            need -= buf_len
+        return self._tail - self._head
 
+    def _get(self, start: int, end: int, peek: bool = False) -> memoryview:
         # buffer not large enough, caller should have made sure there was enough data
-        if index is None:
+        if end > self.length:
             raise IndexError("SockBuffer index out of range")
+        data = memoryview(self._buf)[self._head + start : self._head + end]
 
         # advance buffer internals if we are not peeking into the data
         if not peek:
-            self._buf_total -= end
-            if need < buf_len:
-                # update partially used buffer list
-                self._buf_list = self._buf_list[index:]
-                self._buf_lengths = self._buf_lengths[index:]
-                self._buf_list[0] = self._buf_list[0][need:]
-                self._buf_lengths[0] -= need
-            else:
-                # update fully used buffer list
-                self._buf_list = self._buf_list[index + 1 :]
-                self._buf_lengths = self._buf_lengths[index + 1 :]
-
-        return b"".join(buffers)[start:end]
-
-    def get(self, start: int, end: int) -> bytes:
+            self._head += end
+            if self._head == self._tail:
+                self._head = self._tail = 0
+        return data
+
+    def get(self, start: int, end: int) -> memoryview:
         return self._get(start, end)
 
-    def peek(self, start: int, end: int) -> bytes:
+    def peek(self, start: int, end: int) -> memoryview:
         return self._get(start, end, peek=True)
 
+    def _reserve(self, size: int) -> None:
+        """Make room for size bytes after the buffered data."""
+        if self._tail + size <= len(self._buf):
+            return
+        length = self.length
+        if length + size > len(self._buf):
+            # replace rather than resize, the old buffer may still be viewed
+            buf = bytearray(max(len(self._buf) * 2, length + size))
+            buf[:length] = self._buf[self._head : self._tail]
+            self._buf = buf
+        else:
+            # move the unread data to the front
+            self._buf[:length] = self._buf[self._head : self._tail]
+        self._head = 0
+        self._tail = length
+
     def put(self, data: bytes, data_len: int) -> None:
-        self._buf_list.append(data)
-        self._buf_lengths.append(data_len)
-        self._buf_total += data_len
+        self._reserve(data_len)
+        self._buf[self._tail : self._tail + data_len] = data[:data_len]
+        self._tail += data_len
+
+    def recv_into(self, sock: socket.socket, size: int) -> int:
+        """Receive up to size bytes from sock directly into the buffer."""
+        self._reserve(size)
+        with memoryview(self._buf) as view:
+            data_len = sock.recv_into(view[self._tail : self._tail + size])
+        self._tail += data_len
+        return data_len
 
 
 class SockClient:
@@ -85,9 +106,16 @@ class SockClient:
     _lock: "threading.Lock"
     _bufsize: int
     _buffer: SockBuffer
+    _batch: List[bytes]
+    _batch_bytes: int
+    _batch_time: float
+    _batch_seconds: Optional[float]
+    _batch_cond: "threading.Condition"
 
     # current header is magic byte "W" followed by 4 byte length of the message
     HEADLEN = 1 + 4
+    # published messages are sent once this many bytes are batched
+    BATCH_MAX_BYTES = 256 * 1024
 
     def __init__(self) -> None:
         # TODO: use safe uuid's (python3.7+) or emulate this
@@ -96,6 +124,11 @@ class SockClient:
         self._lock = threading.Lock()
         self._bufsize = 4096
         self._buffer = SockBuffer()
+        self._batch = []
+        self._batch_bytes = 0
+        self._batch_time = 0.0
+        self._batch_seconds = None
+        self._batch_cond = threading.Condition(self._lock)
 
     def connect(self, port: int) -> None:
         s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -124,16 +157,15 @@ class SockClient:
         # an error handling in case of timeout.
         total_sent = 0
         total_data = len(data)
+        view = memoryview(data)
         while total_sent < total_data:
             start_time = time.monotonic()
             try:
-                sent = self._sock.send(data)
+                sent = self._sock.send(view[total_sent:])
                 # sent equal to 0 indicates a closed socket
                 if sent == 0:
                     raise SockClientClosedError("socket connection broken")
                 total_sent += sent
-                # truncate our data to save memory
-                data = data[sent:]
             # we handle the timeout case for the cases when timeout is set
             # on a system level by another application
             except socket.timeout:
@@ -142,6 +174,59 @@ class SockClient:
                 if delta_time < self._retry_delay:
                     time.sleep(self._retry_delay - delta_time)
 
+    def enable_publish_batching(self, seconds: float) -> None:
+        """Batch published records for up to seconds before sending them.
+
+        Published records are framed as usual but sent together, with one
+        socket write per batch. A batch is sent when it grows over
+        BATCH_MAX_BYTES, when seconds have passed since its first record, on
+        flush(), and before any other message so ordering is preserved.
+        """
+        with self._lock:
+            if self._batch_seconds is not None:
+                self._batch_seconds = seconds
+                return
+            self._batch_seconds = seconds
+        thread = threading.Thread(target=self._batch_thread_body)
+        thread.name = "SockClientBatch"
+        thread.daemon = True
+        thread.start()
+        atexit.register(self.flush)
+
+    def _batch_thread_body(self) -> None:
+        with self._batch_cond:
+            while True:
+                while not self._batch:
+                    self._batch_cond.wait()
+                assert self._batch_seconds is not None
+                remaining = self._batch_time + self._batch_seconds - time.monotonic()
+                if remaining > 0:
+                    self._batch_cond.wait(remaining)
+                    continue
+                try:
+                    self._send_batch()
+                except (OSError, SockClientClosedError) as e:
+                    # the next message sent by the caller will raise as well
+                    logger.warning(f"Unable to send batched records: {e}")
+
+    def _send_batch(self, data: bytes = b"") -> None:
+        # called with self._lock held
+        if self._batch:
+            self._batch.append(data)
+            data = b"".join(self._batch)
+            self._batch = []
+            self._batch_bytes = 0
+        if data:
+            self._sendall_with_error_handle(data)
+
+    def flush(self) -> None:
+        """Send batched records now."""
+        with self._lock:
+            try:
+                self._send_batch()
+            except (OSError, SockClientClosedError) as e:
+                logger.warning(f"Unable to send batched records: {e}")
+
     def _send_message(self, msg: Any) -> None:
         tracelog.log_message_send(msg, self._sockid)
         raw_size = msg.ByteSize()
@@ -149,7 +234,8 @@ class SockClient:
         assert len(data) == raw_size, "invalid serialization"
         header = struct.pack("<BI", ord("W"), raw_size)
         with self._lock:
-            self._sendall_with_error_handle(header + data)
+            # batched records go out first, in the same write
+            self._send_batch(header + data)
 
     def send_server_request(self, msg: Any) -> None:
         self._send_message(msg)
@@ -216,11 +302,28 @@ class SockClient:
         self.send_server_request(server_req)
 
     def send_record_publish(self, record: "pb.Record") -> None:
-        server_req = spb.ServerRequest()
-        server_req.record_publish.CopyFrom(record)
-        self.send_server_request(server_req)
-
-    def _extract_packet_bytes(self) -> Optional[bytes]:
+        if self._batch_seconds is None:
+            server_req = spb.ServerRequest()
+            server_req.record_publish.CopyFrom(record)
+            self.send_server_request(server_req)
+            return
+
+        tracelog.log_message_send(record, self._sockid)
+        # serialize the ServerRequest by hand to avoid copying the record
+        record_data = record.SerializeToString()
+        data = _RECORD_PUBLISH_TAG + _VarintBytes(len(record_data)) + record_data
+        header = struct.pack("<BI", ord("W"), len(data))
+        with self._batch_cond:
+            if not self._batch:
+                self._batch_time = time.monotonic()
+                self._batch_cond.notify()
+            self._batch.append(header)
+            self._batch.append(data)
+            self._batch_bytes += len(header) + len(data)
+            if self._batch_bytes >= self.BATCH_MAX_BYTES:
+                self._send_batch()
+
+    def _extract_packet_bytes(self) -> Optional[memoryview]:
         # Do we have enough data to read the header?
         start_offset = self.HEADLEN
         if self._buffer.length >= start_offset:
@@ -235,9 +338,11 @@ class SockClient:
                 return rec_data
         return None
 
-    def _read_packet_bytes(self, timeout: Optional[int] = None) -> Optional[bytes]:
+    def _read_packet_bytes(self, timeout: Optional[int] = None) -> Optional[memoryview]:
         """Read full message from socket.
 
+        The message is a view into the receive buffer, valid until the next read.
+
         Args:
             timeout: number of seconds to wait on socket data.
 
@@ -252,7 +357,7 @@ class SockClient:
             if timeout:
                 self._sock.settimeout(timeout)
             try:
-                data = self._sock.recv(self._bufsize)
+                data_len = self._buffer.recv_into(self._sock, self._bufsize)
             except socket.timeout:
                 break
             except ConnectionResetError:
@@ -262,12 +367,10 @@ class SockClient:
             finally:
                 if timeout:
                     self._sock.settimeout(None)
-            data_len = len(data)
             if data_len == 0:
                 # socket.recv() will return 0 bytes if socket was shutdown
                 # caller will handle this condition like other connection problems
                 raise SockClientClosedError
-            self._buffer.put(data, data_len)
         return None
 
     def read_server_request(self) -> Optional[spb.ServerRequest]:
@@ -1,10 +1,13 @@
+import asyncio
 import base64
+import concurrent.futures
 import contextlib
 import json
 import os
 import re
 import shutil
 import tempfile
+import threading
 import time
 from pathlib import PurePosixPath
 from types import ModuleType
@@ -12,8 +15,10 @@ from typing import (
     IO,
     TYPE_CHECKING,
     Any,
+    Callable,
     Dict,
     Generator,
+    Iterable,
     List,
     Mapping,
     Optional,
@@ -79,7 +84,11 @@ if TYPE_CHECKING:
     import google.cloud.storage as gcs_module  # type: ignore
 
     import wandb.apis.public
-    from wandb.filesync.step_prepare import StepPrepare
+    from wandb.filesync.step_prepare import ResponsePrepare, StepPrepare
+    from wandb.sdk.internal.internal_api import (
+        CreateArtifactFileSpecInput,
+        UploadPartsInput,
+    )
 
 # This makes the first sleep 1s, and then doubles it up to total times,
 # which makes for ~18 hours.
@@ -93,6 +102,77 @@ _REQUEST_POOL_CONNECTIONS = 64
 
 _REQUEST_POOL_MAXSIZE = 64
 
+# Threads copying and hashing local files. hashlib releases the GIL, so this
+# scales with the number of cores.
+_HASH_THREADS = min(32, (os.cpu_count() or 1) + 4)
+
+# Files at least this large are uploaded in parts when the server supports it.
+# Object stores cap multipart uploads at 10,000 parts and 5 TiB in total.
+_MULTIPART_MIN_SIZE = 2 * 1024**3
+_MULTIPART_MAX_SIZE = 5 * 1024**4
+_MULTIPART_MAX_PARTS = 10000
+_MULTIPART_PART_SIZE = 100 * 1024**2
+
+# Parts of a single file that are uploaded at the same time.
+_MULTIPART_THREADS = 8
+
+# Files at least this large are downloaded with concurrent range requests,
+# each fetching one part of the file.
+_RANGED_DOWNLOAD_MIN_SIZE = 64 * 1024**2
+_RANGED_DOWNLOAD_PART_SIZE = 16 * 1024**2
+
+# Parts of a single file that are downloaded at the same time.
+_RANGED_DOWNLOAD_THREADS = 8
+
+_PARTIAL_SUFFIX = ".partial"
+
+
+class _DownloadBudget:
+    """Connections and bandwidth shared by all artifact file downloads.
+
+    Every download request holds one of `connections` slots while it runs,
+    and the bytes received are paced to `bytes_per_second` if it is set.
+    """
+
+    def __init__(self, connections: int, bytes_per_second: Optional[int]) -> None:
+        self._connections = threading.BoundedSemaphore(connections)
+        self._bytes_per_second = bytes_per_second
+        self._lock = threading.Lock()
+        self._next_time = time.monotonic()
+
+    @contextlib.contextmanager
+    def connection(self) -> Generator[None, None, None]:
+        with self._connections:
+            yield
+
+    def consume(self, nbytes: int) -> None:
+        if not self._bytes_per_second:
+            return
+        with self._lock:
+            now = time.monotonic()
+            # allow up to a second of bandwidth to accumulate while idle
+            self._next_time = (
+                max(self._next_time, now - 1) + nbytes / self._bytes_per_second
+            )
+            delay = self._next_time - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+_download_budget: Optional[_DownloadBudget] = None
+
+
+def _get_download_budget() -> _DownloadBudget:
+    global _download_budget
+    if _download_budget is None:
+        _download_budget = _DownloadBudget(
+            env.get_artifact_download_connections(default=_REQUEST_POOL_MAXSIZE)
+            or _REQUEST_POOL_MAXSIZE,
+            env.get_artifact_download_bandwidth(),
+        )
+    return _download_budget
+
+
 ARTIFACT_TMP = tempfile.TemporaryDirectory("wandb-artifacts")
 
 
@@ -459,13 +539,10 @@ class Artifact(ArtifactInterface):
             logical_path, physical_path = log_phy_path
             self._add_local_file(logical_path, physical_path)
 
-        import multiprocessing.dummy  # this uses threads
-
-        num_threads = 8
-        pool = multiprocessing.dummy.Pool(num_threads)
-        pool.map(add_manifest_file, paths)
-        pool.close()
-        pool.join()
+        with concurrent.futures.ThreadPoolExecutor(_HASH_THREADS) as executor:
+            for _ in executor.map(add_manifest_file, paths):
+                pass
+        get_artifacts_cache().checksums.flush()
 
         termlog("Done. %.1fs" % (time.time() - start_time), prefix=False)
 
@@ -730,14 +807,21 @@ class Artifact(ArtifactInterface):
     def _add_local_file(
         self, name: StrPath, path: StrPath, digest: Optional[B64MD5] = None
     ) -> ArtifactManifestEntry:
+        stat = os.stat(path)
         with tempfile.NamedTemporaryFile(dir=get_staging_dir(), delete=False) as f:
             staging_path = f.name
+        if digest is None:
+            # Hash the file while staging it, so it's only read once.
+            digest = get_artifacts_cache().checksums.md5_copy_b64(
+                path, stat, staging_path
+            )
+        else:
             shutil.copyfile(path, staging_path)
-            os.chmod(staging_path, 0o400)
+        os.chmod(staging_path, 0o400)
 
         entry = ArtifactManifestEntry(
             path=name,
-            digest=digest or md5_file_b64(staging_path),
+            digest=digest,
             local_path=staging_path,
         )
 
@@ -769,8 +853,14 @@ class ArtifactManifestV1(ArtifactManifest):
                 % storage_policy_name
             )
 
-        entries: Mapping[str, ArtifactManifestEntry]
-        entries = {
+        entries = cls.entries_from_json(manifest_json["contents"].items())
+        return cls(storage_policy_cls.from_config(storage_policy_config), entries)
+
+    @classmethod
+    def entries_from_json(
+        cls, contents: Iterable[Tuple[str, Dict]]
+    ) -> Dict[str, ArtifactManifestEntry]:
+        return {
             name: ArtifactManifestEntry(
                 path=name,
                 digest=val["digest"],
@@ -780,11 +870,9 @@ class ArtifactManifestV1(ArtifactManifest):
                 extra=val.get("extra"),
                 local_path=val.get("local_path"),
             )
-            for name, val in manifest_json["contents"].items()
+            for name, val in contents
         }
 
-        return cls(storage_policy_cls.from_config(storage_policy_config), entries)
-
     def __init__(
         self,
         storage_policy: "WandbStoragePolicy",
@@ -800,20 +888,10 @@ class ArtifactManifestV1(ArtifactManifest):
         system. We don't need to include the local paths in the artifact manifest
         contents.
         """
-        contents = {}
-        for entry in sorted(self.entries.values(), key=lambda k: k.path):
-            json_entry: Dict[str, Any] = {
-                "digest": entry.digest,
-            }
-            if entry.birth_artifact_id:
-                json_entry["birthArtifactID"] = entry.birth_artifact_id
-            if entry.ref:
-                json_entry["ref"] = entry.ref
-            if entry.extra:
-                json_entry["extra"] = entry.extra
-            if entry.size is not None:
-                json_entry["size"] = entry.size
-            contents[entry.path] = json_entry
+        contents = {
+            entry.path: self._entry_json(entry)
+            for entry in sorted(self.entries.values(), key=lambda k: k.path)
+        }
         return {
             "version": self.__class__.version(),
             "storagePolicy": self.storage_policy.name(),
@@ -821,6 +899,46 @@ class ArtifactManifestV1(ArtifactManifest):
             "contents": contents,
         }
 
+    def write_manifest_json(self, fp: IO[str]) -> None:
+        """Write the manifest JSON to fp, one entry at a time.
+
+        The output is the same as `json.dump(self.to_manifest_json(), fp, indent=4)`
+        without the JSON of every entry being built in memory first.
+        """
+        header = json.dumps(
+            {
+                "version": self.__class__.version(),
+                "storagePolicy": self.storage_policy.name(),
+                "storagePolicyConfig": self.storage_policy.config() or {},
+                "contents": {},
+            },
+            indent=4,
+        )
+        # Strip the empty contents and the closing brace, entries go there.
+        fp.write(header[: -len("{}\n}")] + "{")
+        separator = "\n"
+        for entry in sorted(self.entries.values(), key=lambda k: k.path):
+            entry_json = json.dumps(self._entry_json(entry), indent=4)
+            fp.write(separator + " " * 8 + json.dumps(entry.path) + ": ")
+            fp.write(entry_json.replace("\n", "\n" + " " * 8))
+            separator = ",\n"
+        fp.write("\n    }\n}" if self.entries else "}\n}")
+
+    @staticmethod
+    def _entry_json(entry: ArtifactManifestEntry) -> Dict[str, Any]:
+        json_entry: Dict[str, Any] = {
+            "digest": entry.digest,
+        }
+        if entry.birth_artifact_id:
+            json_entry["birthArtifactID"] = entry.birth_artifact_id
+        if entry.ref:
+            json_entry["ref"] = entry.ref
+        if entry.extra:
+            json_entry["extra"] = entry.extra
+        if entry.size is not None:
+            json_entry["size"] = entry.size
+        return json_entry
+
     def digest(self) -> HexMD5:
         hasher = _md5()
         hasher.update(b"wandb-artifact-manifest-v1\n")
@@ -894,18 +1012,126 @@ class WandbStoragePolicy(StoragePolicy):
         if hit:
             return path
 
-        response = self._session.get(
-            self._file_url(self._api, artifact.entity, manifest_entry),
-            auth=("api", self._api.api_key),
-            stream=True,
-        )
-        response.raise_for_status()
+        with self._cache.fill_lock(path):
+            # Another process may have downloaded it while we waited.
+            path, hit, cache_open = self._cache.check_md5_obj_path(
+                B64MD5(manifest_entry.digest),
+                manifest_entry.size if manifest_entry.size is not None else 0,
+            )
+            if hit:
+                return path
+
+            url = self._file_url(self._api, artifact.entity, manifest_entry)
+            budget = _get_download_budget()
+            size = manifest_entry.size or 0
+            if size >= _RANGED_DOWNLOAD_MIN_SIZE:
+                partial_path = path + _PARTIAL_SUFFIX
+                with self._cache.writing_temp_files(
+                    partial_path, partial_path + ".json", partial_path + ".json.tmp"
+                ):
+                    self._load_file_ranged(url, path, size)
+                return path
 
-        with cache_open(mode="wb") as file:
-            for data in response.iter_content(chunk_size=16 * 1024):
-                file.write(data)
+            with budget.connection():
+                response = self._session.get(
+                    url, auth=("api", self._api.api_key), stream=True
+                )
+                response.raise_for_status()
+
+                with cache_open(mode="wb") as file:
+                    for data in response.iter_content(chunk_size=16 * 1024):
+                        budget.consume(len(data))
+                        file.write(data)
         return path
 
+    def _load_file_ranged(self, url: str, path: str, size: int) -> None:
+        """Download a large file into the cache with concurrent range requests.
+
+        The parts are written into a preallocated `.partial` file next to the
+        cache entry. The parts that completed are recorded next to it, so an
+        interrupted download resumes where it stopped.
+        """
+        budget = _get_download_budget()
+        partial_path = path + _PARTIAL_SUFFIX
+        state_path = partial_path + ".json"
+        part_size = _RANGED_DOWNLOAD_PART_SIZE
+        nparts = -(-size // part_size)
+
+        done = set()
+        if os.path.exists(partial_path) and os.path.getsize(partial_path) == size:
+            try:
+                with open(state_path) as f:
+                    state = json.load(f)
+                if state["size"] == size and state["part_size"] == part_size:
+                    done = set(state["done"])
+            except (OSError, ValueError, KeyError):
+                pass
+        if not done:
+            with open(partial_path, "wb") as f:
+                f.truncate(size)
+
+        lock = threading.Lock()
+
+        def save_state() -> None:
+            tmp_path = state_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"size": size, "part_size": part_size, "done": list(done)}, f)
+            os.replace(tmp_path, state_path)
+
+        def fetch(index: int) -> bool:
+            """Download one part, returns False if the server ignored the range."""
+            start = index * part_size
+            end = min(start + part_size, size)
+            with budget.connection():
+                response = self._session.get(
+                    url,
+                    auth=("api", self._api.api_key),
+                    headers={"Range": f"bytes={start}-{end - 1}"},
+                    stream=True,
+                )
+                response.raise_for_status()
+                if response.status_code != 206:
+                    if start != 0:
+                        raise CommError(f"Range requests are not supported for {url}")
+                    # the whole file is in the body, keep it
+                    start, end = 0, size
+                with open(partial_path, "r+b") as f:
+                    f.seek(start)
+                    for data in response.iter_content(chunk_size=1024 * 1024):
+                        budget.consume(len(data))
+                        f.write(data)
+                    if f.tell() != end:
+                        raise CommError(
+                            f"Expected {end - start} bytes of {url} but received {f.tell() - start}"
+                        )
+            if response.status_code != 206:
+                return False
+            with lock:
+                done.add(index)
+                save_state()
+            return True
+
+        pending = [index for index in range(nparts) if index not in done]
+        # The first part tells whether the server supports range requests.
+        if pending and not done and not fetch(pending.pop(0)):
+            pending = []
+        with concurrent.futures.ThreadPoolExecutor(
+            _RANGED_DOWNLOAD_THREADS
+        ) as executor:
+            futures = [executor.submit(fetch, index) for index in pending]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        with open(partial_path, "rb+") as f:
+            os.fsync(f.fileno())
+        self._cache.fill_obj(path, partial_path)
+        self._cache.remove_temp_files(state_path, state_path + ".tmp")
+
     def store_reference(
         self,
         artifact: ArtifactInterface,
@@ -965,14 +1191,18 @@ class WandbStoragePolicy(StoragePolicy):
             True if the file was a duplicate (did not need to be uploaded),
             False if it needed to be uploaded or was a reference (nothing to dedupe).
         """
-        resp = preparer.prepare_sync(
-            {
-                "artifactID": artifact_id,
-                "artifactManifestID": artifact_manifest_id,
-                "name": entry.path,
-                "md5": entry.digest,
-            }
-        ).get()
+        upload_parts = self._prepare_upload_parts(entry)
+        file_spec: "CreateArtifactFileSpecInput" = {
+            "artifactID": artifact_id,
+            "artifactManifestID": artifact_manifest_id,
+            "name": entry.path,
+            "md5": entry.digest,
+        }
+        if upload_parts is not None:
+            file_spec["uploadPartsInput"] = upload_parts
+        resp = preparer.prepare_sync(file_spec).get()
+        if isinstance(resp, Exception):
+            raise resp
 
         entry.birth_artifact_id = resp.birth_artifact_id
         if resp.upload_url is None:
@@ -980,17 +1210,28 @@ class WandbStoragePolicy(StoragePolicy):
         if entry.local_path is None:
             return False
 
-        with open(entry.local_path, "rb") as file:
-            # This fails if we don't send the first byte before the signed URL expires.
-            self._api.upload_file_retry(
-                resp.upload_url,
-                file,
+        extra_headers = {
+            header.split(":", 1)[0]: header.split(":", 1)[1]
+            for header in (resp.upload_headers or {})
+        }
+        if upload_parts is not None and resp.multipart_upload_urls:
+            self._upload_multipart(
+                artifact_id,
+                entry,
+                upload_parts,
+                resp,
                 progress_callback,
-                extra_headers={
-                    header.split(":", 1)[0]: header.split(":", 1)[1]
-                    for header in (resp.upload_headers or {})
-                },
+                extra_headers,
             )
+        else:
+            with open(entry.local_path, "rb") as file:
+                # This fails if we don't send the first byte before the signed URL expires.
+                self._api.upload_file_retry(
+                    resp.upload_url,
+                    file,
+                    progress_callback,
+                    extra_headers=extra_headers,
+                )
         self._write_cache(entry)
 
         return False
@@ -1004,14 +1245,19 @@ class WandbStoragePolicy(StoragePolicy):
         progress_callback: Optional["progress.ProgressFn"] = None,
     ) -> bool:
         """Async equivalent to `store_file_sync`."""
-        resp = await preparer.prepare_async(
-            {
-                "artifactID": artifact_id,
-                "artifactManifestID": artifact_manifest_id,
-                "name": entry.path,
-                "md5": entry.digest,
-            }
+        loop = asyncio.get_event_loop()
+        upload_parts = await loop.run_in_executor(
+            None, self._prepare_upload_parts, entry
         )
+        file_spec: "CreateArtifactFileSpecInput" = {
+            "artifactID": artifact_id,
+            "artifactManifestID": artifact_manifest_id,
+            "name": entry.path,
+            "md5": entry.digest,
+        }
+        if upload_parts is not None:
+            file_spec["uploadPartsInput"] = upload_parts
+        resp = await preparer.prepare_async(file_spec)
 
         entry.birth_artifact_id = resp.birth_artifact_id
         if resp.upload_url is None:
@@ -1019,34 +1265,210 @@ class WandbStoragePolicy(StoragePolicy):
         if entry.local_path is None:
             return False
 
-        with open(entry.local_path, "rb") as file:
-            # This fails if we don't send the first byte before the signed URL expires.
-            await self._api.upload_file_retry_async(
-                resp.upload_url,
-                file,
+        extra_headers = {
+            header.split(":", 1)[0]: header.split(":", 1)[1]
+            for header in (resp.upload_headers or {})
+        }
+        if upload_parts is not None and resp.multipart_upload_urls:
+            await loop.run_in_executor(
+                None,
+                self._upload_multipart,
+                artifact_id,
+                entry,
+                upload_parts,
+                resp,
                 progress_callback,
-                extra_headers={
-                    header.split(":", 1)[0]: header.split(":", 1)[1]
-                    for header in (resp.upload_headers or {})
-                },
+                extra_headers,
             )
+        else:
+            with open(entry.local_path, "rb") as file:
+                # This fails if we don't send the first byte before the signed URL expires.
+                await self._api.upload_file_retry_async(
+                    resp.upload_url,
+                    file,
+                    progress_callback,
+                    extra_headers=extra_headers,
+                )
 
         self._write_cache(entry)
 
         return False
 
+    @staticmethod
+    def _part_size(file_size: int) -> int:
+        return max(_MULTIPART_PART_SIZE, -(-file_size // _MULTIPART_MAX_PARTS))
+
+    def _prepare_upload_parts(
+        self, entry: ArtifactManifestEntry
+    ) -> Optional[List["UploadPartsInput"]]:
+        """Split a large file into parts and hash each of them.
+
+        Returns None if the file is uploaded with a single request.
+        """
+        local_path = entry.local_path
+        size = entry.size or 0
+        if local_path is None or not (
+            _MULTIPART_MIN_SIZE <= size <= _MULTIPART_MAX_SIZE
+        ):
+            return None
+        part_size = self._part_size(size)
+
+        def hash_part(offset: int) -> str:
+            hasher = _md5()
+            with open(local_path, "rb") as f:
+                part = progress.FilePart(f, offset, min(part_size, size - offset))
+                for data in iter(lambda: part.read(1024 * 1024), b""):
+                    hasher.update(data)
+            return hasher.hexdigest()
+
+        with concurrent.futures.ThreadPoolExecutor(_HASH_THREADS) as executor:
+            digests = executor.map(hash_part, range(0, size, part_size))
+            return [
+                {"partNumber": number, "hexMD5": digest}
+                for number, digest in enumerate(digests, 1)
+            ]
+
+    def _upload_multipart(
+        self,
+        artifact_id: str,
+        entry: ArtifactManifestEntry,
+        upload_parts: List["UploadPartsInput"],
+        resp: "ResponsePrepare",
+        progress_callback: Optional["progress.ProgressFn"],
+        extra_headers: Dict[str, str],
+    ) -> None:
+        """Upload a file in parts, resuming a previously interrupted upload.
+
+        The urls and ETags of an upload are saved in the cache as its parts
+        complete, so that a later attempt to store the same file only uploads
+        the parts that are missing.
+        """
+        upload_key = "\n".join(
+            [artifact_id, entry.path, entry.digest, str(len(upload_parts))]
+        )
+        path, hit, cache_open = self._cache.check_upload_state_path(upload_key)
+
+        def save_state(state: Dict[str, Any]) -> None:
+            with cache_open() as f:
+                json.dump(state, f)
+
+        def upload(state: Dict[str, Any]) -> None:
+            self._upload_parts(
+                artifact_id,
+                entry,
+                upload_parts,
+                state,
+                save_state,
+                progress_callback,
+                extra_headers,
+            )
+
+        resumed = False
+        if hit:
+            try:
+                with open(path) as f:
+                    state = json.load(f)
+                state["urls"] = {int(n): url for n, url in state["urls"].items()}
+                state["etags"] = {int(n): etag for n, etag in state["etags"].items()}
+                upload(state)
+                resumed = True
+            except Exception:
+                # The saved urls may have expired or the upload may have been
+                # aborted, start over with the upload we just prepared.
+                pass
+
+        if not resumed:
+            state = {
+                "uploadID": resp.upload_id,
+                "storagePath": resp.storage_path,
+                "urls": dict(resp.multipart_upload_urls or {}),
+                "etags": {},
+            }
+            save_state(state)
+            upload(state)
+
+        with contextlib.suppress(OSError):
+            os.remove(path)
+
+    def _upload_parts(
+        self,
+        artifact_id: str,
+        entry: ArtifactManifestEntry,
+        upload_parts: List["UploadPartsInput"],
+        state: Dict[str, Any],
+        save_state: Callable[[Dict[str, Any]], None],
+        progress_callback: Optional["progress.ProgressFn"],
+        extra_headers: Dict[str, str],
+    ) -> None:
+        local_path = cast(str, entry.local_path)
+        size = entry.size or 0
+        part_size = self._part_size(size)
+        urls: Dict[int, str] = state["urls"]
+        etags: Dict[int, str] = state["etags"]
+        lock = threading.Lock()
+        uploaded = sum(min(part_size, size - (n - 1) * part_size) for n in etags)
+
+        def callback(new_bytes: int, _: int) -> None:
+            nonlocal uploaded
+            with lock:
+                uploaded += new_bytes
+                if progress_callback is not None:
+                    progress_callback(new_bytes, uploaded)
+
+        def upload_part(part: "UploadPartsInput") -> None:
+            number = part["partNumber"]
+            offset = (number - 1) * part_size
+            with open(local_path, "rb") as f:
+                etag = self._api.upload_file_part_retry(
+                    urls[number],
+                    progress.FilePart(f, offset, min(part_size, size - offset)),
+                    hex_to_b64_id(part["hexMD5"]),
+                    callback,
+                    extra_headers=extra_headers,
+                )
+            with lock:
+                etags[number] = etag
+                save_state(state)
+
+        pending = [part for part in upload_parts if part["partNumber"] not in etags]
+        with concurrent.futures.ThreadPoolExecutor(_MULTIPART_THREADS) as executor:
+            futures = [executor.submit(upload_part, part) for part in pending]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        self._api.complete_multipart_upload_artifact(
+            artifact_id,
+            state["storagePath"],
+            [
+                {"partNumber": number, "hexMD5": etags[number]}
+                for number in sorted(etags)
+            ],
+            state["uploadID"],
+        )
+
     def _write_cache(self, entry: ArtifactManifestEntry) -> None:
         if entry.local_path is None:
             return
 
         # Cache upon successful upload.
-        _, hit, cache_open = self._cache.check_md5_obj_path(
+        path, hit, cache_open = self._cache.check_md5_obj_path(
             B64MD5(entry.digest),
             entry.size if entry.size is not None else 0,
         )
-        if not hit:
-            with cache_open() as f:
-                shutil.copyfile(entry.local_path, f.name)
+        if hit:
+            return
+        # Staged copies never change, so the cache can share their data.
+        if entry.local_path.startswith(get_staging_dir()) and self._cache.link_obj(
+            path, entry.local_path
+        ):
+            return
+        with cache_open() as f:
+            shutil.copyfile(entry.local_path, f.name)
 
 
 # Don't use this yet!
@@ -1259,7 +1681,7 @@ class LocalFileHandler(StorageHandler):
 
         def md5(path: str) -> B64MD5:
             return (
-                md5_file_b64(path)
+                self._cache.checksums.md5_file_b64(path)
                 if checksum
                 else md5_string(str(os.stat(path).st_size))
             )
@@ -1273,6 +1695,7 @@ class LocalFileHandler(StorageHandler):
                     % (max_objects, local_path),
                     newline=False,
                 )
+            paths = []
             for root, _, files in os.walk(local_path):
                 for sub_path in files:
                     i += 1
@@ -1281,21 +1704,26 @@ class LocalFileHandler(StorageHandler):
                             "Exceeded %i objects tracked, pass max_objects to add_reference"
                             % max_objects
                         )
-                    physical_path = os.path.join(root, sub_path)
-                    # TODO(spencerpearson): this is not a "logical path" in the sense that
-                    # `LogicalPath` returns a "logical path"; it's a relative path
-                    # **on the local filesystem**.
-                    logical_path = os.path.relpath(physical_path, start=local_path)
-                    if name is not None:
-                        logical_path = os.path.join(name, logical_path)
-
-                    entry = ArtifactManifestEntry(
-                        path=logical_path,
-                        ref=FilePathStr(os.path.join(path, logical_path)),
-                        size=os.path.getsize(physical_path),
-                        digest=md5(physical_path),
-                    )
-                    entries.append(entry)
+                    paths.append(os.path.join(root, sub_path))
+
+            def make_entry(physical_path: str) -> ArtifactManifestEntry:
+                # TODO(spencerpearson): this is not a "logical path" in the sense that
+                # `LogicalPath` returns a "logical path"; it's a relative path
+                # **on the local filesystem**.
+                logical_path = os.path.relpath(physical_path, start=local_path)
+                if name is not None:
+                    logical_path = os.path.join(name, logical_path)
+
+                return ArtifactManifestEntry(
+                    path=logical_path,
+                    ref=FilePathStr(os.path.join(path, logical_path)),
+                    size=os.path.getsize(physical_path),
+                    digest=md5(physical_path),
+                )
+
+            with concurrent.futures.ThreadPoolExecutor(_HASH_THREADS) as executor:
+                entries.extend(executor.map(make_entry, paths))
+            self._cache.checksums.flush()
             if checksum:
                 termlog("Done. %.1fs" % (time.time() - start_time), prefix=False)
         elif os.path.isfile(local_path):
@@ -1307,6 +1735,7 @@ class LocalFileHandler(StorageHandler):
                 digest=md5(local_path),
             )
             entries.append(entry)
+            self._cache.checksums.flush()
         else:
             # TODO: update error message if we don't allow directories.
             raise ValueError('Path "%s" must be a valid file or directory path' % path)
@@ -1381,48 +1810,58 @@ class S3Handler(StorageHandler):
         if hit:
             return path
 
-        self.init_boto()
-        assert self._s3 is not None  # mypy: unwraps optionality
-        bucket, key, _ = self._parse_uri(manifest_entry.ref)
-        version = manifest_entry.extra.get("versionID")
-
-        extra_args = {}
-        if version is None:
-            # We don't have version information so just get the latest version
-            # and fallback to listing all versions if we don't have a match.
-            obj = self._s3.Object(bucket, key)
-            etag = self._etag_from_obj(obj)
-            if etag != manifest_entry.digest:
-                if self.versioning_enabled(bucket):
-                    # Fallback to listing versions
-                    obj = None
-                    object_versions = self._s3.Bucket(bucket).object_versions.filter(
-                        Prefix=key
-                    )
-                    for object_version in object_versions:
-                        if (
-                            manifest_entry.extra.get("etag")
-                            == object_version.e_tag[1:-1]
-                        ):
-                            obj = object_version.Object()
-                            extra_args["VersionId"] = object_version.version_id
-                            break
-                    if obj is None:
-                        raise ValueError(
-                            "Couldn't find object version for {}/{} matching etag {}".format(
-                                bucket, key, manifest_entry.extra.get("etag")
+        with self._cache.fill_lock(path):
+            # Another process may have downloaded it while we waited.
+            path, hit, cache_open = self._cache.check_etag_obj_path(
+                URIStr(manifest_entry.ref),
+                ETag(manifest_entry.digest),
+                manifest_entry.size if manifest_entry.size is not None else 0,
+            )
+            if hit:
+                return path
+
+            self.init_boto()
+            assert self._s3 is not None  # mypy: unwraps optionality
+            bucket, key, _ = self._parse_uri(manifest_entry.ref)
+            version = manifest_entry.extra.get("versionID")
+
+            extra_args = {}
+            if version is None:
+                # We don't have version information so just get the latest version
+                # and fallback to listing all versions if we don't have a match.
+                obj = self._s3.Object(bucket, key)
+                etag = self._etag_from_obj(obj)
+                if etag != manifest_entry.digest:
+                    if self.versioning_enabled(bucket):
+                        # Fallback to listing versions
+                        obj = None
+                        object_versions = self._s3.Bucket(
+                            bucket
+                        ).object_versions.filter(Prefix=key)
+                        for object_version in object_versions:
+                            if (
+                                manifest_entry.extra.get("etag")
+                                == object_version.e_tag[1:-1]
+                            ):
+                                obj = object_version.Object()
+                                extra_args["VersionId"] = object_version.version_id
+                                break
+                        if obj is None:
+                            raise ValueError(
+                                "Couldn't find object version for {}/{} matching etag {}".format(
+                                    bucket, key, manifest_entry.extra.get("etag")
+                                )
                             )
+                    else:
+                        raise ValueError(
+                            f"Digest mismatch for object {manifest_entry.ref}: expected {manifest_entry.digest} but found {etag}"
                         )
-                else:
-                    raise ValueError(
-                        f"Digest mismatch for object {manifest_entry.ref}: expected {manifest_entry.digest} but found {etag}"
-                    )
-        else:
-            obj = self._s3.ObjectVersion(bucket, key, version).Object()
-            extra_args["VersionId"] = version
+            else:
+                obj = self._s3.ObjectVersion(bucket, key, version).Object()
+                extra_args["VersionId"] = version
 
-        with cache_open(mode="wb") as f:
-            obj.download_fileobj(f, ExtraArgs=extra_args)
+            with cache_open(mode="wb") as f:
+                obj.download_fileobj(f, ExtraArgs=extra_args)
         return path
 
     def store_path(
@@ -1637,33 +2076,42 @@ class GCSHandler(StorageHandler):
         if hit:
             return path
 
-        self.init_gcs()
-        assert self._client is not None  # mypy: unwraps optionality
-        assert manifest_entry.ref is not None
-        bucket, key, _ = self._parse_uri(manifest_entry.ref)
-        version = manifest_entry.extra.get("versionID")
-
-        obj = None
-        # First attempt to get the generation specified, this will return None if versioning is not enabled
-        if version is not None:
-            obj = self._client.bucket(bucket).get_blob(key, generation=version)
-
-        if obj is None:
-            # Object versioning is disabled on the bucket, so just get
-            # the latest version and make sure the MD5 matches.
-            obj = self._client.bucket(bucket).get_blob(key)
+        with self._cache.fill_lock(path):
+            # Another process may have downloaded it while we waited.
+            path, hit, cache_open = self._cache.check_md5_obj_path(
+                B64MD5(manifest_entry.digest),
+                manifest_entry.size if manifest_entry.size is not None else 0,
+            )
+            if hit:
+                return path
+
+            self.init_gcs()
+            assert self._client is not None  # mypy: unwraps optionality
+            assert manifest_entry.ref is not None
+            bucket, key, _ = self._parse_uri(manifest_entry.ref)
+            version = manifest_entry.extra.get("versionID")
+
+            obj = None
+            # First attempt to get the generation specified, this will return None if versioning is not enabled
+            if version is not None:
+                obj = self._client.bucket(bucket).get_blob(key, generation=version)
+
             if obj is None:
-                raise ValueError(
-                    f"Unable to download object {manifest_entry.ref} with generation {version}"
-                )
-            md5 = obj.md5_hash
-            if md5 != manifest_entry.digest:
-                raise ValueError(
-                    f"Digest mismatch for object {manifest_entry.ref}: expected {manifest_entry.digest} but found {md5}"
-                )
+                # Object versioning is disabled on the bucket, so just get
+                # the latest version and make sure the MD5 matches.
+                obj = self._client.bucket(bucket).get_blob(key)
+                if obj is None:
+                    raise ValueError(
+                        f"Unable to download object {manifest_entry.ref} with generation {version}"
+                    )
+                md5 = obj.md5_hash
+                if md5 != manifest_entry.digest:
+                    raise ValueError(
+                        f"Digest mismatch for object {manifest_entry.ref}: expected {manifest_entry.digest} but found {md5}"
+                    )
 
-        with cache_open(mode="wb") as f:
-            obj.download_to_file(f)
+            with cache_open(mode="wb") as f:
+                obj.download_to_file(f)
         return path
 
     def store_path(
@@ -1809,51 +2257,63 @@ class AzureHandler(StorageHandler):
         if hit:
             return path
 
-        account_url, container_name, blob_name, query = self._parse_uri(
-            manifest_entry.ref
-        )
-        version_id = manifest_entry.extra.get("versionID")
-        blob_service_client = self._get_module("azure.storage.blob").BlobServiceClient(
-            account_url,
-            credential=self._get_module("azure.identity").DefaultAzureCredential(),
-        )
-        blob_client = blob_service_client.get_blob_client(
-            container=container_name, blob=blob_name
-        )
-        if version_id is None:
-            # Try current version, then all versions.
-            try:
-                downloader = blob_client.download_blob(
-                    etag=manifest_entry.digest,
-                    match_condition=self._get_module(
-                        "azure.core"
-                    ).MatchConditions.IfNotModified,
-                )
-            except self._get_module("azure.core.exceptions").ResourceModifiedError:
-                container_client = blob_service_client.get_container_client(
-                    container_name
-                )
-                for blob_properties in container_client.walk_blobs(
-                    name_starts_with=blob_name, include=["versions"]
-                ):
-                    if (
-                        blob_properties.name == blob_name
-                        and blob_properties.etag == manifest_entry.digest
-                        and blob_properties.version_id is not None
+        with get_artifacts_cache().fill_lock(path):
+            # Another process may have downloaded it while we waited.
+            path, hit, cache_open = get_artifacts_cache().check_etag_obj_path(
+                URIStr(manifest_entry.ref),
+                ETag(manifest_entry.digest),
+                manifest_entry.size or 0,
+            )
+            if hit:
+                return path
+
+            account_url, container_name, blob_name, query = self._parse_uri(
+                manifest_entry.ref
+            )
+            version_id = manifest_entry.extra.get("versionID")
+            blob_service_client = self._get_module(
+                "azure.storage.blob"
+            ).BlobServiceClient(
+                account_url,
+                credential=self._get_module("azure.identity").DefaultAzureCredential(),
+            )
+            blob_client = blob_service_client.get_blob_client(
+                container=container_name, blob=blob_name
+            )
+            if version_id is None:
+                # Try current version, then all versions.
+                try:
+                    downloader = blob_client.download_blob(
+                        etag=manifest_entry.digest,
+                        match_condition=self._get_module(
+                            "azure.core"
+                        ).MatchConditions.IfNotModified,
+                    )
+                except self._get_module("azure.core.exceptions").ResourceModifiedError:
+                    container_client = blob_service_client.get_container_client(
+                        container_name
+                    )
+                    for blob_properties in container_client.walk_blobs(
+                        name_starts_with=blob_name, include=["versions"]
                     ):
-                        downloader = blob_client.download_blob(
-                            version_id=blob_properties.version_id
+                        if (
+                            blob_properties.name == blob_name
+                            and blob_properties.etag == manifest_entry.digest
+                            and blob_properties.version_id is not None
+                        ):
+                            downloader = blob_client.download_blob(
+                                version_id=blob_properties.version_id
+                            )
+                            break
+                    else:  # didn't break
+                        raise ValueError(
+                            f"Couldn't find blob version for {manifest_entry.ref} matching "
+                            f"etag {manifest_entry.digest}."
                         )
-                        break
-                else:  # didn't break
-                    raise ValueError(
-                        f"Couldn't find blob version for {manifest_entry.ref} matching "
-                        f"etag {manifest_entry.digest}."
-                    )
-        else:
-            downloader = blob_client.download_blob(version_id=version_id)
-        with cache_open(mode="wb") as f:
-            downloader.readinto(f)
+            else:
+                downloader = blob_client.download_blob(version_id=version_id)
+            with cache_open(mode="wb") as f:
+                downloader.readinto(f)
         return path
 
     def store_path(
@@ -1979,20 +2439,30 @@ class HTTPHandler(StorageHandler):
         if hit:
             return path
 
-        response = self._session.get(manifest_entry.ref, stream=True)
-        response.raise_for_status()
-
-        digest: Optional[Union[ETag, FilePathStr, URIStr]]
-        digest, size, extra = self._entry_from_headers(response.headers)
-        digest = digest or manifest_entry.ref
-        if manifest_entry.digest != digest:
-            raise ValueError(
-                f"Digest mismatch for url {manifest_entry.ref}: expected {manifest_entry.digest} but found {digest}"
+        with self._cache.fill_lock(path):
+            # Another process may have downloaded it while we waited.
+            path, hit, cache_open = self._cache.check_etag_obj_path(
+                URIStr(manifest_entry.ref),
+                ETag(manifest_entry.digest),
+                manifest_entry.size if manifest_entry.size is not None else 0,
             )
+            if hit:
+                return path
+
+            response = self._session.get(manifest_entry.ref, stream=True)
+            response.raise_for_status()
+
+            digest: Optional[Union[ETag, FilePathStr, URIStr]]
+            digest, size, extra = self._entry_from_headers(response.headers)
+            digest = digest or manifest_entry.ref
+            if manifest_entry.digest != digest:
+                raise ValueError(
+                    f"Digest mismatch for url {manifest_entry.ref}: expected {manifest_entry.digest} but found {digest}"
+                )
 
-        with cache_open(mode="wb") as file:
-            for data in response.iter_content(chunk_size=16 * 1024):
-                file.write(data)
+            with cache_open(mode="wb") as file:
+                for data in response.iter_content(chunk_size=16 * 1024):
+                    file.write(data)
         return path
 
     def store_path(
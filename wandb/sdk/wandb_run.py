@@ -514,6 +514,7 @@ class Run:
     _stdout_slave_fd: Optional[int]
     _stderr_slave_fd: Optional[int]
     _artifact_slots: List[str]
+    _media_paths: Dict[str, str]
 
     _init_pid: int
     _attach_pid: int
@@ -571,6 +572,8 @@ class Run:
         self._start_time = time.time()
 
         _datatypes_set_callback(self._datatypes_callback)
+        # media files in the run dir by their content, see Media.bind_to_run
+        self._media_paths = {}
 
         self._printer = get_printer(self._settings._jupyter)
         self._wl = None
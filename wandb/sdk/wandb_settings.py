@@ -457,6 +457,8 @@ class Settings:
     _config_dict: Config
     _console: SettingsConsole
     _cuda: str
+    _datastore_flush_bytes: int
+    _datastore_flush_interval: float
     _disable_meta: bool
     _disable_service: bool
     _disable_stats: bool
@@ -464,6 +466,8 @@ class Settings:
     _except_exit: bool
     _executable: str
     _extra_http_headers: Mapping[str, str]
+    _file_stream_compression: str
+    _file_stream_max_inflight: int
     _flow_control_custom: bool
     _flow_control_disabled: bool
     _internal_check_process: Union[int, float]
@@ -487,6 +491,7 @@ class Settings:
     _python: str
     _runqueue_item_id: str
     _save_requirements: bool
+    _service_publish_batch_seconds: float
     _service_transport: str
     _service_wait: float
     _start_datetime: datetime
@@ -610,6 +615,8 @@ class Settings:
                 "preprocessor": int,
                 "validator": self._validate__async_upload_concurrency_limit,
             },
+            _datastore_flush_bytes={"preprocessor": int},
+            _datastore_flush_interval={"preprocessor": float},
             _disable_meta={"preprocessor": _str_as_bool},
             _disable_service={
                 "value": False,
@@ -619,6 +626,13 @@ class Settings:
             _disable_stats={"preprocessor": _str_as_bool},
             _disable_viewer={"preprocessor": _str_as_bool},
             _extra_http_headers={"preprocessor": _str_as_json},
+            _file_stream_compression={
+                "validator": self._validate__file_stream_compression,
+            },
+            _file_stream_max_inflight={
+                "preprocessor": int,
+                "validator": self._validate__file_stream_max_inflight,
+            },
             _network_buffer={"preprocessor": int},
             _colab={
                 "hook": lambda _: "google.colab" in sys.modules,
@@ -663,6 +677,10 @@ class Settings:
             _sync={"value": False},
             _platform={"value": util.get_platform_name()},
             _save_requirements={"value": True, "preprocessor": _str_as_bool},
+            _service_publish_batch_seconds={
+                "preprocessor": float,
+                "validator": self._validate__service_publish_batch_seconds,
+            },
             _service_wait={
                 "value": 30,
                 "preprocessor": float,
@@ -1074,6 +1092,12 @@ class Settings:
 
         return True
 
+    @staticmethod
+    def _validate__service_publish_batch_seconds(value: float) -> bool:
+        if value <= 0:
+            raise UsageError("_service_publish_batch_seconds must be a positive number")
+        return True
+
     @staticmethod
     def _validate__service_wait(value: float) -> bool:
         if value <= 0:
@@ -1092,6 +1116,21 @@ class Settings:
             raise UsageError("_stats_samples_to_average must be between 1 and 30")
         return True
 
+    @staticmethod
+    def _validate__file_stream_compression(value: str) -> bool:
+        choices = {"gzip", "zstd"}
+        if value not in choices:
+            raise UsageError(
+                f"Settings field `_file_stream_compression`: {value!r} not in {choices}"
+            )
+        return True
+
+    @staticmethod
+    def _validate__file_stream_max_inflight(value: int) -> bool:
+        if value <= 0:
+            raise UsageError("_file_stream_max_inflight must be positive")
+        return True
+
     @staticmethod
     def _validate__async_upload_concurrency_limit(value: int) -> bool:
         if value <= 0:
@@ -1,5 +1,6 @@
 """sync."""
 
+import concurrent.futures
 import datetime
 import fnmatch
 import os
@@ -10,6 +11,8 @@ import threading
 import time
 from urllib.parse import quote as url_quote
 
+import requests
+
 import wandb
 from wandb.proto import wandb_internal_pb2  # type: ignore
 from wandb.sdk.interface.interface_queue import InterfaceQueue
@@ -50,6 +53,7 @@ class SyncThread(threading.Thread):
         sync_tensorboard=None,
         log_path=None,
         append=None,
+        parallel=None,
     ):
         threading.Thread.__init__(self)
         # mark this process as internal
@@ -65,6 +69,10 @@ class SyncThread(threading.Thread):
         self._sync_tensorboard = sync_tensorboard
         self._log_path = log_path
         self._append = append
+        self._parallel = max(parallel or 1, 1)
+        self._http_adapter = None
+        self._progress_lock = threading.Lock()
+        self._progress_done = 0
 
     def _parse_pb(self, data, exit_pb=None):
         pb = wandb_internal_pb2.Record()
@@ -231,84 +239,131 @@ class SyncThread(threading.Thread):
             else:
                 raise e
 
-    def run(self):
-        if self._log_path is not None:
-            print(f"Find logs at: {self._log_path}")
-        for sync_item in self._sync_list:
-            tb_event_files, tb_logdirs, tb_root = self._find_tfevent_files(sync_item)
-            if os.path.isdir(sync_item):
-                files = os.listdir(sync_item)
-                filtered_files = list(filter(lambda f: f.endswith(WANDB_SUFFIX), files))
-                if tb_root is None and (
-                    check_and_warn_old(files) or len(filtered_files) != 1
-                ):
-                    print(f"Skipping directory: {sync_item}")
-                    continue
-                if len(filtered_files) > 0:
-                    sync_item = os.path.join(sync_item, filtered_files[0])
-            sync_tb = self._setup_tensorboard(
-                tb_root, tb_logdirs, tb_event_files, sync_item
+    def _report(self, url, finished=False):
+        """Print sync progress for a run.
+
+        When syncing serially we print the run url and then "done." on the
+        same line.  Runs synced in parallel get one line each, including the
+        aggregate progress across all runs.
+        """
+        if self._parallel == 1:
+            if finished:
+                print("done.")
+            else:
+                print("Syncing: %s ... " % url, end="")
+                sys.stdout.flush()
+            return
+        if not finished:
+            return
+        with self._progress_lock:
+            self._progress_done += 1
+            print(
+                f"Syncing: {url or 'run'} ... done. "
+                f"({self._progress_done}/{len(self._sync_list)} runs)"
             )
-            # If we're syncing tensorboard, let's use a tmp dir for images etc.
-            root_dir = TMPDIR.name if sync_tb else os.path.dirname(sync_item)
+            sys.stdout.flush()
 
-            # When appending we are allowing a possible resume, ie the run
-            # doesnt have to exist already
-            resume = "allow" if self._append else None
+    def _sync_item(self, sync_item):
+        tb_event_files, tb_logdirs, tb_root = self._find_tfevent_files(sync_item)
+        if os.path.isdir(sync_item):
+            files = os.listdir(sync_item)
+            filtered_files = list(filter(lambda f: f.endswith(WANDB_SUFFIX), files))
+            if tb_root is None and (
+                check_and_warn_old(files) or len(filtered_files) != 1
+            ):
+                print(f"Skipping directory: {sync_item}")
+                return
+            if len(filtered_files) > 0:
+                sync_item = os.path.join(sync_item, filtered_files[0])
+        sync_tb = self._setup_tensorboard(
+            tb_root, tb_logdirs, tb_event_files, sync_item
+        )
+        # If we're syncing tensorboard, let's use a tmp dir for images etc.
+        root_dir = TMPDIR.name if sync_tb else os.path.dirname(sync_item)
 
-            sm = sender.SendManager.setup(root_dir, resume=resume)
-            if sync_tb:
-                self._send_tensorboard(tb_root, tb_logdirs, sm)
-                continue
+        # When appending we are allowing a possible resume, ie the run
+        # doesnt have to exist already
+        resume = "allow" if self._append else None
 
-            ds = datastore.DataStore()
-            try:
-                ds.open_for_scan(sync_item)
-            except AssertionError as e:
-                print(f".wandb file is empty ({e}), skipping: {sync_item}")
+        sm = sender.SendManager.setup(root_dir, resume=resume)
+        if self._http_adapter is not None:
+            sm._api.set_http_adapter(self._http_adapter)
+        if sync_tb:
+            self._send_tensorboard(tb_root, tb_logdirs, sm)
+            return
+
+        ds = datastore.DataStore()
+        try:
+            ds.open_for_scan(sync_item, use_mmap=True)
+        except AssertionError as e:
+            print(f".wandb file is empty ({e}), skipping: {sync_item}")
+            return
+
+        # save exit for final send
+        exit_pb = None
+        finished = False
+        url = None
+        while True:
+            data = self._robust_scan(ds)
+            if data is None:
+                break
+            pb, exit_pb, cont = self._parse_pb(data, exit_pb)
+            if exit_pb is not None:
+                finished = True
+            if cont:
                 continue
+            sm.send(pb)
+            # send any records that were added in previous send
+            while not sm._record_q.empty():
+                data = sm._record_q.get(block=True)
+                sm.send(data)
+
+            if pb.control.req_resp:
+                result = sm._result_q.get(block=True)
+                result_type = result.WhichOneof("result_type")
+                if url is None and result_type == "run_result":
+                    r = result.run_result.run
+                    # TODO(jhr): hardcode until we have settings in sync
+                    url = "{}/{}/{}/runs/{}".format(
+                        self._app_url,
+                        url_quote(r.entity),
+                        url_quote(r.project),
+                        url_quote(r.run_id),
+                    )
+                    self._report(url)
+        ds.close()
+        sm.finish()
+        # Only mark synced if the run actually finished
+        if self._mark_synced and not self._view and finished:
+            synced_file = f"{sync_item}{SYNCED_SUFFIX}"
+            with open(synced_file, "w"):
+                pass
+        self._report(url, finished=True)
 
-            # save exit for final send
-            exit_pb = None
-            finished = False
-            shown = False
-            while True:
-                data = self._robust_scan(ds)
-                if data is None:
-                    break
-                pb, exit_pb, cont = self._parse_pb(data, exit_pb)
-                if exit_pb is not None:
-                    finished = True
-                if cont:
-                    continue
-                sm.send(pb)
-                # send any records that were added in previous send
-                while not sm._record_q.empty():
-                    data = sm._record_q.get(block=True)
-                    sm.send(data)
-
-                if pb.control.req_resp:
-                    result = sm._result_q.get(block=True)
-                    result_type = result.WhichOneof("result_type")
-                    if not shown and result_type == "run_result":
-                        r = result.run_result.run
-                        # TODO(jhr): hardcode until we have settings in sync
-                        url = "{}/{}/{}/runs/{}".format(
-                            self._app_url,
-                            url_quote(r.entity),
-                            url_quote(r.project),
-                            url_quote(r.run_id),
-                        )
-                        print("Syncing: %s ... " % url, end="")
-                        sys.stdout.flush()
-                        shown = True
-            sm.finish()
-            # Only mark synced if the run actually finished
-            if self._mark_synced and not self._view and finished:
-                synced_file = f"{sync_item}{SYNCED_SUFFIX}"
-                with open(synced_file, "w"):
-                    pass
-            print("done.")
+    def run(self):
+        if self._log_path is not None:
+            print(f"Find logs at: {self._log_path}")
+        if self._parallel == 1:
+            for sync_item in self._sync_list:
+                self._sync_item(sync_item)
+            return
+
+        # share one connection pool between all the runs being synced
+        self._http_adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self._parallel, pool_maxsize=self._parallel * 4
+        )
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._parallel, thread_name_prefix="SyncWorker"
+        ) as pool:
+            futures = {
+                pool.submit(self._sync_item, sync_item): sync_item
+                for sync_item in self._sync_list
+            }
+            for future in concurrent.futures.as_completed(futures):
+                exc = future.exception()
+                if exc is not None:
+                    wandb.termerror(f"Failed to sync {futures[future]}: {exc}")
+        self._http_adapter.close()
 
 
 class SyncManager:
@@ -324,6 +379,7 @@ class SyncManager:
         sync_tensorboard=None,
         log_path=None,
         append=None,
+        parallel=None,
     ):
         self._sync_list = []
         self._thread = None
@@ -337,6 +393,7 @@ class SyncManager:
         self._sync_tensorboard = sync_tensorboard
         self._log_path = log_path
         self._append = append
+        self._parallel = parallel
 
     def status(self):
         pass
@@ -358,6 +415,7 @@ class SyncManager:
             sync_tensorboard=self._sync_tensorboard,
             log_path=self._log_path,
             append=self._append,
+            parallel=self._parallel,
         )
         self._thread.start()
 